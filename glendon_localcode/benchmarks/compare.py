@@ -0,0 +1,55 @@
+import json
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "throughput_rps"]
+
+
+def load_result(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _change(before, after):
+    if not before:
+        return None
+    return (after - before) / before
+
+
+def compare_results(baseline: dict, candidate: dict, threshold: float = 0.10) -> dict:
+    """
+    Per-endpoint relative change of every metric (candidate vs baseline).
+    An endpoint regresses when its p95 grows, or its throughput drops,
+    by more than `threshold` (0.10 = 10%).
+    """
+    rows = {}
+    regressions = []
+    names = ["overall"] + sorted(set(baseline["endpoints"]) | set(candidate["endpoints"]))
+    for name in names:
+        before = baseline["overall"] if name == "overall" else baseline["endpoints"].get(name)
+        after = candidate["overall"] if name == "overall" else candidate["endpoints"].get(name)
+        if before is None or after is None:
+            rows[name] = {"missing_in": "baseline" if before is None else "candidate"}
+            continue
+        changes = {m: _change(before[m], after[m]) for m in METRICS}
+        rows[name] = {
+            m: {"baseline": before[m], "candidate": after[m], "change": changes[m]} for m in METRICS
+        }
+        p95, rps = changes["p95_ms"], changes["throughput_rps"]
+        if (p95 is not None and p95 > threshold) or (rps is not None and rps < -threshold):
+            regressions.append(name)
+    return {"threshold": threshold, "endpoints": rows, "regressions": regressions}
+
+
+def format_comparison(comparison: dict) -> str:
+    lines = [f"{'endpoint':<18}" + "".join(f"{m:>28}" for m in METRICS)]
+    for name, row in comparison["endpoints"].items():
+        if "missing_in" in row:
+            lines.append(f"{name:<18}  (missing in {row['missing_in']})")
+            continue
+        cells = []
+        for m in METRICS:
+            cell = row[m]
+            change = "   n/a" if cell["change"] is None else f"{cell['change']:+6.1%}"
+            cells.append(f"{cell['baseline']:>9.2f} -> {cell['candidate']:>9.2f} {change}")
+        flag = "  ⚠️" if name in comparison["regressions"] else ""
+        lines.append(f"{name:<18}" + "".join(f"{c:>28}" for c in cells) + flag)
+    return "\n".join(lines)
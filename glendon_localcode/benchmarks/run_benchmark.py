@@ -0,0 +1,179 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+# Run from glendon_localcode/ (like init_db.py):
+#   python -m benchmarks.run_benchmark seed --materials 5000 --versions 3 --skus 2 --reset
+#   python -m benchmarks.run_benchmark run --requests 5000 --concurrency 32 --out results/before.json
+#   python -m benchmarks.run_benchmark run --base-url http://localhost:8000 --out results/after.json
+#   python -m benchmarks.run_benchmark compare results/before.json results/after.json
+#   python -m benchmarks.run_benchmark serialization --repeats 10 --out results/serialization.json
+# Server profiles (start each one, run the same workload, compare):
+#   uvicorn main:app --port 8000                      -> run --base-url ... --out results/uvicorn.json
+#   gunicorn -c gunicorn.conf.py main:app             -> run --base-url ... --out results/gunicorn.json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import seed_database, sample_document_ids
+from benchmarks.compare import load_result, compare_results, format_comparison
+
+DB_URL = os.environ.get("DATABASE_URL")
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _dataset_size(dsn):
+    import psycopg2
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            sizes = {}
+            for table in ("master_materials", "material_versions", "material_skus"):
+                cur.execute(f"SELECT count(*) FROM {table}")
+                sizes[table] = cur.fetchone()[0]
+            return sizes
+    finally:
+        conn.close()
+
+
+def cmd_seed(args):
+    counts = seed_database(
+        DB_URL, materials=args.materials, versions=args.versions, skus=args.skus,
+        seed=args.seed, reset=args.reset, batch_size=args.batch_size,
+    )
+    print(f"✅ Seeded {counts['materials']} materials, {counts['versions']} versions, {counts['skus']} SKUs")
+
+
+async def _run(args):
+    from benchmarks.workload import open_client, run_workload
+
+    doc_ids = sample_document_ids(DB_URL, limit=args.sample)
+    async with open_client(args.base_url) as client:
+        result = await run_workload(
+            client, doc_ids, requests=args.requests, concurrency=args.concurrency,
+            warmup=args.warmup, seed=args.seed,
+        )
+    result["meta"] = {
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "config": {
+            "requests": args.requests, "concurrency": args.concurrency,
+            "warmup": args.warmup, "seed": args.seed, "sample": args.sample,
+        },
+        "dataset": _dataset_size(DB_URL),
+    }
+    return result
+
+
+def cmd_run(args):
+    result = asyncio.run(_run(args))
+    for name, s in [("overall", result["overall"]), *result["endpoints"].items()]:
+        print(f"{name:<18} n={s['requests']:<6} err={s['errors']:<4} "
+              f"p50={s['p50_ms']:>8.2f}ms p95={s['p95_ms']:>8.2f}ms p99={s['p99_ms']:>8.2f}ms "
+              f"{s['throughput_rps']:>8.1f} req/s")
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"📄 Results written to {args.out}")
+
+
+def cmd_compare(args):
+    comparison = compare_results(load_result(args.baseline), load_result(args.candidate), args.threshold)
+    print(format_comparison(comparison))
+    if comparison["regressions"]:
+        print(f"❌ Regressions (> {args.threshold:.0%}): {', '.join(comparison['regressions'])}")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+def cmd_serialization(args):
+    from benchmarks.serialization import run_serialization_benchmark
+
+    body = json.loads(args.body) if args.body else {}
+    result = asyncio.run(run_serialization_benchmark(body, repeats=args.repeats))
+    print(f"/material_cards/list: {result['cards']} cards, "
+          f"{result['response_bytes']['fast']} bytes, identical={result['identical_payloads']}")
+    for section in ("endpoint", "encode_only"):
+        for mode in ("validated", "fast"):
+            s = result[section][mode]
+            print(f"{section:<12} {mode:<10} p50={s['p50_ms']:>9.2f}ms p95={s['p95_ms']:>9.2f}ms")
+        print(f"{section:<12} speedup    x{result[section]['speedup_p50']}")
+    result["meta"] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {"repeats": args.repeats, "body": body},
+        "dataset": _dataset_size(DB_URL),
+    }
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"📄 Results written to {args.out}")
+    if not result["identical_payloads"]:
+        print("❌ The fast path returned a different payload")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Material API benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed = sub.add_parser("seed", help="Fill the database with synthetic materials")
+    seed.add_argument("--materials", type=int, default=1000)
+    seed.add_argument("--versions", type=int, default=3, help="Versions per material")
+    seed.add_argument("--skus", type=int, default=2, help="SKUs per material")
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--batch-size", type=int, default=500)
+    seed.add_argument("--reset", action="store_true", help="Empty the material tables first")
+    seed.set_defaults(func=cmd_seed)
+
+    run = sub.add_parser("run", help="Drive the API with the workload mix")
+    run.add_argument("--requests", type=int, default=2000)
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--warmup", type=int, default=100)
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--sample", type=int, default=1000, help="Document IDs the workload picks from")
+    run.add_argument("--base-url", help="Running server to hit instead of the in-process app")
+    run.add_argument("--label", help="Free text stored with the results")
+    run.add_argument("--out", help="Write the JSON results here")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="Compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.set_defaults(func=cmd_compare)
+
+    serialization = sub.add_parser(
+        "serialization", help="/material_cards/list: validated response vs the orjson fast path"
+    )
+    serialization.add_argument("--repeats", type=int, default=10)
+    serialization.add_argument("--body", help='Request body as JSON, e.g. \'{"material_type": "Trim"}\'')
+    serialization.add_argument("--out", help="Write the JSON results here")
+    serialization.set_defaults(func=cmd_serialization)
+
+    args = parser.parse_args()
+    if args.command != "compare" and not DB_URL:
+        print("❌ Error: DATABASE_URL is missing.")
+        sys.exit(1)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
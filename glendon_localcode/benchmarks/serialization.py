@@ -0,0 +1,89 @@
+import json
+import time
+
+import orjson
+
+from benchmarks.workload import open_client, percentile
+
+LIST_PATH = "/material_cards/list"
+
+
+def _summary(latencies_ms):
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def _validated_encode(cards):
+    """
+    What FastAPI does with a plain return value: response_model validation,
+    serialization to JSON-compatible Python, then JSONResponse's json.dumps
+    """
+    from typing import List
+    from pydantic import TypeAdapter
+    from schemas.material_card_schemas import MaterialCard
+
+    adapter = TypeAdapter(List[MaterialCard])
+    def encode():
+        validated = adapter.validate_python(cards)
+        return json.dumps(
+            adapter.dump_python(validated, mode="json"), ensure_ascii=False, separators=(",", ":")
+        ).encode()
+    return encode
+
+
+def _time(fn, repeats):
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return _summary(latencies)
+
+
+async def run_serialization_benchmark(body=None, repeats=10) -> dict:
+    """
+    /material_cards/list with the validated path (FAST_JSON_RESPONSES off) vs
+    the orjson fast path, alternating the two so both see the same cache and
+    database state. Also times the encoding step alone on the same cards, and
+    checks that both paths return the same JSON.
+    Always in-process: the switch is flipped on the app's own module.
+    """
+    from controller import fast_response
+
+    body = body or {}
+    latencies = {"validated": [], "fast": []}
+    payloads = {}
+    async with open_client(timeout=300) as client:
+        await client.post(LIST_PATH, json=body)  # Warm-up (pool, plans)
+        for _ in range(repeats):
+            for mode in ("validated", "fast"):
+                fast_response.FAST_JSON_RESPONSES = mode == "fast"
+                start = time.perf_counter()
+                response = await client.post(LIST_PATH, json=body)
+                latencies[mode].append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+                payloads[mode] = response.content
+    fast_response.FAST_JSON_RESPONSES = True
+
+    cards = orjson.loads(payloads["fast"])
+    encode_repeats = max(3, repeats // 2)
+    result = {
+        "cards": len(cards),
+        "identical_payloads": orjson.loads(payloads["validated"]) == cards,
+        "response_bytes": {mode: len(p) for mode, p in payloads.items()},
+        "endpoint": {mode: _summary(values) for mode, values in latencies.items()},
+        "encode_only": {
+            "validated": _time(_validated_encode(cards), encode_repeats),
+            "fast": _time(lambda: orjson.dumps(cards), encode_repeats),
+        },
+    }
+    for section in ("endpoint", "encode_only"):
+        before, after = result[section]["validated"]["p50_ms"], result[section]["fast"]["p50_ms"]
+        result[section]["speedup_p50"] = round(before / after, 2) if after else None
+    return result
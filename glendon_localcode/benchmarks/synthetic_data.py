@@ -0,0 +1,204 @@
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from migrations.runner import run_migrations
+from data_access.id_counter_data_access import ALLOCATE_IDS_QUERY
+from data_access.material_input_data_access import BULK_INSERT_VERSIONS_QUERY, _version_insert_params
+from logics.id_allocator_logics import format_id
+from logics.cost_engine_logics import apply_costs
+from logics.material_input_logics import DOC_PREFIX, MMAT_PREFIX, ID_WIDTH
+from logics.material_sku_input_logics import SKU_PREFIX, SKU_ID_WIDTH
+
+# ---------------------------------------------------------
+# Vocabulary for the generated materials
+# ---------------------------------------------------------
+FIBERS = ["Cotton", "Polyester", "Elastane", "Viscose", "Linen", "Wool", "Nylon", "Modal"]
+MATERIAL_TYPES = ["Main Fabric", "Secondary Fabric", "Trim", "Packaging"]
+COUNTRIES = ["Vietnam", "China"]
+CURRENCIES = ["USD", "VND", "RMB"]
+STATUSES = ["Draft", "Submitted - Unverified", "Submitted - Verified"]
+SUPPLIERS = [
+    "ABC Textiles", "Saigon Weaving", "Hanoi Knit Co", "Guangzhou Fabrics", "Shaoxing Mills",
+    "Mekong Trims", "Delta Packaging", "Pearl River Dyeing", "Binh Duong Denim", "Ningbo Yarn",
+]
+NAME_PARTS = (
+    ["Heavy", "Light", "Stretch", "Brushed", "Washed", "Organic", "Recycled", "Soft"],
+    ["Cotton", "Poly", "Linen", "Viscose", "Nylon", "Wool"],
+    ["Twill", "Poplin", "Jersey", "Canvas", "Denim", "Fleece", "Oxford", "Satin"],
+)
+COLORS = ["Black", "White", "Navy", "Olive", "Sand", "Grey"]
+SIZES = ["S", "M", "L", "XL", None]
+
+INSERT_MASTERS_QUERY = """
+    INSERT INTO master_materials (document_id, current_version, current_version_uid, created_at, created_by)
+    VALUES %s
+"""
+
+INSERT_SKUS_QUERY = """
+    INSERT INTO material_skus (id, master_material_document_id, ref_id, color, size, qr_data, sku_cost_override)
+    VALUES %s
+"""
+
+RESET_QUERY = """
+    TRUNCATE material_skus, material_versions, master_materials;
+    UPDATE id_counters SET last_value = 0 WHERE prefix IN ('vin_doc_', 'vin_mmat_', 'SKU');
+"""
+
+def random_composition(rng: random.Random):
+    """
+    A blend that sums to 100%, in either of the stored shapes:
+    [[60, "Cotton"], [40, "Polyester"]] or [{"name": "Cotton", "percentage": 60}, ...]
+    """
+    fibers = rng.sample([f for f in FIBERS if f != "Elastane"], rng.choice([1, 1, 2, 2, 3]))
+    if len(fibers) == 1:
+        pcts = [100]
+    else:
+        main = rng.randrange(50, 95, 5)
+        pcts = [main]
+        remaining = 100 - main
+        for _ in fibers[1:-1]:
+            share = rng.randint(1, remaining - 1)
+            pcts.append(share)
+            remaining -= share
+        pcts.append(remaining)
+    # Stretch fabrics: take a little elastane out of the main fiber
+    if rng.random() < 0.25 and pcts[0] > 10:
+        stretch = rng.choice([2, 3, 5])
+        pcts[0] -= stretch
+        fibers, pcts = fibers + ["Elastane"], pcts + [stretch]
+
+    if rng.random() < 0.5:
+        return [[pct, fiber] for pct, fiber in zip(pcts, fibers)]
+    return [{"name": fiber, "percentage": pct} for pct, fiber in zip(pcts, fibers)]
+
+
+def random_material(rng: random.Random) -> dict:
+    """Fields shared by every version of one material"""
+    material_type = rng.choice(MATERIAL_TYPES)
+    is_fabric = material_type.endswith("Fabric")
+    return {
+        "material_name": " ".join(rng.choice(part) for part in NAME_PARTS),
+        "material_type": material_type,
+        "supplier_name": rng.choice(SUPPLIERS),
+        "country_of_origin": rng.choice(COUNTRIES),
+        "native_cost_currency": rng.choice(CURRENCIES),
+        "unit_of_measurement": "meter" if is_fabric else "piece",
+        "fabric_composition": random_composition(rng) if is_fabric else None,
+        "generic_material_composition": None if is_fabric else rng.choice(["Plastic", "Metal", "Paper"]),
+        "weight_per_unit": round(rng.uniform(80, 450), 1) if is_fabric else round(rng.uniform(0.5, 20), 1),
+        "weight_uom": "GSM (gram/sq meter)" if is_fabric else "gram per piece",
+        "fabric_roll_width": round(rng.uniform(1.2, 1.8), 2) if is_fabric else None,
+        "ref_id": f"SUP-{rng.randint(1000, 99999)}",
+        "cost": round(rng.uniform(0.5, 25), 2),
+    }
+
+
+def _version_fields(rng: random.Random, base: dict, ver_num: int) -> dict:
+    """Form data for one version; cost drifts a little with every revision"""
+    data = {
+        **{k: v for k, v in base.items() if k != "cost"},
+        "change_description": "Initial version" if ver_num == 1 else f"Price update {ver_num}",
+        "fabric_composition": json.dumps(base["fabric_composition"]) if base["fabric_composition"] else None,
+        "fabric_cut_width": base["fabric_roll_width"] and round(base["fabric_roll_width"] - 0.05, 2),
+        "weft_shrinkage": round(rng.uniform(0, 5), 1),
+        "werp_shrinkage": round(rng.uniform(0, 5), 1),
+        "estimated_logistics_lead_time": rng.choice([14, 21, 30, 45]),
+        "original_cost_per_unit": round(base["cost"] * (1 + 0.03 * (ver_num - 1)), 2),
+        # Rates in percent, as entered in the form
+        "supplier_selling_tolerance": rng.choice([0, 1, 2, 3, 5]),
+        "refundable_tolerance": rng.random() < 0.3,
+        "vietnam_vat_rate": rng.choice(["8%", "10%"]),
+        "refundable_vat": rng.random() < 0.5,
+        "import_duty": rng.choice([0, 5, 12]),
+        "refundable_import_duty": rng.random() < 0.2,
+        "shipping_term": rng.choice(["EXW", "FOB", "DDP"]),
+        "logistics_rate": rng.choice([0, 3, 5, 8]),
+    }
+    return apply_costs(data)
+
+
+def _allocate(cur, prefix: str, count: int, width: int):
+    """Same counters as IdAllocator, so the API keeps numbering after the seeded rows"""
+    cur.execute(ALLOCATE_IDS_QUERY, (prefix, count))
+    last = cur.fetchone()[0]
+    return [format_id(prefix, n, width) for n in range(last - count + 1, last + 1)]
+
+
+def seed_database(dsn, materials=1000, versions=3, skus=2, seed=42, reset=False,
+                  batch_size=500, created_by="bench@company.com"):
+    """
+    Applies pending migrations, then inserts `materials` synthetic materials with
+    `versions` versions and `skus` SKUs each. The same seed on an empty database
+    (reset=True) always produces the same rows and IDs.
+    """
+    run_migrations(dsn)
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            if reset:
+                cur.execute(RESET_QUERY)
+
+            for batch_start in range(0, materials, batch_size):
+                count = min(batch_size, materials - batch_start)
+                doc_ids = _allocate(cur, DOC_PREFIX, count, ID_WIDTH)
+                mmat_ids = _allocate(cur, MMAT_PREFIX, count, ID_WIDTH)
+                sku_ids = _allocate(cur, SKU_PREFIX, count * skus, SKU_ID_WIDTH) if skus else []
+
+                masters, version_rows, sku_rows = [], [], []
+                for i, (doc_id, mmat_id) in enumerate(zip(doc_ids, mmat_ids)):
+                    base = random_material(rng)
+                    base["master_material_id"] = mmat_id
+                    created_at = start + timedelta(minutes=7 * (batch_start + i))
+
+                    doc_uid = None
+                    for ver_num in range(1, versions + 1):
+                        doc_uid = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+                        # Older versions are verified; the current one can be in any state
+                        status = rng.choice(STATUSES) if ver_num == versions else "Submitted - Verified"
+                        version_rows.append(_version_insert_params(
+                            doc_uid, doc_id, ver_num, status, created_by,
+                            created_at + timedelta(days=ver_num - 1),
+                            _version_fields(rng, base, ver_num),
+                        ))
+                    masters.append((doc_id, versions, doc_uid, created_at, created_by))
+
+                    for sku_id in sku_ids[i * skus:(i + 1) * skus]:
+                        sku_rows.append((
+                            sku_id, doc_id, f"REF-{rng.randint(100, 999)}",
+                            rng.choice(COLORS), rng.choice(SIZES), f"QR-{sku_id}",
+                            round(base["cost"] * rng.uniform(0.95, 1.1), 2),
+                        ))
+
+                execute_values(cur, INSERT_MASTERS_QUERY, masters)
+                if version_rows:
+                    execute_values(cur, BULK_INSERT_VERSIONS_QUERY, version_rows)
+                if sku_rows:
+                    execute_values(cur, INSERT_SKUS_QUERY, sku_rows)
+                conn.commit()
+                print(f"   seeded {batch_start + count}/{materials} materials")
+
+            cur.execute("ANALYZE master_materials, material_versions, material_skus")
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {"materials": materials, "versions": materials * versions, "skus": materials * skus}
+
+
+def sample_document_ids(dsn, limit=1000):
+    """Stable list of existing document IDs for the workload to pick from"""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT document_id FROM master_materials ORDER BY document_id LIMIT %s", (limit,))
+            return [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
@@ -0,0 +1,171 @@
+import asyncio
+import math
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.synthetic_data import random_material
+
+
+@dataclass
+class Operation:
+    """One kind of request in the mix: `build(rng, doc_ids)` -> JSON body"""
+    name: str
+    path: str
+    weight: int
+    build: Callable[[random.Random, List[str]], dict]
+
+
+def _by_id(rng, doc_ids):
+    return {"document_id": rng.choice(doc_ids)}
+
+
+def _card_page(rng, doc_ids):
+    body = {"page_size": 50}
+    roll = rng.random()
+    if roll < 0.3:
+        body["material_type"] = rng.choice(["Main Fabric", "Secondary Fabric", "Trim", "Packaging"])
+    elif roll < 0.5:
+        body["min_cost"] = round(rng.uniform(0, 10), 1)
+        body["max_cost"] = body["min_cost"] + 10
+    return body
+
+
+def _new_draft(rng, doc_ids):
+    base = random_material(rng)
+    cost = base.pop("cost")
+    return {**base, "original_cost_per_unit": cost, "change_description": "Benchmark draft"}
+
+
+# Read-heavy mix modelled on the Streamlit app: the grid pages through cards,
+# opening a material loads its detail tabs, and a few users create drafts.
+DEFAULT_MIX = [
+    Operation("cards_list", "/material_cards/list", 2, lambda rng, ids: {}),
+    Operation("cards_page", "/material_cards/page", 20, _card_page),
+    Operation("detail_dashboard", "/material_details/dashboard", 15, _by_id),
+    Operation("detail_cost", "/material_details/cost", 10, _by_id),
+    Operation("detail_history", "/material_details/history", 10, _by_id),
+    Operation("detail_bundle", "/material_details/bundle", 20, _by_id),
+    Operation("sku_get", "/material_sku/get", 15, _by_id),
+    Operation("create_draft", "/material_input/create_draft", 5, _new_draft),
+]
+
+
+def build_schedule(doc_ids: List[str], total: int, seed: int, mix: List[Operation] = None):
+    """
+    The full request sequence, decided up front from the seed so two runs
+    against the same data send exactly the same requests in the same order.
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    ops = rng.choices(mix, weights=[op.weight for op in mix], k=total)
+    return [(op, op.build(rng, doc_ids)) for op in ops]
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(stats: EndpointStats, elapsed: float) -> dict:
+    values = sorted(stats.latencies_ms)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": stats.errors,
+        "status_codes": {str(k): v for k, v in sorted(stats.status_codes.items())},
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str] = None, timeout: float = 30.0):
+    """
+    HTTP client for the workload. Without a base_url the FastAPI app is
+    driven in-process (startup/shutdown events included), which measures the
+    API and database without a network hop or a separate server.
+    """
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+            yield client
+        return
+
+    from main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+            yield client
+
+
+async def _send(client, op: Operation, body: dict, stats: Dict[str, EndpointStats]):
+    endpoint = stats.setdefault(op.name, EndpointStats())
+    start = time.perf_counter()
+    try:
+        response = await client.post(op.path, json=body)
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0  # Connection error / timeout
+    endpoint.latencies_ms.append((time.perf_counter() - start) * 1000)
+    endpoint.status_codes[status] = endpoint.status_codes.get(status, 0) + 1
+    if status == 0 or status >= 400:
+        endpoint.errors += 1
+
+
+async def run_workload(client, doc_ids: List[str], requests=2000, concurrency=16,
+                       warmup=100, seed=1, mix: List[Operation] = None) -> dict:
+    """
+    Sends `requests` requests from the seeded schedule with `concurrency`
+    requests in flight, after `warmup` untimed ones (pool, caches, plans).
+    Returns per-endpoint and overall p50/p95/p99 latency and throughput.
+    """
+    if not doc_ids:
+        raise ValueError("No materials in the database; seed it first")
+
+    schedule = build_schedule(doc_ids, warmup + requests, seed, mix)
+    warmup_ops, timed_ops = schedule[:warmup], schedule[warmup:]
+
+    async def drain(ops, stats):
+        position = iter(ops)
+        async def worker():
+            for op, body in position:
+                await _send(client, op, body, stats)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    await drain(warmup_ops, {})
+
+    stats: Dict[str, EndpointStats] = {}
+    start = time.perf_counter()
+    await drain(timed_ops, stats)
+    elapsed = time.perf_counter() - start
+
+    overall = EndpointStats()
+    for endpoint in stats.values():
+        overall.latencies_ms.extend(endpoint.latencies_ms)
+        overall.errors += endpoint.errors
+        for code, n in endpoint.status_codes.items():
+            overall.status_codes[code] = overall.status_codes.get(code, 0) + n
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(overall, elapsed),
+        "endpoints": {name: summarize(s, elapsed) for name, s in sorted(stats.items())},
+    }
@@ -0,0 +1,71 @@
+import os
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import (
+    GZipMiddleware, IdentityResponder, DEFAULT_EXCLUDED_CONTENT_TYPES
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this go out uncompressed (not worth the CPU)
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", 1024))
+# Lower than the gzip default of 9: the card list is tens of MB of repetitive JSON,
+# where level 5 is nearly as small and several times faster
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", 5))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", 4))
+# Bodies from this size on are compressed in a worker thread
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+# Parquet exports are compressed already
+EXCLUDED_CONTENT_TYPES = DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/vnd.apache.parquet",)
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size, quality=BROTLI_QUALITY, **kwargs):
+        super().__init__(app, minimum_size, **kwargs)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            # Same as gzip: don't block the event loop on large bodies
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        data = self._compressor.process(body)
+        # Streamed exports: flush every chunk so the client can decode as it goes
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Starlette's GZipMiddleware plus brotli when the client accepts it and the
+    brotli package is installed (optional: pip install brotli). Streaming
+    responses (exports) are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESSION_MINIMUM_SIZE, compresslevel=GZIP_LEVEL):
+        super().__init__(
+            app, minimum_size=minimum_size, compresslevel=compresslevel,
+            exclude_content_types=EXCLUDED_CONTENT_TYPES,
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and brotli is not None:
+            accepted = Headers(scope=scope).get("Accept-Encoding", "")
+            if "br" in {token.split(";")[0].strip() for token in accepted.split(",")}:
+                responder = BrotliResponder(
+                    self.app, self.minimum_size, exclude_content_types=self.exclude_content_types
+                )
+                await responder(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
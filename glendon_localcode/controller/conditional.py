@@ -0,0 +1,51 @@
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+# Clients may keep the body but must ask again (If-None-Match) before reusing it
+REVALIDATE = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag from the values that fully determine a response: the route,
+    the request body and a version stamp (document_uid / ver_num / projected_at
+    for one material, the list version for card lists).
+    """
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:32] + '"'
+
+
+def document_etag(route: str, row: dict, *extra):
+    """
+    ETag of a response built from one current_materials row, or None for rows
+    without a projection stamp (the LATEST_VERSION_QUERY fallback): those are
+    never cached by the client.
+    """
+    if not row or row.get("projected_at") is None:
+        return None
+    return make_etag(route, row.get("document_uid"), row.get("ver_num"), row["projected_at"], *extra)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): a compressing proxy may have added W/
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE})
+
+
+def set_etag(response: Response, etag: str):
+    """Adds the validators to the response FastAPI sends (or to a Response the route returns)"""
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = REVALIDATE
+    return response
@@ -0,0 +1,34 @@
+import os
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+# Kill switch: FAST_JSON_RESPONSES=0 sends everything back through response_model validation
+FAST_JSON_RESPONSES = os.environ.get("FAST_JSON_RESPONSES", "1") != "0"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (several times faster than json.dumps on large lists)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def trusted_response(payload, response: Response = None, status_code=200):
+    """
+    Opt-in fast path for payloads we build ourselves and that already have the
+    exact shape of the route's response_model (the card formatters).
+
+    Returning a Response makes FastAPI skip response_model validation and
+    jsonable_encoder; the response_model stays on the route, so the OpenAPI
+    schema is unchanged. Only JSON-native values (str, int, float, bool,
+    None, list, dict) belong here: datetimes and Decimals would not be encoded
+    the way Pydantic encodes them, so those endpoints keep the validated path.
+    `response`: the route's injected Response, whose headers (ETag...) FastAPI
+    would otherwise drop once the route returns a Response of its own.
+    """
+    if not FAST_JSON_RESPONSES:
+        return payload
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(payload, status_code=status_code, headers=headers)
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+
+from schemas.fx_rate_schemas import (
+    FxRateResponse, ListFxRatesRequest, UpsertFxRatesRequest, UpsertFxRatesResponse,
+    RepriceRequest, RepriceResponse
+)
+from logics.fx_rate_logics import FxRateService
+from monitoring.middleware import InstrumentedRoute
+
+router = APIRouter(
+    prefix="/fx_rates",
+    tags=["Exchange Rates"],
+    route_class=InstrumentedRoute
+)
+
+def get_fx_service():
+    return FxRateService()
+
+# ------------------------------------------------------------------
+
+@router.post("/list", response_model=List[FxRateResponse], summary="List Exchange Rates")
+async def list_fx_rates(
+    request: ListFxRatesRequest,
+    service: FxRateService = Depends(get_fx_service)
+):
+    try:
+        rows = await service.list_rates(request.quote_currency)
+        return [{**row, "rate": float(row["rate"])} for row in rows]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/upsert", response_model=UpsertFxRatesResponse, summary="Save Exchange Rates")
+async def upsert_fx_rates(
+    request: UpsertFxRatesRequest,
+    service: FxRateService = Depends(get_fx_service)
+):
+    """
+    Saves the rates and, unless reprice=false, converts every current version
+    to the reporting currency with them.
+    """
+    try:
+        return await service.upsert_rates([r.model_dump() for r in request.rates], reprice=request.reprice)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/reprice", response_model=RepriceResponse, summary="Reprice in Reporting Currency")
+async def reprice(
+    request: RepriceRequest,
+    service: FxRateService = Depends(get_fx_service)
+):
+    """
+    Bulk repricing job: one set-based UPDATE over all current versions,
+    using the latest rate effective on `as_of` for each currency.
+    """
+    try:
+        return await service.reprice(request.as_of)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
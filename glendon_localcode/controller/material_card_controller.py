@@ -1,32 +1,152 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List
 
 # Ensure these match your file structure
-from logics.material_card_logics import process_material_cards
-from data_access.material_card_data_access import MaterialCardDataAccess
-from schemas.material_card_schemas import ListMaterialCardsRequest, MaterialCard
+from logics.material_card_logics import (
+    process_material_cards, build_card_page, decode_cursor, DEFAULT_STATUSES, FILTER_FIELDS
+)
+from logics.material_export_logics import (
+    export_stream, export_filename, EXPORT_MEDIA_TYPES, EXPORT_CHUNK_SIZE
+)
+from logics.current_materials_logics import CurrentMaterialsService
+from data_access.material_card_data_access import AsyncMaterialCardDataAccess
+from data_access.material_export_data_access import AsyncMaterialExportDataAccess
+from data_access.current_materials_data_access import AsyncCurrentMaterialsDataAccess
+from schemas.material_card_schemas import (
+    ListMaterialCardsRequest, MaterialCard, MaterialCardPageRequest, MaterialCardPage,
+    MaterialExportRequest, ProjectionRebuildResponse
+)
+from monitoring.middleware import InstrumentedRoute
+from controller.fast_response import trusted_response
+from controller.conditional import make_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter(
     prefix="/material_cards",
-    tags=["Materials", "UI"]
+    tags=["Materials", "UI"],
+    route_class=InstrumentedRoute
 )
 
 def get_data_access():
-    return MaterialCardDataAccess()
+    return AsyncMaterialCardDataAccess()
+
+def get_export_data_access():
+    return AsyncMaterialExportDataAccess()
+
+def get_projection_service():
+    return CurrentMaterialsService()
+
+def get_projection_data_access():
+    return AsyncCurrentMaterialsDataAccess()
+
+async def _list_etag(route, request, projection: AsyncCurrentMaterialsDataAccess):
+    # Same body + same committed projection = same cards.
+    # Call inside projection.snapshot(), with the reads it stamps.
+    return make_etag(route, request.model_dump(mode="json"), await projection.get_list_version())
 
 @router.post("/list", response_model=List[MaterialCard])
-def list_material_cards(
+async def list_material_cards(
     request: ListMaterialCardsRequest, 
-    data_access: MaterialCardDataAccess = Depends(get_data_access)
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialCardDataAccess = Depends(get_data_access),
+    projection: AsyncCurrentMaterialsDataAccess = Depends(get_projection_data_access)
 ):
   try:
-    # Default to active statuses if none provided
-    status = request.statuses or ["Draft", "Submitted - Unverified", "Submitted - Verified"]
-    
-    all_masters = data_access.fetch_all_master_materials(status)
+    # Stamp and cards from one snapshot (on a replica when routing allows it):
+    # the ETag always describes the rows sent
+    async with projection.snapshot(replica=True):
+      # Conditional request: If-None-Match with the last ETag -> 304, nothing re-read
+      etag = await _list_etag("/material_cards/list", request, projection)
+      if etag_matches(http_request, etag):
+        return not_modified(etag)
+
+      # Default to active statuses if none provided
+      status = request.statuses or DEFAULT_STATUSES
+      filters = request.model_dump(include=set(FILTER_FIELDS), exclude_none=True)
+
+      all_masters = await data_access.fetch_all_master_materials(status, filters)
     result_cards = process_material_cards(all_masters, status)
+    # Only a list that was actually read gets a validator (errors -> 500 below, never cached)
+    set_etag(response, etag)
     
-    return result_cards
+    # Cards are built by _format_single_card in the MaterialCard shape: no re-validation
+    return trusted_response(result_cards, response)
   except Exception as e:
       # Use 500 for server/DB errors
-      raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+      raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/page", response_model=MaterialCardPage)
+async def list_material_cards_page(
+    request: MaterialCardPageRequest,
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialCardDataAccess = Depends(get_data_access),
+    projection: AsyncCurrentMaterialsDataAccess = Depends(get_projection_data_access)
+):
+  """
+  Keyset-paginated card list ordered by newest first.
+  Pass the returned next_cursor back to get the following page.
+  """
+  try:
+    after = decode_cursor(request.cursor, request.sort_by) if request.cursor else None
+  except ValueError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+
+  try:
+    async with projection.snapshot(replica=True):
+      etag = await _list_etag("/material_cards/page", request, projection)
+      if etag_matches(http_request, etag):
+        return not_modified(etag)
+
+      status = request.statuses or DEFAULT_STATUSES
+      filters = request.model_dump(include=set(FILTER_FIELDS), exclude_none=True)
+
+      rows = await data_access.fetch_master_materials_page(
+          status, filters, after=after, limit=request.page_size + 1, sort_by=request.sort_by
+      )
+    set_etag(response, etag)
+    return trusted_response(build_card_page(rows, status, request.page_size, request.sort_by), response)
+  except Exception as e:
+      raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/export")
+async def export_material_catalogue(
+    request: MaterialExportRequest,
+    data_access: AsyncMaterialExportDataAccess = Depends(get_export_data_access)
+):
+  """
+  Current version of every matching material (card filters apply), streamed
+  as CSV, JSONL or Parquet. Rows are read through a server-side cursor and
+  sent chunk by chunk, so memory stays flat whatever the catalogue size.
+  """
+  status = request.statuses or DEFAULT_STATUSES
+  filters = request.model_dump(include=set(FILTER_FIELDS), exclude_none=True)
+
+  chunks = data_access.stream_current_versions(status, filters, chunk_size=EXPORT_CHUNK_SIZE)
+  try:
+    body = export_stream(chunks, request.format)
+  except ValueError as e:
+    await chunks.aclose()
+    raise HTTPException(status_code=501, detail=str(e))
+
+  filename = export_filename(request.format)
+  return StreamingResponse(
+      body,
+      media_type=EXPORT_MEDIA_TYPES[request.format],
+      headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+  )
+
+@router.post("/rebuild_projection", response_model=ProjectionRebuildResponse)
+async def rebuild_projection(
+    service: CurrentMaterialsService = Depends(get_projection_service)
+):
+  """
+  Forces a full re-projection of current_materials from the master/version
+  tables. Only needed after drift (see /projection_stats); triggers keep it
+  in step otherwise. Readers are not blocked while it runs.
+  """
+  try:
+    return await service.rebuild()
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=str(e))
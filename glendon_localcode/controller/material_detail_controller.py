@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import List, Dict, Any
 
 from schemas.material_detail_schemas import ( 
@@ -6,18 +7,27 @@ from schemas.material_detail_schemas import (
     TechnicalDetailResponse, 
     CostDetailResponse,
     MaterialIDRequest,
-    VersionHistoryItem
+    VersionHistoryItem,
+    MaterialBundleRequest,
+    MaterialBundleResponse
 )
-from data_access.material_detail_data_access import MaterialDetailDataAccess
-from logics.material_detail_logics import MaterialDetailLogics
+from data_access.material_detail_data_access import AsyncMaterialDetailDataAccess
+from data_access.material_sku_input_data_access import AsyncSkuDataAccess
+from logics.material_detail_logics import MaterialDetailLogics, BUNDLE_SECTIONS, ROW_SECTIONS
+from monitoring.middleware import InstrumentedRoute
+from controller.conditional import document_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter(
     prefix="/material_details",
-    tags=["Materials"]
+    tags=["Materials"],
+    route_class=InstrumentedRoute
 )
 
 def get_data_access():
-    return MaterialDetailDataAccess()
+    return AsyncMaterialDetailDataAccess()
+
+def get_sku_data_access():
+    return AsyncSkuDataAccess()
 
 def get_logics():
     return MaterialDetailLogics()
@@ -25,68 +35,140 @@ def get_logics():
 # ------------------------------------------------------------------
 
 @router.post("/dashboard", response_model=MaterialDetailResponse)
-def get_material_detail(
+async def get_material_detail(
     request: MaterialIDRequest,
-    data_access: MaterialDetailDataAccess = Depends(get_data_access),
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialDetailDataAccess = Depends(get_data_access),
     logics: MaterialDetailLogics = Depends(get_logics)
 ):
-    version_row = data_access.get_current_version_row(request.document_id)
+    version_row = await data_access.get_current_version_row(request.document_id)
     if not version_row:
         raise HTTPException(status_code=404, detail="Material not found")
-        
+
+    etag = document_etag("/material_details/dashboard", version_row)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return logics.build_material_detail(version_row)
 
 # ------------------------------------------------------------------
 
 @router.post("/technical", response_model=TechnicalDetailResponse)
-def get_technical_detail(
+async def get_technical_detail(
     request: MaterialIDRequest,
-    data_access: MaterialDetailDataAccess = Depends(get_data_access),
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialDetailDataAccess = Depends(get_data_access),
     logics: MaterialDetailLogics = Depends(get_logics)
 ):
-    version_row = data_access.get_current_version_row(request.document_id)
+    version_row = await data_access.get_current_version_row(request.document_id)
     if not version_row:
         raise HTTPException(status_code=404, detail="Material not found")
-        
+
+    etag = document_etag("/material_details/technical", version_row)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return logics.build_technical_detail(version_row)
 
 # ------------------------------------------------------------------
 
 @router.post("/cost", response_model=CostDetailResponse)
-def get_cost_detail(
+async def get_cost_detail(
     request: MaterialIDRequest,
-    data_access: MaterialDetailDataAccess = Depends(get_data_access),
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialDetailDataAccess = Depends(get_data_access),
     logics: MaterialDetailLogics = Depends(get_logics)
 ):
-    version_row = data_access.get_current_version_row(request.document_id)
+    version_row = await data_access.get_current_version_row(request.document_id)
     if not version_row:
         raise HTTPException(status_code=404, detail="Material not found")
-        
+
+    etag = document_etag("/material_details/cost", version_row)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return logics.build_cost_detail(version_row)
 
 # ------------------------------------------------------------------
 
 @router.post("/history", response_model=List[VersionHistoryItem])
-def get_version_history(
+async def get_version_history(
     request: MaterialIDRequest,
-    data_access: MaterialDetailDataAccess = Depends(get_data_access),
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialDetailDataAccess = Depends(get_data_access),
     logics: MaterialDetailLogics = Depends(get_logics)
 ):
-    history_rows = data_access.get_version_history_rows(request.document_id)
+    # Versions are append-only and every new one becomes current: the current
+    # row's stamp (usually cached) also versions the history
+    version_row = await data_access.get_current_version_row(request.document_id)
+    etag = document_etag("/material_details/history", version_row)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    history_rows = await data_access.get_version_history_rows(request.document_id)
     return logics.build_version_history(history_rows)
 
 # ------------------------------------------------------------------
 
 @router.post("/full_row", response_model=Dict[str, Any])
-def get_material_full_row(
+async def get_material_full_row(
     request: MaterialIDRequest,
-    data_access: MaterialDetailDataAccess = Depends(get_data_access),
+    data_access: AsyncMaterialDetailDataAccess = Depends(get_data_access),
     logics: MaterialDetailLogics = Depends(get_logics)
 ):
     try:
-        version_row = data_access.get_current_version_row(request.document_id)
+        version_row = await data_access.get_current_version_row(request.document_id)
         if not version_row:
             return {}
         return logics.build_full_row(version_row)
     except Exception as e:
-        return {}
\ No newline at end of file
+        return {}
+
+# ------------------------------------------------------------------
+
+@router.post("/bundle", response_model=MaterialBundleResponse)
+async def get_material_bundle(
+    request: MaterialBundleRequest,
+    http_request: Request,
+    response: Response,
+    data_access: AsyncMaterialDetailDataAccess = Depends(get_data_access),
+    sku_data_access: AsyncSkuDataAccess = Depends(get_sku_data_access),
+    logics: MaterialDetailLogics = Depends(get_logics)
+):
+    """
+    Every section of the detail page in one call: the version row is fetched
+    once for dashboard/technical/cost, and history/SKUs run concurrently with it.
+    Use `sections` to skip what the client does not show.
+    """
+    sections = set(request.sections or BUNDLE_SECTIONS)
+    doc_id = request.document_id
+
+    async def _none():
+        return None
+
+    version_row = None
+    if "skus" not in sections:
+        # SKUs are not versioned: only SKU-less bundles can be validated by the row stamp
+        version_row = await data_access.get_current_version_row(doc_id)
+        etag = document_etag("/material_details/bundle", version_row, sorted(sections))
+        if etag_matches(http_request, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
+    async def _row():
+        return version_row or await data_access.get_current_version_row(doc_id)
+
+    version_row, history_rows, sku_rows = await asyncio.gather(
+        _row() if sections & ROW_SECTIONS else _none(),
+        data_access.get_version_history_rows(doc_id) if "history" in sections else _none(),
+        sku_data_access.get_skus_by_master_id(doc_id) if "skus" in sections else _none(),
+    )
+    if sections & ROW_SECTIONS and not version_row:
+        raise HTTPException(status_code=404, detail="Material not found")
+
+    return logics.build_bundle(doc_id, sections, version_row, history_rows, sku_rows)
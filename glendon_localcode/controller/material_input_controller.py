@@ -1,26 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Literal, Optional
 from schemas.material_input_schemas import (
     CreateMaterialRequest, 
     MaterialResponse, 
     UpdateDraftRequest, 
     SubmitVersionRequest, 
-    EditVerifiedRequest
+    EditVerifiedRequest,
+    BulkImportResponse,
+    RecomputeCostsRequest,
+    RecomputeCostsResponse
 )
 from logics.material_input_logics import MaterialService
+from logics.material_import_logics import MaterialImportService, parse_import_rows
+from logics.cost_engine_logics import CostRecomputeService
 
 # 1. Create Router
+from monitoring.middleware import InstrumentedRoute
+
 router = APIRouter(
     prefix="/material_input",
-    tags=["Material Input"]
+    tags=["Material Input"],
+    route_class=InstrumentedRoute
 )
 
 def get_service():
     return MaterialService()
 
+def get_import_service():
+    return MaterialImportService()
+
+def get_cost_service():
+    return CostRecomputeService()
+
+# Content-Type -> import format, when ?format= is not given
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+}
+
 # ------------------------------------------------------------------
 
 @router.post("/create_and_submit", response_model=MaterialResponse, summary="Create & Submit Immediately")
-def create_and_submit_material(
+async def create_and_submit_material(
     request: CreateMaterialRequest,
     service: MaterialService = Depends(get_service)
 ):
@@ -28,7 +50,7 @@ def create_and_submit_material(
     Creates a new material and immediately submits it (bypassing draft status).
     """
     try:
-        return service.create_material(
+        return await service.create_material(
             request_data=request.model_dump(exclude_none=True), 
             is_submit=True
         )
@@ -39,12 +61,12 @@ def create_and_submit_material(
 # ------------------------------------------------------------------
 
 @router.post("/create_draft", response_model=MaterialResponse, summary="Create New Draft")
-def create_material_draft(
+async def create_material_draft(
     request: CreateMaterialRequest,
     service: MaterialService = Depends(get_service)
 ):
     try:
-        return service.create_material(
+        return await service.create_material(
             request_data=request.model_dump(exclude_none=True), 
             is_submit=False
         )
@@ -54,12 +76,12 @@ def create_material_draft(
 # ------------------------------------------------------------------
 
 @router.post("/update_draft", response_model=MaterialResponse, summary="Update Existing Draft")
-def update_draft(
+async def update_draft(
     request: UpdateDraftRequest,
     service: MaterialService = Depends(get_service)
 ):
     try:
-        return service.update_draft(
+        return await service.update_draft(
             document_id=request.document_id,
             updates=request.model_dump(exclude={'document_id'}, exclude_none=True)
         )
@@ -69,14 +91,14 @@ def update_draft(
 # ------------------------------------------------------------------
 
 @router.post("/submit_version", response_model=MaterialResponse, summary="Submit Draft to Unverified")
-def submit_version(
+async def submit_version(
     request: SubmitVersionRequest,
     service: MaterialService = Depends(get_service)
 ):
     try:
-        return service.submit_version(
+        return await service.submit_version(
             document_id=request.document_id,
-            final_updates=request.form_data
+            final_updates=request.form_data.model_dump(exclude_unset=True)
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -84,14 +106,56 @@ def submit_version(
 # ------------------------------------------------------------------
 
 @router.post("/edit_verified", response_model=MaterialResponse, summary="Revise Verified Document")
-def edit_verified(
+async def edit_verified(
     request: EditVerifiedRequest,
     service: MaterialService = Depends(get_service)
 ):
     try:
-        return service.create_revision_from_verified(
+        return await service.create_revision_from_verified(
             document_id=request.document_id,
-            updates=request.form_data
+            updates=request.form_data.model_dump(exclude_unset=True)
         )
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+# ------------------------------------------------------------------
+
+@router.post("/bulk_import", response_model=BulkImportResponse, summary="Bulk Import from CSV / JSONL")
+async def bulk_import(
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="Defaults to the Content-Type"),
+    submit: bool = Query(False, description="Create as 'Submitted - Unverified' instead of 'Draft'"),
+    all_or_nothing: bool = Query(False, description="Import nothing if any row is invalid"),
+    service: MaterialImportService = Depends(get_import_service)
+):
+    """
+    Raw CSV (header row = CreateMaterialRequest field names) or JSONL body.
+    Every valid row becomes a new document; the response reports each row.
+    """
+    fmt = format or IMPORT_CONTENT_TYPES.get(request.headers.get("content-type", "").split(";")[0].strip())
+    if not fmt:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass ?format=")
+    try:
+        rows = parse_import_rows(await request.body(), fmt)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return await service.import_materials(rows, is_submit=submit, all_or_nothing=all_or_nothing)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ------------------------------------------------------------------
+
+@router.post("/recompute_costs", response_model=RecomputeCostsResponse, summary="Recalculate Stored Costs")
+async def recompute_costs(
+    request: RecomputeCostsRequest,
+    service: CostRecomputeService = Depends(get_cost_service)
+):
+    """
+    Re-runs the cost engine (vectorized) over stored versions and fixes any
+    effective / landed cost or logistics fee that does not match.
+    """
+    try:
+        return await service.recompute(current_only=request.current_only, dry_run=request.dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from schemas.material_search_schemas import MaterialSearchRequest, MaterialSearchResponse
+from logics.material_search_logics import MaterialSearchService
+from logics.material_card_logics import FILTER_FIELDS
+from monitoring.middleware import InstrumentedRoute
+from controller.fast_response import trusted_response
+
+router = APIRouter(
+    prefix="/materials",
+    tags=["Materials", "Search"],
+    route_class=InstrumentedRoute
+)
+
+def get_search_service():
+    return MaterialSearchService()
+
+# ------------------------------------------------------------------
+
+@router.post("/search", response_model=MaterialSearchResponse, summary="Search Materials")
+async def search_materials(
+    request: MaterialSearchRequest,
+    service: MaterialSearchService = Depends(get_search_service)
+):
+    """
+    Ranked full-text search over name, supplier, type and IDs (prefix matching,
+    plus trigram fuzzy matching where pg_trgm is installed). Exact ID hits first.
+    """
+    filters = request.model_dump(include=set(FILTER_FIELDS), exclude_none=True)
+    try:
+        return trusted_response(await service.search(
+            request.query, request.statuses, filters,
+            page=request.page, page_size=request.page_size, match=request.match
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,11 +3,13 @@ from typing import List
 
 # Import Schemas
 from schemas.material_sku_input_schemas import SkuResponse, CreateSkuRequest, SkuRequest
-from logics.material_sku_input_logics import SkuLogics
+from logics.material_sku_input_logics import SkuLogics, map_sku_row
+from monitoring.middleware import InstrumentedRoute
 
 router = APIRouter(
     prefix="/material_sku",
-    tags=["SKU Inventory"]
+    tags=["SKU Inventory"],
+    route_class=InstrumentedRoute
 )
 
 def get_sku_logics():
@@ -16,7 +18,7 @@ def get_sku_logics():
 # ------------------------------------------------------------------
 
 @router.post("/get", response_model=List[SkuResponse], summary="Get SKUs for Material")
-def get_material_sku(
+async def get_material_sku(
     request: SkuRequest,
     logics: SkuLogics = Depends(get_sku_logics)
 ):
@@ -24,35 +26,24 @@ def get_material_sku(
     Get all SKUs associated with a specific material document ID.
     """
     try:
-        raw_skus = logics.get_skus_for_material(request.document_id)
+        raw_skus = await logics.get_skus_for_material(request.document_id)
         
         # FIX: Map DB column 'master_material_document_id' to Schema field 'master_material_id'
-        mapped_skus = []
-        for sku in raw_skus:
-            # Create a copy to avoid mutating the original if cached
-            sku_dict = dict(sku)
-            if 'master_material_document_id' in sku_dict:
-                sku_dict['master_material_id'] = sku_dict.pop('master_material_document_id')
-            mapped_skus.append(sku_dict)
-            
-        return mapped_skus
+        return [map_sku_row(sku) for sku in raw_skus]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/create", response_model=SkuResponse, summary="Create New SKU")
-def create_material_sku(
+async def create_material_sku(
     request: CreateSkuRequest,
     logics: SkuLogics = Depends(get_sku_logics)
 ):
     try:
         # Delegate work to the service
-        new_sku = logics.create_new_sku(request)
+        new_sku = await logics.create_new_sku(request)
         
-        # Fix mapping for the response here as well
-        if 'master_material_document_id' in new_sku:
-             new_sku['master_material_id'] = new_sku.pop('master_material_document_id')
-             
-        return new_sku
+        # Same mapping as /get: the stored row carries 'master_material_document_id'
+        return map_sku_row(new_sku)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,50 @@
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+
+from data_access.replica_routing import REPLICA_URLS, REPLICA_MAX_LAG_SECONDS, begin_request, end_request
+
+# Set after a write: until this epoch time the session reads from the primary
+STICKY_COOKIE = "db_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """
+    Session stickiness for the replica routing. A request that wrote answers
+    with a cookie pinning its session to the primary for REPLICA_MAX_LAG_SECONDS,
+    so the reads that follow see the write even if the replicas are behind.
+    The cookie carries the deadline itself: it works across Gunicorn workers
+    without any shared state. A no-op when DATABASE_REPLICA_URLS is not set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REPLICA_URLS:
+            await self.app(scope, receive, send)
+            return
+
+        cookie = cookie_parser(Headers(scope=scope).get("cookie", "")).get(STICKY_COOKIE)
+        try:
+            primary_until = float(cookie) if cookie else 0.0
+        except ValueError:
+            primary_until = 0.0
+        state, token = begin_request(primary_until)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and state.wrote:
+                until = time.time() + REPLICA_MAX_LAG_SECONDS
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(REPLICA_MAX_LAG_SECONDS) + 1}; "
+                    f"Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            end_request(token)
@@ -0,0 +1,194 @@
+import time
+from contextlib import asynccontextmanager, AsyncExitStack
+from contextvars import ContextVar
+from functools import lru_cache
+
+from data_access.async_connection_pool import get_async_pool, async_replica_connection
+from data_access.replica_routing import routes_to_replica, mark_write
+from monitoring.metrics import track_query, observe_query, normalize_sql
+
+DRIVER = "asyncpg"
+
+# asyncpg connection of the unit of work open in the current task (if any)
+_current_conn = ContextVar("current_async_conn", default=None)
+
+@lru_cache(maxsize=512)
+def to_asyncpg_sql(query: str) -> str:
+    """
+    Rewrites psycopg2-style placeholders so both repository flavours share SQL:
+    '%s' -> '$1', '$2', ... and '%%' -> '%'
+    """
+    out = []
+    n = 0
+    i = 0
+    while i < len(query):
+        if query.startswith("%%", i):
+            out.append("%")
+            i += 2
+        elif query.startswith("%s", i):
+            n += 1
+            out.append(f"${n}")
+            i += 2
+        else:
+            out.append(query[i])
+            i += 1
+    return "".join(out)
+
+def _status_rows(status):
+    """Row count from an asyncpg command tag ('UPDATE 3', 'INSERT 0 5', 'COPY 100')"""
+    tail = (status or "").rsplit(" ", 1)[-1]
+    return int(tail) if tail.isdigit() else None
+
+class AsyncBaseRepository:
+    """asyncpg counterpart of BaseRepository (same method names, awaited)"""
+
+    def __init__(self, table_name):
+        self.table_name = table_name
+
+    @property
+    def in_transaction(self) -> bool:
+        return _current_conn.get() is not None
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Borrows a connection from the shared pool and gives it back on exit.
+        Reads inside a @replica_read method go to a replica when one is reachable.
+        """
+        conn = _current_conn.get()
+        if conn is not None:
+            # Inside a unit of work: reuse its connection
+            yield conn
+            return
+        if routes_to_replica():
+            async with async_replica_connection() as conn:
+                if conn is not None:
+                    yield conn
+                    return
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Unit of work: every async repository call inside the block shares one
+        connection and commits once. Nested blocks join the outer transaction.
+        Calls inside the block must be awaited one after another (no gather),
+        since an asyncpg connection runs one query at a time.
+        """
+        if _current_conn.get() is not None:
+            yield self
+            return
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                token = _current_conn.set(conn)
+                try:
+                    yield self
+                finally:
+                    _current_conn.reset(token)
+            mark_write()
+
+    @asynccontextmanager
+    async def snapshot(self, replica=False):
+        """
+        Read-only REPEATABLE READ unit of work: every read in the block sees the
+        same committed state (a list version stamp and the rows it stamps).
+        With `replica=True` the whole snapshot is taken on one replica (when
+        routing allows it), so stamp and rows never come from different servers.
+        Nested in a unit of work, it joins it.
+        """
+        if _current_conn.get() is not None:
+            yield self
+            return
+        async with AsyncExitStack() as stack:
+            conn = None
+            if routes_to_replica(replica):
+                conn = await stack.enter_async_context(async_replica_connection())
+            if conn is None:
+                pool = await get_async_pool()
+                conn = await stack.enter_async_context(pool.acquire())
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                token = _current_conn.set(conn)
+                try:
+                    yield self
+                finally:
+                    _current_conn.reset(token)
+
+    async def execute(self, query, params=None):
+        """Executes a Write command (INSERT/UPDATE/DELETE)"""
+        async with self.connection() as conn:
+            with track_query(DRIVER, query) as timer:
+                status = await conn.execute(to_asyncpg_sql(query), *(params or ()))
+                timer.rows = _status_rows(status)
+        mark_write()
+
+    async def execute_returning(self, query, params=None):
+        """Executes a Write command with a RETURNING clause and returns that row"""
+        async with self.connection() as conn:
+            with track_query(DRIVER, query) as timer:
+                row = await conn.fetchrow(to_asyncpg_sql(query), *(params or ()))
+                timer.rows = int(row is not None)
+        mark_write()
+        return dict(row) if row else None
+
+    async def copy_records(self, table, columns, records):
+        """Bulk-loads `records` (tuples in `columns` order) with COPY ... FROM STDIN"""
+        async with self.connection() as conn:
+            with track_query(DRIVER, f"COPY {table} ({', '.join(columns)}) FROM STDIN") as timer:
+                status = await conn.copy_records_to_table(table, columns=list(columns), records=records)
+                timer.rows = _status_rows(status)
+        mark_write()
+
+    async def fetch_chunks(self, query, params=None, chunk_size=1000, replica=False):
+        """
+        Async generator over the result in lists of up to `chunk_size` rows,
+        read through a server-side cursor in a read-only snapshot. Uses its own
+        pooled connection (not the unit of work) until exhausted or closed
+        (a replica's with `replica=True`, see data_access/replica_routing.py).
+        Metrics count only the time spent in the database, not in the consumer.
+        """
+        elapsed, total = 0.0, 0
+        try:
+            async with AsyncExitStack() as stack:
+                conn = None
+                if routes_to_replica(replica):
+                    conn = await stack.enter_async_context(async_replica_connection())
+                if conn is None:
+                    pool = await get_async_pool()
+                    conn = await stack.enter_async_context(pool.acquire())
+                async with conn.transaction(isolation="repeatable_read", readonly=True):
+                    chunk = []
+                    cursor = conn.cursor(to_asyncpg_sql(query), *(params or ()), prefetch=chunk_size)
+                    start = time.perf_counter()
+                    async for record in cursor:
+                        chunk.append(dict(record))
+                        if len(chunk) >= chunk_size:
+                            elapsed += time.perf_counter() - start
+                            total += len(chunk)
+                            yield chunk
+                            chunk = []
+                            start = time.perf_counter()
+                    elapsed += time.perf_counter() - start
+                    if chunk:
+                        total += len(chunk)
+                        yield chunk
+        finally:
+            observe_query(DRIVER, normalize_sql(query), elapsed, total)
+
+    async def fetch_one(self, query, params=None):
+        """Fetches a single row"""
+        async with self.connection() as conn:
+            with track_query(DRIVER, query) as timer:
+                row = await conn.fetchrow(to_asyncpg_sql(query), *(params or ()))
+                timer.rows = int(row is not None)
+            return dict(row) if row else None
+
+    async def fetch_all(self, query, params=None):
+        """Fetches every row"""
+        async with self.connection() as conn:
+            with track_query(DRIVER, query) as timer:
+                rows = await conn.fetch(to_asyncpg_sql(query), *(params or ()))
+                timer.rows = len(rows)
+            return [dict(r) for r in rows]
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from monitoring.metrics import DB_CONNECTIONS_OPENED, DB_POOL_WAIT_SECONDS
+from data_access.replica_routing import REPLICA_URLS, ReplicaSelector
+
+
+def _encode_json(value):
+    # Repositories already json.dumps() some payloads (shared with the psycopg2 path)
+    return (value if isinstance(value, str) else json.dumps(value)).encode()
+
+
+def _encode_jsonb(value):
+    # jsonb binary format = version byte 1 + the JSON text
+    return b"\x01" + _encode_json(value)
+
+
+def _decode_jsonb(data):
+    return json.loads(data[1:])
+
+
+async def _init_connection(conn):
+    # Called once per new connection
+    DB_CONNECTIONS_OPENED.inc(driver="asyncpg")
+    # Decode json/jsonb to Python objects like psycopg2 does. Binary format so
+    # the same codecs also work for COPY (copy_records_to_table is binary only).
+    await conn.set_type_codec(
+        "json", encoder=_encode_json, decoder=json.loads, schema="pg_catalog", format="binary"
+    )
+    await conn.set_type_codec(
+        "jsonb", encoder=_encode_jsonb, decoder=_decode_jsonb, schema="pg_catalog", format="binary"
+    )
+
+
+class AsyncConnectionPool:
+    """
+    Thin wrapper around an asyncpg pool that keeps the same stats as the
+    psycopg2 ConnectionPool (in use, waiting, wait time).
+    """
+
+    def __init__(self, dsn, min_size=2, max_size=20, timeout=30.0):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self._pool = None
+
+        # Stats
+        self._in_use = 0
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def open(self):
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            init=_init_connection,
+        )
+        return self
+
+    @asynccontextmanager
+    async def acquire(self):
+        start = time.monotonic()
+        self._waiting += 1
+        try:
+            conn = await self._pool.acquire(timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self._checkouts += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        DB_POOL_WAIT_SECONDS.observe(waited, driver="asyncpg")
+        self._in_use += 1
+        try:
+            yield conn
+        finally:
+            self._in_use -= 1
+            await self._pool.release(conn)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    def stats(self) -> dict:
+        checkouts = self._checkouts
+        return {
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": self._pool.get_size() if self._pool else 0,
+            "idle": self._pool.get_idle_size() if self._pool else 0,
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "checkouts": checkouts,
+            "timeouts": self._timeouts,
+            "wait_time_total_ms": round(self._wait_total * 1000, 3),
+            "wait_time_avg_ms": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+            "wait_time_max_ms": round(self._wait_max * 1000, 3),
+        }
+
+
+# -------------------------------------------------------------
+# Process-wide pool (one per event loop / worker)
+# -------------------------------------------------------------
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """
+    Returns the asyncpg pool shared by all async repositories, creating it on
+    first use. Sizing comes from ASYNC_DB_POOL_MIN_SIZE / ASYNC_DB_POOL_MAX_SIZE.
+    """
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                dsn = os.environ.get("DATABASE_URL")
+                if not dsn:
+                    raise ValueError("DATABASE_URL is missing")
+                _pool = await AsyncConnectionPool(
+                    dsn,
+                    min_size=int(os.environ.get("ASYNC_DB_POOL_MIN_SIZE", 2)),
+                    max_size=int(os.environ.get("ASYNC_DB_POOL_MAX_SIZE", 20)),
+                    timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+                ).open()
+    return _pool
+
+
+def get_async_pool_stats() -> dict:
+    if _pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pool.stats()}
+
+
+# -------------------------------------------------------------
+# Replica pools (DATABASE_REPLICA_URLS), one per replica, same sizing
+# as the primary pool (a hot standby has at least its max_connections)
+# -------------------------------------------------------------
+_replica_pools = {}
+_replica_selector = ReplicaSelector(REPLICA_URLS)
+# Connecting to a replica that is down fails with one of these
+REPLICA_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+
+@asynccontextmanager
+async def async_replica_connection():
+    """
+    Connection to the next reachable replica, or None when there is none
+    (the caller falls back to the primary). A replica that fails to connect
+    is skipped for REPLICA_RETRY_SECONDS.
+    """
+    for dsn in _replica_selector.candidates():
+        try:
+            pool = _replica_pools.get(dsn)
+            if pool is None:
+                async with _pool_lock:
+                    pool = _replica_pools.get(dsn)
+                    if pool is None:
+                        pool = _replica_pools[dsn] = await AsyncConnectionPool(
+                            dsn,
+                            min_size=int(os.environ.get("ASYNC_DB_POOL_MIN_SIZE", 2)),
+                            max_size=int(os.environ.get("ASYNC_DB_POOL_MAX_SIZE", 20)),
+                            timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+                        ).open()
+            acquired = pool.acquire()
+            conn = await acquired.__aenter__()
+        except REPLICA_ERRORS as e:
+            _replica_selector.mark_down(dsn, e)
+            continue
+        try:
+            yield conn
+        except BaseException as e:
+            if not await acquired.__aexit__(type(e), e, e.__traceback__):
+                raise
+        else:
+            await acquired.__aexit__(None, None, None)
+        return
+    yield None
+
+
+def get_async_replica_pool_stats() -> list:
+    return [{"initialized": True, **pool.stats()} for pool in list(_replica_pools.values())]
+
+
+async def close_async_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+    for pool in list(_replica_pools.values()):
+        await pool.close()
+    _replica_pools.clear()
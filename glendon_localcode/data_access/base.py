@@ -1,37 +1,173 @@
-import os
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import time
+import uuid
+from contextlib import contextmanager, ExitStack
+from contextvars import ContextVar
+from psycopg2.extras import RealDictCursor, execute_values
+
+from data_access.connection_pool import get_pool, replica_connection
+from data_access.replica_routing import routes_to_replica, mark_write
+from monitoring.metrics import track_query, observe_query, normalize_sql
+
+DRIVER = "psycopg2"
+
+# Connection of the unit of work currently open in this context (if any).
+# Shared by every repository so one logical operation = one connection + one commit.
+_current_conn = ContextVar("current_conn", default=None)
 
 class BaseRepository:
     def __init__(self, table_name):
         self.table_name = table_name
-        self.db_url = os.environ.get("DATABASE_URL")
 
-    def get_connection(self):
-        if not self.db_url:
-            raise ValueError("DATABASE_URL is missing")
-        return psycopg2.connect(self.db_url)
+    @property
+    def in_transaction(self) -> bool:
+        return _current_conn.get() is not None
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrows a connection from the shared pool and gives it back on exit.
+        Reads inside a @replica_read method go to a replica when one is reachable.
+        """
+        conn = _current_conn.get()
+        if conn is not None:
+            # Inside a unit of work: reuse its connection
+            yield conn
+            return
+        if routes_to_replica():
+            with replica_connection() as conn:
+                if conn is not None:
+                    yield conn
+                    return
+        with get_pool().connection() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Unit of work: every repository call made inside the block shares one
+        connection and is committed once at the end (rolled back on error).
+        Nested blocks join the outer transaction.
+        """
+        if _current_conn.get() is not None:
+            yield self
+            return
+        with get_pool().connection() as conn:
+            token = _current_conn.set(conn)
+            try:
+                yield self
+                conn.commit()
+                mark_write()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                _current_conn.reset(token)
+
+    @contextmanager
+    def snapshot(self, replica=False):
+        """
+        Read-only REPEATABLE READ unit of work: every read in the block sees the
+        same committed state (a list version stamp and the rows it stamps).
+        With `replica=True` the whole snapshot is taken on one replica (when
+        routing allows it), so stamp and rows never come from different servers.
+        Nested in a unit of work, it joins it.
+        """
+        if _current_conn.get() is not None:
+            yield self
+            return
+        with ExitStack() as stack:
+            conn = stack.enter_context(replica_connection()) if routes_to_replica(replica) else None
+            if conn is None:
+                conn = stack.enter_context(get_pool().connection())
+            with conn.cursor() as cur:
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            token = _current_conn.set(conn)
+            try:
+                yield self
+            finally:
+                _current_conn.reset(token)
+                conn.rollback()  # Nothing to commit
 
     def execute(self, query, params=None):
         """Executes a Write command (INSERT/UPDATE/DELETE)"""
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cur:
+        with self.connection() as conn:
+            with conn.cursor() as cur, track_query(DRIVER, query) as timer:
                 cur.execute(query, params)
+                timer.rows = cur.rowcount
+            if not self.in_transaction:
                 conn.commit()
-        finally:
-            conn.close()
+                mark_write()
+
+    def execute_returning(self, query, params=None):
+        """Executes a Write command with a RETURNING clause and returns that row"""
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur, track_query(DRIVER, query) as timer:
+                cur.execute(query, params)
+                row = cur.fetchone()
+                timer.rows = int(row is not None)
+            if not self.in_transaction:
+                conn.commit()
+                mark_write()
+            return row
+
+    def execute_values(self, query, rows, page_size=1000):
+        """Multi-row INSERT: `query` has a single 'VALUES %s' that is expanded with `rows`"""
+        with self.connection() as conn:
+            with conn.cursor() as cur, track_query(DRIVER, query) as timer:
+                execute_values(cur, query, rows, page_size=page_size)
+                timer.rows = len(rows)
+            if not self.in_transaction:
+                conn.commit()
+                mark_write()
 
     def fetch_one(self, query, params=None):
         """Fetches a single row"""
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur, track_query(DRIVER, query) as timer:
+                cur.execute(query, params)
+                row = cur.fetchone()
+                timer.rows = int(row is not None)
+                return row
+
+    def fetch_all(self, query, params=None):
+        """Fetches every row"""
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur, track_query(DRIVER, query) as timer:
                 cur.execute(query, params)
-                return cur.fetchone()
-        finally:
-            conn.close()
+                rows = cur.fetchall()
+                timer.rows = len(rows)
+                return rows
+
+    def fetch_chunks(self, query, params=None, chunk_size=1000, replica=False):
+        """
+        Yields the result in lists of up to `chunk_size` rows through a named
+        (server-side) cursor, so memory stays flat however many rows match.
+        Holds its own pooled connection until the generator is exhausted or closed
+        (a replica's with `replica=True`, see data_access/replica_routing.py).
+        Metrics count only the time spent in the database, not in the consumer.
+        """
+        elapsed, total = 0.0, 0
+        with ExitStack() as stack:
+            conn = stack.enter_context(replica_connection()) if routes_to_replica(replica) else None
+            if conn is None:
+                conn = stack.enter_context(get_pool().connection())
+            try:
+                with conn.cursor(name=f"chunks_{uuid.uuid4().hex}", cursor_factory=RealDictCursor) as cur:
+                    cur.itersize = chunk_size
+                    start = time.perf_counter()
+                    cur.execute(query, params)
+                    while True:
+                        rows = cur.fetchmany(chunk_size)
+                        elapsed += time.perf_counter() - start
+                        if not rows:
+                            break
+                        total += len(rows)
+                        yield rows
+                        start = time.perf_counter()
+            finally:
+                conn.rollback()  # Read-only: just end the cursor's transaction
+                observe_query(DRIVER, normalize_sql(query), elapsed, total)
 
     def search(self, **kwargs):
         # (Your existing search function can stay here if you still use it)
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,295 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+
+from monitoring.metrics import DB_CONNECTIONS_OPENED, DB_POOL_WAIT_SECONDS
+from data_access.replica_routing import REPLICA_URLS, ReplicaSelector
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out before the timeout"""
+
+
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 connection pool shared by every repository.
+    Idle connections are health-checked on checkout and the pool keeps
+    counters (in use, waiting, wait time) that can be read at runtime.
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10, timeout=30.0, check_idle_after=30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        # Connections idle for longer than this get a 'SELECT 1' before reuse
+        self.check_idle_after = check_idle_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, last_used) pairs, most recent on the right
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        # Stats
+        self._checkouts = 0
+        self._timeouts = 0
+        self._opened = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    # ---------------------------------------------------------
+    # Connection lifecycle
+    # ---------------------------------------------------------
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        with self._cond:
+            self._opened += 1
+        DB_CONNECTIONS_OPENED.inc(driver="psycopg2")
+        return conn
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._discarded += 1
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.check_idle_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        conn, last_used = None, None
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                    if self._idle:
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._in_use + len(self._idle) < self.max_size:
+                        break  # Free slot: open a new connection below
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No database connection available after {self.timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                # Reserve the slot before releasing the lock
+                self._in_use += 1
+            finally:
+                self._waiting -= 1
+
+            waited = time.monotonic() - start
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        DB_POOL_WAIT_SECONDS.observe(waited, driver="psycopg2")
+
+        # Connecting / health-checking happens outside the lock
+        try:
+            if conn is not None and not self._is_healthy(conn, last_used):
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def putconn(self, conn, discard=False):
+        if not discard and not conn.closed:
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                discard = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                # Never hand out a connection with an open transaction
+                try:
+                    conn.rollback()
+                except Exception:
+                    discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            keep = not (discard or conn.closed or self._closed)
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Checks out a connection and always returns it to the pool"""
+        conn = self.getconn()
+        try:
+            yield conn
+        except psycopg2.InterfaceError:
+            # Connection died mid-request: don't put it back
+            self.putconn(conn, discard=True)
+            raise
+        except BaseException:
+            self.putconn(conn)
+            raise
+        else:
+            self.putconn(conn)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    # ---------------------------------------------------------
+    # Stats
+    # ---------------------------------------------------------
+    def stats(self) -> dict:
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._in_use + len(self._idle),
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "connections_opened": self._opened,
+                "connections_discarded": self._discarded,
+                "wait_time_total_ms": round(self._wait_total * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+# -------------------------------------------------------------
+# Process-wide pool
+# -------------------------------------------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the pool shared by all repositories, creating it on first use.
+    Sizing comes from DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                dsn = os.environ.get("DATABASE_URL")
+                if not dsn:
+                    raise ValueError("DATABASE_URL is missing")
+                _pool = ConnectionPool(
+                    dsn,
+                    min_size=int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+                    max_size=int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                    timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+                    check_idle_after=float(os.environ.get("DB_POOL_CHECK_IDLE_AFTER", 30)),
+                )
+    return _pool
+
+
+def get_pool_stats() -> dict:
+    if _pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pool.stats()}
+
+
+# -------------------------------------------------------------
+# Replica pools (DATABASE_REPLICA_URLS), one per replica, same sizing
+# as the primary pool (a hot standby has at least its max_connections)
+# -------------------------------------------------------------
+_replica_pools = {}
+_replica_selector = ReplicaSelector(REPLICA_URLS)
+
+
+@contextmanager
+def replica_connection():
+    """
+    Connection to the next reachable replica, or None when there is none
+    (the caller falls back to the primary). A replica that fails to connect
+    is skipped for REPLICA_RETRY_SECONDS.
+    """
+    for dsn in _replica_selector.candidates():
+        try:
+            with _pool_lock:
+                pool = _replica_pools.get(dsn)
+                if pool is None:
+                    pool = _replica_pools[dsn] = ConnectionPool(
+                        dsn,
+                        min_size=int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+                        max_size=int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                        timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+                        check_idle_after=float(os.environ.get("DB_POOL_CHECK_IDLE_AFTER", 30)),
+                    )
+            conn = pool.getconn()
+        except psycopg2.OperationalError as e:
+            _replica_selector.mark_down(dsn, e)
+            continue
+        try:
+            yield conn
+        except psycopg2.InterfaceError:
+            pool.putconn(conn, discard=True)
+            raise
+        except BaseException:
+            pool.putconn(conn)
+            raise
+        else:
+            pool.putconn(conn)
+        return
+    yield None
+
+
+def get_replica_pool_stats() -> list:
+    return [{"initialized": True, **pool.stats()} for pool in list(_replica_pools.values())]
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        for pool in _replica_pools.values():
+            pool.close()
+        _replica_pools.clear()
@@ -0,0 +1,83 @@
+from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_cache import NOTIFY_CHANNEL, NOTIFY_ALL
+from data_access.material_input_data_access import NOTIFY_CHANGED_QUERY
+
+# current_materials is kept in step by triggers (migration 0007), so any
+# difference from current_materials_source is drift: disabled triggers,
+# session_replication_role=replica restores, or a column added to one side only.
+# Full comparison: meant for a monitoring scrape, not for every request.
+# projected_at / search_vector exist only on the projection side.
+PROJECTION_STATS_QUERY = """
+    WITH diff AS (
+        SELECT
+            s.document_id AS source_id,
+            c.document_id AS projected_id,
+            c.projected_at,
+            s.document_id IS NOT NULL AND c.document_id IS NOT NULL
+              AND to_jsonb(s) IS DISTINCT FROM to_jsonb(c) - '{projected_at,search_vector}'::text[] AS stale
+        FROM current_materials_source s
+        FULL JOIN current_materials c ON c.document_id = s.document_id
+    )
+    SELECT
+        count(projected_id) AS projected_rows,
+        count(source_id) AS source_rows,
+        count(*) FILTER (WHERE projected_id IS NULL) AS missing_rows,
+        count(*) FILTER (WHERE source_id IS NULL) AS orphaned_rows,
+        count(*) FILTER (WHERE stale) AS stale_rows,
+        COALESCE(EXTRACT(EPOCH FROM now() - min(projected_at) FILTER (WHERE stale OR source_id IS NULL)), 0)::float8
+            AS max_lag_seconds,
+        max(projected_at) AS last_projected_at
+    FROM diff
+"""
+
+# Re-projects every document (missing, stale and orphaned rows included).
+# MVCC: readers keep seeing the old rows until the transaction commits.
+REBUILD_QUERY = """
+    WITH orphans AS (
+        DELETE FROM current_materials c
+        WHERE NOT EXISTS (SELECT 1 FROM master_materials m WHERE m.document_id = c.document_id)
+        RETURNING 1
+    )
+    SELECT
+        refresh_current_materials(ARRAY(SELECT document_id FROM master_materials)) AS refreshed,
+        (SELECT count(*) FROM orphans) AS removed
+"""
+
+# List-level version stamp (migration 0015): bumped inside every transaction that
+# changed current_materials, so it becomes visible together with the change.
+# Part of the card list ETags: read it in the same snapshot() as the rows.
+LIST_VERSION_QUERY = "SELECT version FROM current_materials_version"
+
+class CurrentMaterialsDataAccess(BaseRepository):
+    def __init__(self):
+        super().__init__('current_materials')
+
+    def get_projection_stats(self):
+        return self.fetch_one(PROJECTION_STATS_QUERY)
+
+    def rebuild(self):
+        with self.transaction():  # fetch_one alone would not commit the writes
+            return self.fetch_one(REBUILD_QUERY)
+
+    def notify_all_changed(self):
+        self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, NOTIFY_ALL))
+
+    def get_list_version(self) -> int:
+        return self.fetch_one(LIST_VERSION_QUERY)['version']
+
+class AsyncCurrentMaterialsDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('current_materials')
+
+    async def get_projection_stats(self):
+        return await self.fetch_one(PROJECTION_STATS_QUERY)
+
+    async def rebuild(self):
+        return await self.fetch_one(REBUILD_QUERY)
+
+    async def notify_all_changed(self):
+        await self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, NOTIFY_ALL))
+
+    async def get_list_version(self) -> int:
+        return (await self.fetch_one(LIST_VERSION_QUERY))['version']
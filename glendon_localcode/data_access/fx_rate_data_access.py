@@ -0,0 +1,139 @@
+from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_cache import NOTIFY_CHANNEL, NOTIFY_ALL
+from data_access.material_input_data_access import NOTIFY_CHANGED_QUERY
+
+UPSERT_RATE_QUERY = """
+    INSERT INTO fx_rates (base_currency, quote_currency, effective_date, rate, created_by)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (base_currency, quote_currency, effective_date)
+    DO UPDATE SET rate = EXCLUDED.rate, created_at = now(), created_by = EXCLUDED.created_by
+"""
+
+LIST_RATES_QUERY = """
+    SELECT base_currency, quote_currency, effective_date, rate, created_at, created_by
+    FROM fx_rates
+    WHERE quote_currency = %s
+    ORDER BY base_currency, effective_date DESC
+"""
+
+# Converts current versions to the reporting currency with the latest rate
+# effective on the as-of date. Same currency -> rate 1; no rate -> NULLs,
+# so a missing rate never leaves a stale converted cost behind.
+# Params: reporting currency, as-of date, reporting currency (identity),
+#         {scope} params, reporting currency (SET)
+REPRICE_QUERY = """
+    WITH rates AS (
+        SELECT DISTINCT ON (base_currency) base_currency, rate, effective_date
+        FROM fx_rates
+        WHERE quote_currency = %s AND effective_date <= %s::date
+        ORDER BY base_currency, effective_date DESC
+    ),
+    priced AS (
+        SELECT
+            v.document_uid,
+            CASE WHEN v.native_cost_currency = %s::text THEN 1 ELSE r.rate END AS rate,
+            r.effective_date
+        FROM material_versions v
+        JOIN master_materials m
+          ON m.document_id = v.document_id
+          AND m.current_version = v.ver_num
+        LEFT JOIN rates r ON r.base_currency = v.native_cost_currency
+        WHERE {scope}
+    ),
+    target AS (
+        SELECT
+            p.document_uid, p.rate, p.effective_date,
+            CASE WHEN p.rate IS NULL THEN NULL ELSE %s::text END AS currency,
+            (v.original_cost_per_unit * p.rate::float8)::real AS cost,
+            (v.landed_cost_per_unit * p.rate::float8)::real AS landed
+        FROM priced p
+        JOIN material_versions v ON v.document_uid = p.document_uid
+    )
+    UPDATE material_versions v
+    SET reporting_currency = t.currency,
+        fx_rate = t.rate,
+        fx_rate_date = t.effective_date,
+        reporting_cost_per_unit = t.cost,
+        reporting_landed_cost_per_unit = t.landed
+    FROM target t
+    WHERE v.document_uid = t.document_uid
+      AND (v.reporting_currency IS DISTINCT FROM t.currency
+        OR v.fx_rate IS DISTINCT FROM t.rate
+        OR v.fx_rate_date IS DISTINCT FROM t.effective_date
+        OR v.reporting_cost_per_unit IS DISTINCT FROM t.cost
+        OR v.reporting_landed_cost_per_unit IS DISTINCT FROM t.landed)
+    RETURNING v.document_id
+"""
+
+# Currencies used by current versions that have no rate to the reporting currency yet
+MISSING_RATES_QUERY = """
+    SELECT DISTINCT v.native_cost_currency
+    FROM material_versions v
+    JOIN master_materials m
+      ON m.document_id = v.document_id
+      AND m.current_version = v.ver_num
+    WHERE v.native_cost_currency IS NOT NULL
+      AND v.native_cost_currency <> %s
+      AND NOT EXISTS (
+        SELECT 1 FROM fx_rates r
+        WHERE r.base_currency = v.native_cost_currency
+          AND r.quote_currency = %s
+          AND r.effective_date <= %s
+      )
+    ORDER BY 1
+"""
+
+def _reprice_query(reporting_currency, as_of, document_uids=None):
+    """(query, params); document_uids=None reprices every current version"""
+    if document_uids is None:
+        scope, scope_params = "TRUE", ()
+    else:
+        scope, scope_params = "v.document_uid = ANY(%s)", (list(document_uids),)
+    params = (reporting_currency, as_of, reporting_currency) + scope_params + (reporting_currency,)
+    return REPRICE_QUERY.format(scope=scope), params
+
+class FxRateDataAccess(BaseRepository):
+    def __init__(self):
+        super().__init__('fx_rates')
+
+    def upsert_rate(self, base_currency, quote_currency, effective_date, rate, user):
+        self.execute(UPSERT_RATE_QUERY, (base_currency, quote_currency, effective_date, rate, user))
+
+    def list_rates(self, quote_currency):
+        return self.fetch_all(LIST_RATES_QUERY, (quote_currency,))
+
+    def reprice(self, reporting_currency, as_of, document_uids=None):
+        """Returns the document_id of every current version whose converted cost changed"""
+        with self.transaction():  # fetch_all alone would not commit the UPDATE
+            rows = self.fetch_all(*_reprice_query(reporting_currency, as_of, document_uids))
+        return [r['document_id'] for r in rows]
+
+    def get_missing_currencies(self, reporting_currency, as_of):
+        rows = self.fetch_all(MISSING_RATES_QUERY, (reporting_currency, reporting_currency, as_of))
+        return [r['native_cost_currency'] for r in rows]
+
+    def notify_all_changed(self):
+        self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, NOTIFY_ALL))
+
+class AsyncFxRateDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('fx_rates')
+
+    async def upsert_rate(self, base_currency, quote_currency, effective_date, rate, user):
+        await self.execute(UPSERT_RATE_QUERY, (base_currency, quote_currency, effective_date, rate, user))
+
+    async def list_rates(self, quote_currency):
+        return await self.fetch_all(LIST_RATES_QUERY, (quote_currency,))
+
+    async def reprice(self, reporting_currency, as_of, document_uids=None):
+        """Returns the document_id of every current version whose converted cost changed"""
+        rows = await self.fetch_all(*_reprice_query(reporting_currency, as_of, document_uids))
+        return [r['document_id'] for r in rows]
+
+    async def get_missing_currencies(self, reporting_currency, as_of):
+        rows = await self.fetch_all(MISSING_RATES_QUERY, (reporting_currency, reporting_currency, as_of))
+        return [r['native_cost_currency'] for r in rows]
+
+    async def notify_all_changed(self):
+        await self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, NOTIFY_ALL))
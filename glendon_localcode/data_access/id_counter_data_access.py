@@ -0,0 +1,29 @@
+from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+
+# Bumps the counter for a prefix by N and returns the new last value.
+# The caller owns the block (last - N, last]; the row lock is held until
+# commit, so concurrent callers never overlap.
+ALLOCATE_IDS_QUERY = """
+    INSERT INTO id_counters (prefix, last_value)
+    VALUES (%s, %s)
+    ON CONFLICT (prefix) DO UPDATE
+    SET last_value = id_counters.last_value + EXCLUDED.last_value
+    RETURNING last_value
+"""
+
+class IdCounterDataAccess(BaseRepository):
+    def __init__(self):
+        super().__init__('id_counters')
+
+    def allocate(self, prefix: str, count: int = 1) -> int:
+        row = self.execute_returning(ALLOCATE_IDS_QUERY, (prefix, count))
+        return row['last_value']
+
+class AsyncIdCounterDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('id_counters')
+
+    async def allocate(self, prefix: str, count: int = 1) -> int:
+        row = await self.execute_returning(ALLOCATE_IDS_QUERY, (prefix, count))
+        return row['last_value']
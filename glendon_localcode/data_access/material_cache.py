@@ -0,0 +1,192 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import asyncpg
+
+# Postgres channel used to tell other API workers that a material changed
+NOTIFY_CHANNEL = "material_changed"
+# Payload meaning "drop everything" (bulk updates touching many documents)
+NOTIFY_ALL = "*"
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries also expire after `ttl` seconds.
+    Thread-safe so both the psycopg2 and asyncpg repositories can share it.
+    """
+
+    def __init__(self, max_size=1024, ttl=60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value), oldest first
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; a load that raced with one is not stored
+        self._invalidations = 0
+        self._last_invalidation = float("-inf")
+
+        # Stats
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return dict(value)  # Callers get their own copy
+
+    def load_token(self) -> int:
+        """Take before reading from the DB, pass to put() afterwards"""
+        with self._lock:
+            return self._invalidations
+
+    def put(self, key, value, token=None):
+        with self._lock:
+            if token is not None and token != self._invalidations:
+                return  # Something was invalidated while we loaded: value may be stale
+            self._data[key] = (time.monotonic() + self.ttl, dict(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._invalidations += 1
+            self._last_invalidation = time.monotonic()
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._last_invalidation = time.monotonic()
+            self._data.clear()
+
+    def invalidated_within(self, seconds) -> bool:
+        with self._lock:
+            return time.monotonic() - self._last_invalidation < seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+# Current-version rows keyed by document_id (see MaterialDetailDataAccess)
+current_version_cache = TTLCache(
+    max_size=int(os.environ.get("MATERIAL_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("MATERIAL_CACHE_TTL", 60)),
+)
+
+# Opt-in: writers NOTIFY and every worker LISTENs, so caches stay in sync across workers
+NOTIFY_ENABLED = os.environ.get("MATERIAL_CACHE_NOTIFY", "0") == "1"
+
+
+# -------------------------------------------------------------
+# Cross-worker invalidation (LISTEN material_changed)
+# -------------------------------------------------------------
+class InvalidationListener:
+    """
+    Holds one dedicated connection (LISTEN cannot use a pooled one) and drops
+    cache entries named in NOTIFY payloads. If the connection is lost, the whole
+    cache is cleared (notifications may have been missed) and it reconnects.
+    """
+
+    def __init__(self, dsn, cache: TTLCache, channel=NOTIFY_CHANNEL):
+        self.dsn = dsn
+        self.cache = cache
+        self.channel = channel
+        self._conn = None
+        self._reconnect_task = None
+        self._stopped = False
+
+    def _on_notify(self, conn, pid, channel, payload):
+        if payload == NOTIFY_ALL:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(payload)
+
+    def _on_terminate(self, conn):
+        self.cache.clear()
+        if not self._stopped:
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _connect(self):
+        self._conn = await asyncpg.connect(self.dsn)
+        self._conn.add_termination_listener(self._on_terminate)
+        await self._conn.add_listener(self.channel, self._on_notify)
+
+    async def _reconnect(self):
+        delay = 1.0
+        while not self._stopped:
+            try:
+                await self._connect()
+                self.cache.clear()  # Anything could have changed while we were away
+                return
+            except Exception as e:
+                print(f"❌ Cache listener reconnect failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def start(self):
+        await self._connect()
+
+    async def stop(self):
+        self._stopped = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+
+
+_listener = None
+
+
+async def start_invalidation_listener():
+    global _listener
+    if not NOTIFY_ENABLED or _listener is not None:
+        return
+    dsn = os.environ.get("DATABASE_URL")
+    if not dsn:
+        raise ValueError("DATABASE_URL is missing")
+    _listener = InvalidationListener(dsn, current_version_cache)
+    await _listener.start()
+
+
+async def stop_invalidation_listener():
+    global _listener
+    if _listener is not None:
+        await _listener.stop()
+        _listener = None
+
+
+def get_cache_stats() -> dict:
+    return {
+        "current_version": current_version_cache.stats(),
+        "notify_enabled": NOTIFY_ENABLED,
+        "listening": _listener is not None,
+    }
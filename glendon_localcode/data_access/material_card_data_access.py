@@ -1,49 +1,177 @@
 from data_access.base import BaseRepository
-from psycopg2.extras import RealDictCursor
+from data_access.async_base import AsyncBaseRepository
+from data_access.replica_routing import replica_read
+
+# Shared by the psycopg2 and asyncpg repositories.
+# Reads the current_materials projection (trigger-maintained, migration 0007): no join.
+# {where} / {order} / {limit} are filled by _build_list_query, values always go through params.
+FETCH_MASTER_MATERIALS_QUERY = """
+    SELECT 
+        c.document_id,
+        c.material_name,
+        c.material_type,
+        c.status,
+        c.ver_num,
+        c.original_cost_per_unit,
+        c.native_cost_currency,
+        
+        -- Extra fields for Card UI
+        c.weight_per_unit,
+        c.weight_uom,
+        c.fabric_composition,
+        c.supplier_name,
+        c.master_material_id, -- The human readable one
+        c.ref_id,
+        c.picture_id,
+        c.reporting_cost_per_unit,
+        c.reporting_currency,
+
+        c.master_created_at AS created_at
+    FROM current_materials c
+    WHERE {where}
+    ORDER BY {order}
+    {limit}
+"""
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# Fiber ranges go through current_material_fibers (migration 0011):
+# a range with a lower bound is an index range scan on (fiber, percentage);
+# an upper bound alone must also keep materials without that fiber (0%).
+FIBER_RANGE_CLAUSE = """c.document_id IN (
+        SELECT f.document_id FROM current_material_fibers f
+        WHERE f.fiber = %s AND f.percentage >= %s AND f.percentage <= %s)"""
+FIBER_MAX_CLAUSE = """NOT EXISTS (
+        SELECT 1 FROM current_material_fibers f
+        WHERE f.document_id = c.document_id AND f.fiber = %s AND f.percentage > %s)"""
+
+def _fiber_clause(fiber_filter: dict):
+    fiber = fiber_filter['fiber']
+    min_pct = fiber_filter.get('min_pct')
+    max_pct = fiber_filter.get('max_pct')
+    if min_pct:  # > 0: the fiber must be present
+        return FIBER_RANGE_CLAUSE, [fiber, min_pct, 100 if max_pct is None else max_pct]
+    return FIBER_MAX_CLAUSE, [fiber, max_pct]
+
+def _build_filter_clauses(status_list: list, filters: dict = None):
+    """
+    WHERE clauses (AND-ed) and params on the current_materials projection (c alias).
+    - filters: material_type, country_of_origin (exact), supplier_name
+      (case-insensitive prefix), min_cost / max_cost (original_cost_per_unit),
+      fibers ([{fiber, min_pct, max_pct}], all must hold)
+    """
+    filters = filters or {}
+    clauses = ["c.status = ANY(%s)"]
+    params = [status_list]
+
+    if filters.get('material_type'):
+        clauses.append("c.material_type = %s")
+        params.append(filters['material_type'])
+    if filters.get('country_of_origin'):
+        clauses.append("c.country_of_origin = %s")
+        params.append(filters['country_of_origin'])
+    if filters.get('supplier_name'):
+        # Matches the lower(supplier_name) text_pattern_ops index
+        clauses.append("lower(c.supplier_name) LIKE %s")
+        params.append(_escape_like(filters['supplier_name'].lower()) + "%")
+    if filters.get('min_cost') is not None:
+        clauses.append("c.original_cost_per_unit >= %s")
+        params.append(filters['min_cost'])
+    if filters.get('max_cost') is not None:
+        clauses.append("c.original_cost_per_unit <= %s")
+        params.append(filters['max_cost'])
+    # Same bounds in the reporting currency (comparable across native currencies)
+    if filters.get('min_reporting_cost') is not None:
+        clauses.append("c.reporting_cost_per_unit >= %s")
+        params.append(filters['min_reporting_cost'])
+    if filters.get('max_reporting_cost') is not None:
+        clauses.append("c.reporting_cost_per_unit <= %s")
+        params.append(filters['max_reporting_cost'])
+    for fiber_filter in filters.get('fibers') or []:
+        if not fiber_filter.get('min_pct') and fiber_filter.get('max_pct') is None:
+            continue  # No bound (or only >= 0%)
+        clause, fiber_params = _fiber_clause(fiber_filter)
+        clauses.append(clause)
+        params.extend(fiber_params)
+
+    return clauses, params
+
+# sort_by -> (keyset comparison after the cursor, ORDER BY, extra WHERE clause).
+# Cost sorts skip rows without a converted cost, so the keyset never meets a NULL.
+LIST_SORTS = {
+    "newest": (
+        "(c.master_created_at, c.document_id) < (%s, %s)",
+        "c.master_created_at DESC, c.document_id DESC",
+        None,
+    ),
+    "reporting_cost_asc": (
+        "(c.reporting_cost_per_unit, c.document_id) > (%s, %s)",
+        "c.reporting_cost_per_unit ASC, c.document_id ASC",
+        "c.reporting_cost_per_unit IS NOT NULL",
+    ),
+    "reporting_cost_desc": (
+        "(c.reporting_cost_per_unit, c.document_id) < (%s, %s)",
+        "c.reporting_cost_per_unit DESC, c.document_id DESC",
+        "c.reporting_cost_per_unit IS NOT NULL",
+    ),
+}
+
+def _build_list_query(status_list: list, filters: dict = None, after=None, limit=None, sort_by="newest"):
+    """
+    Builds the card list query.
+    - filters: see _build_filter_clauses
+    - after: (sort key, document_id) of the last row of the previous page
+    - sort_by: a LIST_SORTS key
+    """
+    keyset, order, required = LIST_SORTS[sort_by]
+    clauses, params = _build_filter_clauses(status_list, filters)
+    if required:
+        clauses.append(required)
+
+    if after is not None:
+        # Keyset: rows strictly after the cursor in the sort order
+        clauses.append(keyset)
+        params.extend(after)
+
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT %s"
+        params.append(limit)
+
+    query = FETCH_MASTER_MATERIALS_QUERY.format(where=" AND ".join(clauses), order=order, limit=limit_sql)
+    return query, tuple(params)
 
 class MaterialCardDataAccess(BaseRepository):
     def __init__(self):
         super().__init__('master_materials')
     
-    def fetch_all_master_materials(self, status_list: list):
+    @replica_read
+    def fetch_all_master_materials(self, status_list: list, filters: dict = None):
+        """Every matching card row; errors propagate so a failed read is not served as an empty list"""
         if not status_list:
             return []
+        return self.fetch_all(*_build_list_query(status_list, filters))
 
-        query = """
-            SELECT 
-                m.document_id,
-                v.material_name,
-                v.material_type,
-                v.status,
-                v.ver_num,
-                v.original_cost_per_unit,
-                v.native_cost_currency,
-                
-                -- Extra fields for Card UI
-                v.weight_per_unit,
-                v.weight_uom,
-                v.fabric_composition,
-                v.supplier_name,
-                v.master_material_id, -- The human readable one
-                v.ref_id,
-                v.picture_id,
-
-                m.created_at
-            FROM master_materials m
-            JOIN material_versions v 
-              ON m.document_id = v.document_id 
-              AND m.current_version = v.ver_num
-            WHERE v.status = ANY(%s)
-            ORDER BY m.created_at DESC
-        """
-        
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (status_list,))
-                return cur.fetchall()
-        except Exception as e:
-            print(f"❌ Error fetching list: {e}")
-            return [] 
-        finally:
-            conn.close()
\ No newline at end of file
+    def fetch_master_materials_page(self, status_list: list, filters: dict = None, after=None, limit=50, sort_by="newest"):
+        """One keyset page; errors propagate so a bad page is not mistaken for the end"""
+        if not status_list:
+            return []
+        return self.fetch_all(*_build_list_query(status_list, filters, after, limit, sort_by))
+
+class AsyncMaterialCardDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('master_materials')
+
+    @replica_read
+    async def fetch_all_master_materials(self, status_list: list, filters: dict = None):
+        """Every matching card row; errors propagate so a failed read is not served as an empty list"""
+        if not status_list:
+            return []
+        return await self.fetch_all(*_build_list_query(status_list, filters))
+
+    async def fetch_master_materials_page(self, status_list: list, filters: dict = None, after=None, limit=50, sort_by="newest"):
+        """One keyset page; errors propagate so a bad page is not mistaken for the end"""
+        if not status_list:
+            return []
+        return await self.fetch_all(*_build_list_query(status_list, filters, after, limit, sort_by))
@@ -0,0 +1,72 @@
+from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_cache import NOTIFY_CHANNEL, NOTIFY_ALL
+from data_access.material_input_data_access import NOTIFY_CHANGED_QUERY
+
+# Inputs of the cost engine for every version ({scope} = current versions only or all)
+FETCH_COST_INPUTS_QUERY = """
+    SELECT
+        v.document_uid,
+        v.document_id,
+        v.original_cost_per_unit,
+        v.supplier_selling_tolerance,
+        v.logistics_rate,
+        v.weight_per_unit
+    FROM material_versions v
+    {scope}
+"""
+
+CURRENT_ONLY_SCOPE = """
+    JOIN master_materials m
+      ON m.document_id = v.document_id
+      AND m.current_version = v.ver_num
+"""
+
+# One statement per batch: parallel arrays unnest()ed into a join.
+# Columns are REAL, so compare after the cast or every row would look changed.
+UPDATE_COSTS_QUERY = """
+    UPDATE material_versions v
+    SET
+        effective_cost_per_unit = u.effective_cost_per_unit,
+        landed_cost_per_unit = u.landed_cost_per_unit,
+        logistics_fee_per_unit = u.logistics_fee_per_unit
+    FROM unnest(%s::text[], %s::real[], %s::real[], %s::real[])
+      AS u(document_uid, effective_cost_per_unit, landed_cost_per_unit, logistics_fee_per_unit)
+    WHERE v.document_uid = u.document_uid
+      AND (v.effective_cost_per_unit IS DISTINCT FROM u.effective_cost_per_unit
+        OR v.landed_cost_per_unit IS DISTINCT FROM u.landed_cost_per_unit
+        OR v.logistics_fee_per_unit IS DISTINCT FROM u.logistics_fee_per_unit)
+    RETURNING v.document_id, v.document_uid
+"""
+
+def _inputs_query(current_only: bool) -> str:
+    return FETCH_COST_INPUTS_QUERY.format(scope=CURRENT_ONLY_SCOPE if current_only else "")
+
+class MaterialCostDataAccess(BaseRepository):
+    def __init__(self):
+        super().__init__('material_versions')
+
+    def get_cost_inputs(self, current_only=True):
+        return self.fetch_all(_inputs_query(current_only))
+
+    def update_costs(self, document_uids, effective, landed, fee):
+        """Returns document_id / document_uid of every version whose stored costs changed"""
+        with self.transaction():  # fetch_all alone would not commit the UPDATE
+            return self.fetch_all(UPDATE_COSTS_QUERY, (document_uids, effective, landed, fee))
+
+    def notify_all_changed(self):
+        self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, NOTIFY_ALL))
+
+class AsyncMaterialCostDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('material_versions')
+
+    async def get_cost_inputs(self, current_only=True):
+        return await self.fetch_all(_inputs_query(current_only))
+
+    async def update_costs(self, document_uids, effective, landed, fee):
+        """Returns document_id / document_uid of every version whose stored costs changed"""
+        return await self.fetch_all(UPDATE_COSTS_QUERY, (document_uids, effective, landed, fee))
+
+    async def notify_all_changed(self):
+        await self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, NOTIFY_ALL))
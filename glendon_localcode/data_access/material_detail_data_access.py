@@ -1,60 +1,97 @@
 from data_access.base import BaseRepository
-from psycopg2.extras import RealDictCursor
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_cache import current_version_cache
+from data_access.replica_routing import replica_read, routes_to_replica, REPLICA_MAX_LAG_SECONDS
+
+# Single-row lookup on the current_materials projection (trigger-maintained,
+# migration 0007) instead of joining master_materials to material_versions.
+CURRENT_VERSION_QUERY = """
+    SELECT * FROM current_materials
+    WHERE document_id = %s
+"""
+
+# Projection-only columns the detail endpoints do not return.
+# projected_at stays in the row: it versions it for the detail ETags (controller/conditional.py)
+PROJECTION_ONLY_COLUMNS = ("search_vector",)
+
+def _detail_row(row):
+    for column in PROJECTION_ONLY_COLUMNS:
+        row.pop(column, None)
+    return row
+
+# Fallback to latest if current_version is not set
+LATEST_VERSION_QUERY = """
+    SELECT * FROM material_versions 
+    WHERE document_id = %s 
+    ORDER BY ver_num DESC LIMIT 1
+"""
+
+# History is served from material_versions (UNIQUE (document_id, ver_num) index),
+# not from the denormalized master_materials.version_history array.
+# Only the columns the history tab shows, not the full version rows.
+VERSION_HISTORY_QUERY = """
+    SELECT document_uid, ver_num, status, change_description,
+           created_at, created_by, submitted_at, submitted_by
+    FROM material_versions
+    WHERE document_id = %s
+    ORDER BY ver_num ASC
+"""
+
+def _cache_current_row(document_id, row, token):
+    # A replica may still return the row an invalidation just replaced:
+    # right after one, only rows read from the primary are cached
+    if routes_to_replica() and current_version_cache.invalidated_within(REPLICA_MAX_LAG_SECONDS):
+        return
+    current_version_cache.put(document_id, row, token)
 
 class MaterialDetailDataAccess(BaseRepository):
     def __init__(self):
         super().__init__('master_materials')
     
+    @replica_read
     def get_current_version_row(self, document_id: str):
         """
         Fetches the FULL details of the 'Current' version.
+        Read-through: served from current_version_cache when possible.
         """
-        # Join on m.document_id = v.document_id (Foreign Key)
-        query = """
-            SELECT 
-                v.*, 
-                m.created_at as master_created_at, 
-                m.created_by as master_created_by,
-                m.last_verified_date,
-                m.last_verified_by
-            FROM master_materials m
-            JOIN material_versions v 
-              ON m.document_id = v.document_id 
-              AND m.current_version = v.ver_num
-            WHERE m.document_id = %s
-        """
-        
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (document_id,))
-                result = cur.fetchone()
-                
-                if not result:
-                    # Fallback to latest if not set
-                    fallback_query = """
-                        SELECT * FROM material_versions 
-                        WHERE document_id = %s 
-                        ORDER BY ver_num DESC LIMIT 1
-                    """
-                    cur.execute(fallback_query, (document_id,))
-                    return cur.fetchone()
-
-                return result
-        finally:
-            conn.close()
+        cached = current_version_cache.get(document_id)
+        if cached is not None:
+            return cached
+
+        token = current_version_cache.load_token()
+        result = self.fetch_one(CURRENT_VERSION_QUERY, (document_id,))
+        if not result:
+            return self.fetch_one(LATEST_VERSION_QUERY, (document_id,))
+        result = _detail_row(result)
+        _cache_current_row(document_id, result, token)
+        return result
 
+    @replica_read
     def get_version_history_rows(self, document_id: str):
-        query = """
-            SELECT * FROM material_versions
-            WHERE document_id = %s
-            ORDER BY ver_num ASC
+        return self.fetch_all(VERSION_HISTORY_QUERY, (document_id,))
+
+class AsyncMaterialDetailDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('master_materials')
+
+    @replica_read
+    async def get_current_version_row(self, document_id: str):
         """
-        
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (document_id,))
-                return cur.fetchall()
-        finally:
-            conn.close()
\ No newline at end of file
+        Fetches the FULL details of the 'Current' version.
+        Read-through: served from current_version_cache when possible.
+        """
+        cached = current_version_cache.get(document_id)
+        if cached is not None:
+            return cached
+
+        token = current_version_cache.load_token()
+        result = await self.fetch_one(CURRENT_VERSION_QUERY, (document_id,))
+        if not result:
+            return await self.fetch_one(LATEST_VERSION_QUERY, (document_id,))
+        result = _detail_row(result)
+        _cache_current_row(document_id, result, token)
+        return result
+
+    @replica_read
+    async def get_version_history_rows(self, document_id: str):
+        return await self.fetch_all(VERSION_HISTORY_QUERY, (document_id,))
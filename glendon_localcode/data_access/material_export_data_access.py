@@ -0,0 +1,78 @@
+from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_card_data_access import _build_filter_clauses
+
+# (column, type) of every exported field, in file order.
+# Types drive the CSV / Parquet encoding: text, int, float, bool, timestamp, json
+EXPORT_COLUMNS = [
+    ("document_id", "text"),
+    ("master_material_id", "text"),
+    ("ref_id", "text"),
+    ("material_name", "text"),
+    ("material_type", "text"),
+    ("status", "text"),
+    ("ver_num", "int"),
+    ("supplier_name", "text"),
+    ("country_of_origin", "text"),
+    ("estimated_logistics_lead_time", "int"),
+    ("unit_of_measurement", "text"),
+    ("fabric_composition", "json"),
+    ("generic_material_composition", "text"),
+    ("weight_per_unit", "float"),
+    ("weight_uom", "text"),
+    ("original_cost_per_unit", "float"),
+    ("native_cost_currency", "text"),
+    ("supplier_selling_tolerance", "float"),
+    ("refundable_tolerance", "bool"),
+    ("effective_cost_per_unit", "float"),
+    ("vietnam_vat_rate", "text"),
+    ("refundable_vat", "bool"),
+    ("import_duty", "float"),
+    ("refundable_import_duty", "bool"),
+    ("shipping_term", "text"),
+    ("logistics_rate", "float"),
+    ("logistics_fee_per_unit", "float"),
+    ("landed_cost_per_unit", "float"),
+    ("reporting_currency", "text"),
+    ("reporting_cost_per_unit", "float"),
+    ("reporting_landed_cost_per_unit", "float"),
+    ("created_at", "timestamp"),
+    ("submitted_at", "timestamp"),
+]
+
+# Folder-level dates come from the master (master_* in the projection)
+_MASTER_COLUMNS = {"created_at", "submitted_at"}
+
+_SELECT_COLUMNS = ", ".join(
+    f"c.master_{name} AS {name}" if name in _MASTER_COLUMNS else f"c.{name}" for name, _ in EXPORT_COLUMNS
+)
+
+# Reads the current_materials projection in primary-key order: a plain index
+# scan, no sort of the whole catalogue before the first row.
+# {where} is filled by _build_export_query.
+EXPORT_QUERY = f"""
+    SELECT {_SELECT_COLUMNS}
+    FROM current_materials c
+    WHERE {{where}}
+    ORDER BY c.document_id
+"""
+
+def _build_export_query(status_list: list, filters: dict = None):
+    clauses, params = _build_filter_clauses(status_list, filters)
+    return EXPORT_QUERY.format(where=" AND ".join(clauses)), tuple(params)
+
+class MaterialExportDataAccess(BaseRepository):
+    def __init__(self):
+        super().__init__('master_materials')
+
+    def stream_current_versions(self, status_list: list, filters: dict = None, chunk_size=1000):
+        """Generator of row chunks (named cursor) for the export, read from a replica if any"""
+        return self.fetch_chunks(*_build_export_query(status_list, filters), chunk_size=chunk_size, replica=True)
+
+class AsyncMaterialExportDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('master_materials')
+
+    def stream_current_versions(self, status_list: list, filters: dict = None, chunk_size=1000):
+        """Async generator of row chunks (server-side cursor) for the export, read from a replica if any"""
+        return self.fetch_chunks(*_build_export_query(status_list, filters), chunk_size=chunk_size, replica=True)
@@ -1,146 +1,247 @@
 from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_cache import NOTIFY_CHANNEL
 from datetime import datetime
 import json
+import os
+
+# How the master row tracks history:
+# - 'versions_table' (default): history is served from material_versions only and the
+#   master row just moves its current pointers, so a version write costs the same for v2 and v200
+# - 'jsonb': legacy mode, also appends to the denormalized version_history arrays
+VERSION_HISTORY_MODE = os.environ.get("VERSION_HISTORY_MODE", "versions_table")
+
+# ---------------------------------------------------------
+# SQL (shared by the psycopg2 and asyncpg repositories)
+# ---------------------------------------------------------
+LATEST_VERSION_QUERY = "SELECT * FROM material_versions WHERE document_id = %s ORDER BY ver_num DESC LIMIT 1"
+
+# Row lock held until the surrounding transaction ends, so two
+# concurrent revisions of the same document cannot pick the same ver_num
+LOCK_MASTER_QUERY = "SELECT document_id FROM master_materials WHERE document_id = %s FOR UPDATE"
+
+# Initialize empty arrays for history
+CREATE_MASTER_QUERY = """
+    INSERT INTO master_materials (
+        document_id, created_at, created_by, current_version, 
+        version_history, version_history_uid
+    )
+    VALUES (%s, %s, %s, 1, '[]'::jsonb, '[]'::jsonb)
+    ON CONFLICT (document_id) DO NOTHING
+    RETURNING document_id
+"""
+
+# Column order of INSERT_VERSION_QUERY / _version_insert_params (also used by COPY)
+VERSION_COLUMNS = (
+    "document_uid", "document_id", "ver_num", "status", "change_description",
+    "created_at", "created_by",
+    "ref_id", "master_material_id", "supplier_name", "country_of_origin",
+    "material_name", "material_type",
+    "unit_of_measurement", "fabric_composition", "generic_material_composition",
+    "fabric_roll_width", "fabric_cut_width", "fabric_cut_width_no_shrinkage",
+    "weight_per_unit", "weight_uom", "generic_material_size",
+    "weft_shrinkage", "werp_shrinkage", "estimated_logistics_lead_time",
+    "original_cost_per_unit", "native_cost_currency",
+    "supplier_selling_tolerance", "refundable_tolerance", "effective_cost_per_unit",
+    "vietnam_vat_rate", "refundable_vat", "import_duty", "refundable_import_duty",
+    "shipping_term", "logistics_rate", "logistics_fee_per_unit", "landed_cost_per_unit",
+)
+
+INSERT_VERSION_QUERY = f"""
+    INSERT INTO material_versions ({", ".join(VERSION_COLUMNS)})
+    VALUES ({", ".join(["%s"] * len(VERSION_COLUMNS))})
+"""
+
+# Bulk import: brand-new documents, master row written already pointing at v1
+MASTER_BULK_COLUMNS = (
+    "document_id", "current_version", "current_version_uid",
+    "version_history", "version_history_uid",
+    "created_at", "created_by", "submitted_at", "submitted_by",
+)
+
+BULK_INSERT_MASTERS_QUERY = f"INSERT INTO master_materials ({', '.join(MASTER_BULK_COLUMNS)}) VALUES %s"
+BULK_INSERT_VERSIONS_QUERY = f"INSERT INTO material_versions ({', '.join(VERSION_COLUMNS)}) VALUES %s"
+
+# UPDATE Master Table (Append to History Arrays)
+# Using Postgres '||' operator to append to JSONB array
+UPDATE_MASTER_QUERY = """
+    UPDATE master_materials
+    SET 
+        -- Append full object to history
+        version_history = version_history || %s::jsonb,
+        -- Append UUID to uid list
+        version_history_uid = version_history_uid || %s::jsonb,
+        
+        -- Update Current Pointers
+        current_version = %s,
+        current_version_uid = %s,
+        submitted_at = CASE WHEN %s LIKE 'Submitted%%' THEN %s ELSE submitted_at END,
+        submitted_by = CASE WHEN %s LIKE 'Submitted%%' THEN %s ELSE submitted_by END
+    WHERE document_id = %s
+"""
+
+# UPDATE Master Table (Current Pointers only, history stays in material_versions)
+UPDATE_MASTER_POINTERS_QUERY = """
+    UPDATE master_materials
+    SET 
+        current_version = %s,
+        current_version_uid = %s,
+        submitted_at = CASE WHEN %s LIKE 'Submitted%%' THEN %s ELSE submitted_at END,
+        submitted_by = CASE WHEN %s LIKE 'Submitted%%' THEN %s ELSE submitted_by END
+    WHERE document_id = %s
+"""
+
+# Delivered to LISTENing workers only when the transaction commits
+NOTIFY_CHANGED_QUERY = "SELECT pg_notify(%s, %s)"
+
+def _version_insert_params(doc_uid, doc_id, ver_num, status, user, now, data: dict):
+    # Handle JSON Fields for SQL Insert
+    fabric_comp_json = data.get('fabric_composition')
+    if isinstance(fabric_comp_json, list):
+        fabric_comp_json = json.dumps(fabric_comp_json)
+
+    return (
+        doc_uid, doc_id, ver_num, status, data.get('change_description', ''),
+        now, user,
+        data.get('ref_id'), data.get('master_material_id'), data.get('supplier_name'), data.get('country_of_origin'),
+        data.get('material_name'), data.get('material_type'),
+        data.get('unit_of_measurement'), fabric_comp_json, data.get('generic_material_composition'),
+        data.get('fabric_roll_width'), data.get('fabric_cut_width'), data.get('fabric_cut_width_no_shrinkage'),
+        data.get('weight_per_unit'), data.get('weight_uom'), data.get('generic_material_size'),
+        data.get('weft_shrinkage'), data.get('werp_shrinkage'), data.get('estimated_logistics_lead_time'),
+        data.get('original_cost_per_unit'), data.get('native_cost_currency'),
+        data.get('supplier_selling_tolerance'), data.get('refundable_tolerance'), data.get('effective_cost_per_unit'),
+        data.get('vietnam_vat_rate'), data.get('refundable_vat'), data.get('import_duty'), data.get('refundable_import_duty'),
+        data.get('shipping_term'), data.get('logistics_rate'), data.get('logistics_fee_per_unit'), data.get('landed_cost_per_unit')
+    )
+
+def _history_entry(doc_uid, ver_num, status, now, data: dict):
+    # PREPARE JSON OBJECT FOR HISTORY
+    # We reconstruct the object to store inside the master JSON array
+    # Note: We must serialize datetime objects to string
+    return {
+        "document_uid": doc_uid,
+        "ver_num": ver_num,
+        "master_material_id": data.get('master_material_id'),
+        "created_at": now.isoformat(),
+        "status": status,
+        "material_name": data.get('material_name'),
+        "cost": data.get('original_cost_per_unit'),
+        "currency": data.get('native_cost_currency')
+        # Add other fields here if you want them in the history summary
+    }
+
+def _bulk_master_params(doc_uid, doc_id, status, user, now, data: dict):
+    """Master row of a bulk-imported document (v1 is current from the start)"""
+    submitted = status.startswith("Submitted")
+    if VERSION_HISTORY_MODE == "jsonb":
+        history = json.dumps([_history_entry(doc_uid, 1, status, now, data)])
+        history_uid = json.dumps([doc_uid])
+    else:
+        history, history_uid = "[]", "[]"
+    return (
+        doc_id, 1, doc_uid,
+        history, history_uid,
+        now, user,
+        now if submitted else None, user if submitted else None,
+    )
+
+def _master_update(doc_uid, doc_id, ver_num, status, user, now, data: dict):
+    """Returns (query, params) for moving the master row to the new version"""
+    if VERSION_HISTORY_MODE != "jsonb":
+        return UPDATE_MASTER_POINTERS_QUERY, (
+            ver_num,
+            doc_uid,
+            status, now,
+            status, user,
+            doc_id
+        )
+
+    return UPDATE_MASTER_QUERY, (
+        json.dumps([_history_entry(doc_uid, ver_num, status, now, data)]),  # Wrap in list to append
+        json.dumps([doc_uid]),      # Wrap in list to append
+        ver_num, 
+        doc_uid,
+        status, now,
+        status, user,
+        doc_id
+    )
 
 class MaterialInputDataAccess(BaseRepository):
     def __init__(self):
         super().__init__('master_materials') 
     
-    # --- ID GENERATION ---
-    def get_last_auto_id(self, prefix):
-        # Finds the highest ID that starts with the given prefix
-        query = """
-            SELECT document_id 
-            FROM master_materials 
-            WHERE document_id LIKE %s 
-            ORDER BY LENGTH(document_id) DESC, document_id DESC 
-            LIMIT 1
-        """
-        result = self.fetch_one(query, (f"{prefix}%",))
-        return result['document_id'] if result else None
-    
-    def get_last_mmat_id(self, prefix):
-        query = """
-            SELECT master_material_id FROM material_versions 
-            WHERE master_material_id LIKE %s 
-            ORDER BY LENGTH(master_material_id) DESC, master_material_id DESC 
-            LIMIT 1
-        """
-        result = self.fetch_one(query, (f"{prefix}%",))
-        return result['master_material_id'] if result else None
-
    # ---------------------------------------------------------
     # READ Methods
     # ---------------------------------------------------------
     def get_latest_version(self, doc_id: str):
-        query = "SELECT * FROM material_versions WHERE document_id = %s ORDER BY ver_num DESC LIMIT 1"
-        return self.fetch_one(query, (doc_id,))
+        return self.fetch_one(LATEST_VERSION_QUERY, (doc_id,))
+
+    def lock_master_record(self, doc_id: str):
+        return self.fetch_one(LOCK_MASTER_QUERY, (doc_id,))
 
     # ---------------------------------------------------------
     # WRITE Methods
     # ---------------------------------------------------------
     def create_master_record(self, doc_id, user_email, now):
-        # Initialize empty arrays for history
-        query = """
-            INSERT INTO master_materials (
-                document_id, created_at, created_by, current_version, 
-                version_history, version_history_uid
-            )
-            VALUES (%s, %s, %s, 1, '[]'::jsonb, '[]'::jsonb)
-            ON CONFLICT (document_id) DO NOTHING
-            RETURNING document_id
-        """
-        self.execute(query, (doc_id, now, user_email))
+        self.execute(CREATE_MASTER_QUERY, (doc_id, now, user_email))
         return {"document_id": doc_id}
 
     def create_version_record(self, doc_uid, doc_id, ver_num, status, user, now, data: dict):
-        # 1. Handle JSON Fields for SQL Insert
-        fabric_comp_json = data.get('fabric_composition')
-        if isinstance(fabric_comp_json, list):
-            fabric_comp_json = json.dumps(fabric_comp_json)
-        
-        # 2. INSERT into Version Table
-        query_insert = """
-            INSERT INTO material_versions (
-                document_uid, document_id, ver_num, status, change_description,
-                created_at, created_by,
-                ref_id, master_material_id, supplier_name, country_of_origin,
-                material_name, material_type,
-                unit_of_measurement, fabric_composition, generic_material_composition,
-                fabric_roll_width, fabric_cut_width, fabric_cut_width_no_shrinkage,
-                weight_per_unit, weight_uom, generic_material_size,
-                weft_shrinkage, werp_shrinkage, estimated_logistics_lead_time,
-                original_cost_per_unit, native_cost_currency,
-                supplier_selling_tolerance, refundable_tolerance, effective_cost_per_unit,
-                vietnam_vat_rate, refundable_vat, import_duty, refundable_import_duty,
-                shipping_term, logistics_rate, logistics_fee_per_unit, landed_cost_per_unit
-            )
-            VALUES (
-                %s, %s, %s, %s, %s,
-                %s, %s,
-                %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-            )
+        args = (doc_uid, doc_id, ver_num, status, user, now, data)
+        # 1. INSERT into Version Table
+        self.execute(INSERT_VERSION_QUERY, _version_insert_params(*args))
+        # 2. UPDATE Master Table (history + current pointers)
+        self.execute(*_master_update(*args))
+
+        return {"master_id": doc_id, "version": ver_num, "status": status}
+
+    def bulk_create_materials(self, masters, versions):
         """
-        
-        insert_params = (
-            doc_uid, doc_id, ver_num, status, data.get('change_description', ''),
-            now, user,
-            data.get('ref_id'), data.get('master_material_id'), data.get('supplier_name'), data.get('country_of_origin'),
-            data.get('material_name'), data.get('material_type'),
-            data.get('unit_of_measurement'), fabric_comp_json, data.get('generic_material_composition'),
-            data.get('fabric_roll_width'), data.get('fabric_cut_width'), data.get('fabric_cut_width_no_shrinkage'),
-            data.get('weight_per_unit'), data.get('weight_uom'), data.get('generic_material_size'),
-            data.get('weft_shrinkage'), data.get('werp_shrinkage'), data.get('estimated_logistics_lead_time'),
-            data.get('original_cost_per_unit'), data.get('native_cost_currency'),
-            data.get('supplier_selling_tolerance'), data.get('refundable_tolerance'), data.get('effective_cost_per_unit'),
-            data.get('vietnam_vat_rate'), data.get('refundable_vat'), data.get('import_duty'), data.get('refundable_import_duty'),
-            data.get('shipping_term'), data.get('logistics_rate'), data.get('logistics_fee_per_unit'), data.get('landed_cost_per_unit')
-        )
-        self.execute(query_insert, insert_params)
-
-        # 3. PREPARE JSON OBJECT FOR HISTORY
-        # We reconstruct the object to store inside the master JSON array
-        # Note: We must serialize datetime objects to string
-        version_obj = {
-            "document_uid": doc_uid,
-            "ver_num": ver_num,
-            "master_material_id": data.get('master_material_id'),
-            "created_at": now.isoformat(),
-            "status": status,
-            "material_name": data.get('material_name'),
-            "cost": data.get('original_cost_per_unit'),
-            "currency": data.get('native_cost_currency')
-            # Add other fields here if you want them in the history summary
-        }
-
-        # 4. UPDATE Master Table (Append to History Arrays)
-        # Using Postgres '||' operator to append to JSONB array
-        query_update_master = """
-            UPDATE master_materials
-            SET 
-                -- Append full object to history
-                version_history = version_history || %s::jsonb,
-                -- Append UUID to uid list
-                version_history_uid = version_history_uid || %s::jsonb,
-                
-                -- Update Current Pointers
-                current_version = %s,
-                current_version_uid = %s,
-                submitted_at = CASE WHEN %s LIKE 'Submitted%%' THEN %s ELSE submitted_at END,
-                submitted_by = CASE WHEN %s LIKE 'Submitted%%' THEN %s ELSE submitted_by END
-            WHERE document_id = %s
+        Inserts new documents in two multi-row INSERTs (masters first for the FK).
+        `masters` / `versions` are _bulk_master_params / _version_insert_params tuples.
         """
-        
-        self.execute(query_update_master, (
-            json.dumps([version_obj]),  # Wrap in list to append
-            json.dumps([doc_uid]),      # Wrap in list to append
-            ver_num, 
-            doc_uid,
-            status, now,
-            status, user,
-            doc_id
-        ))
+        self.execute_values(BULK_INSERT_MASTERS_QUERY, masters)
+        self.execute_values(BULK_INSERT_VERSIONS_QUERY, versions)
+        return len(masters)
+
+    def notify_changed(self, doc_id):
+        self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, doc_id))
+
+class AsyncMaterialInputDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('master_materials')
+
+    # ---------------------------------------------------------
+    # READ Methods
+    # ---------------------------------------------------------
+    async def get_latest_version(self, doc_id: str):
+        return await self.fetch_one(LATEST_VERSION_QUERY, (doc_id,))
+
+    async def lock_master_record(self, doc_id: str):
+        return await self.fetch_one(LOCK_MASTER_QUERY, (doc_id,))
+
+    # ---------------------------------------------------------
+    # WRITE Methods
+    # ---------------------------------------------------------
+    async def create_master_record(self, doc_id, user_email, now):
+        await self.execute(CREATE_MASTER_QUERY, (doc_id, now, user_email))
+        return {"document_id": doc_id}
+
+    async def create_version_record(self, doc_uid, doc_id, ver_num, status, user, now, data: dict):
+        args = (doc_uid, doc_id, ver_num, status, user, now, data)
+        # 1. INSERT into Version Table
+        await self.execute(INSERT_VERSION_QUERY, _version_insert_params(*args))
+        # 2. UPDATE Master Table (history + current pointers)
+        await self.execute(*_master_update(*args))
+
+        return {"master_id": doc_id, "version": ver_num, "status": status}
+
+    async def bulk_create_materials(self, masters, versions):
+        """Same as the sync version but streamed with COPY (masters first for the FK)"""
+        await self.copy_records('master_materials', MASTER_BULK_COLUMNS, masters)
+        await self.copy_records('material_versions', VERSION_COLUMNS, versions)
+        return len(masters)
 
-        return {"master_id": doc_id, "version": ver_num, "status": status}
\ No newline at end of file
+    async def notify_changed(self, doc_id):
+        await self.execute(NOTIFY_CHANGED_QUERY, (NOTIFY_CHANNEL, doc_id))
@@ -0,0 +1,134 @@
+import os
+
+from data_access.base import BaseRepository
+from data_access.async_base import AsyncBaseRepository
+from data_access.material_card_data_access import _build_filter_clauses
+
+# Ranked search over the current_materials projection.
+# {where} (status / card filters), {fuzzy_match}, {fuzzy_score} and {cap} are
+# filled by _build_search_query.
+# - exact: document_id / master_material_id / ref_id equal to the whole query
+#   (lower() indexes, migration 0013). Fetched on their own, so an exact ID hit
+#   always comes first whatever the text search finds.
+# - candidates: text (and trigram) matches. Every-word searches rank all of
+#   them (~250 ms for a word matching half of 100k materials). The any-word
+#   fallback can match most of the catalogue, so it only ranks the first
+#   SEARCH_RANK_LIMIT by document_id: always the same subset, so its pages
+#   neither repeat nor skip rows.
+SEARCH_QUERY = """
+    WITH exact AS (
+        SELECT c.* FROM current_materials c
+        WHERE {where}
+          AND (lower(c.document_id) = %s OR lower(c.master_material_id) = %s OR lower(c.ref_id) = %s)
+    ),
+    candidates AS (
+        SELECT c.* FROM current_materials c
+        WHERE {where}
+          AND (c.search_vector @@ to_tsquery('english', %s){fuzzy_match}){cap}
+    )
+    SELECT
+        c.document_id,
+        c.material_name,
+        c.material_type,
+        c.status,
+        c.ver_num,
+        c.original_cost_per_unit,
+        c.native_cost_currency,
+        c.weight_per_unit,
+        c.weight_uom,
+        c.fabric_composition,
+        c.supplier_name,
+        c.master_material_id,
+        c.ref_id,
+        c.picture_id,
+        c.reporting_cost_per_unit,
+        c.reporting_currency,
+        c.exact_match,
+        ts_rank_cd(c.search_vector, to_tsquery('english', %s)){fuzzy_score} AS score
+    FROM (
+        SELECT exact.*, true AS exact_match FROM exact
+        UNION ALL
+        SELECT candidates.*, false AS exact_match FROM candidates
+        WHERE candidates.document_id NOT IN (SELECT document_id FROM exact)
+    ) c
+    ORDER BY c.exact_match DESC, score DESC, c.document_id
+    LIMIT %s OFFSET %s
+"""
+
+SEARCH_RANK_LIMIT = int(os.environ.get("SEARCH_RANK_LIMIT", 2000))
+
+# pg_trgm word similarity (typos, partial codes); each column has its own trigram index (migration 0010)
+TRIGRAM_COLUMNS = ["material_name", "supplier_name", "ref_id", "master_material_id"]
+FUZZY_MATCH = "".join(f" OR c.{col} %%> %s" for col in TRIGRAM_COLUMNS)
+FUZZY_SCORE = " + GREATEST({})".format(
+    ", ".join(f"coalesce(word_similarity(%s, c.{col}), 0)" for col in TRIGRAM_COLUMNS)
+)
+
+RANK_CAP = """
+        ORDER BY c.document_id
+        LIMIT %s"""
+
+TRIGRAM_AVAILABLE_QUERY = "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') AS available"
+
+# pg_trgm does not come and go at runtime: checked once per process
+_trigram_available = None
+
+def _build_search_query(text: str, tsquery: str, status_list: list, filters: dict = None,
+                        fuzzy=False, limit=20, offset=0, capped=False):
+    """
+    - text: the raw query (exact ID lookup + trigram similarity)
+    - tsquery: to_tsquery() input built by the logics layer
+    - capped: rank only SEARCH_RANK_LIMIT candidates (the any-word fallback)
+    """
+    clauses, filter_params = _build_filter_clauses(status_list, filters)
+    lowered = text.lower()
+    fuzzy_params = [text] * len(TRIGRAM_COLUMNS) if fuzzy else []
+
+    # Same order as the %s in SEARCH_QUERY: exact, candidates, score, page
+    params = filter_params + [lowered, lowered, lowered]
+    params += filter_params + [tsquery] + fuzzy_params + ([SEARCH_RANK_LIMIT] if capped else [])
+    params += [tsquery] + fuzzy_params + [limit, offset]
+
+    query = SEARCH_QUERY.format(
+        where=" AND ".join(clauses),
+        fuzzy_match=FUZZY_MATCH if fuzzy else "",
+        fuzzy_score=FUZZY_SCORE if fuzzy else "",
+        cap=RANK_CAP if capped else "",
+    )
+    return query, tuple(params)
+
+class MaterialSearchDataAccess(BaseRepository):
+    def __init__(self):
+        super().__init__('current_materials')
+
+    def trigram_available(self) -> bool:
+        global _trigram_available
+        if _trigram_available is None:
+            _trigram_available = self.fetch_one(TRIGRAM_AVAILABLE_QUERY)['available']
+        return _trigram_available
+
+    def search(self, text: str, tsquery: str, status_list: list, filters: dict = None, limit=20, offset=0,
+               capped=False):
+        if not status_list:
+            return []
+        return self.fetch_all(*_build_search_query(
+            text, tsquery, status_list, filters, self.trigram_available(), limit, offset, capped
+        ))
+
+class AsyncMaterialSearchDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('current_materials')
+
+    async def trigram_available(self) -> bool:
+        global _trigram_available
+        if _trigram_available is None:
+            _trigram_available = (await self.fetch_one(TRIGRAM_AVAILABLE_QUERY))['available']
+        return _trigram_available
+
+    async def search(self, text: str, tsquery: str, status_list: list, filters: dict = None, limit=20, offset=0,
+                     capped=False):
+        if not status_list:
+            return []
+        return await self.fetch_all(*_build_search_query(
+            text, tsquery, status_list, filters, await self.trigram_available(), limit, offset, capped
+        ))
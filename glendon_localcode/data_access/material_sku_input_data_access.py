@@ -1,49 +1,50 @@
 from data_access.base import BaseRepository
-from psycopg2.extras import RealDictCursor
+from data_access.async_base import AsyncBaseRepository
+from data_access.replica_routing import replica_read
+
+# NOTE: Using 'master_material_document_id' as FK
+SKUS_BY_MASTER_QUERY = "SELECT * FROM material_skus WHERE master_material_document_id = %s"
+
+CREATE_SKU_QUERY = """
+    INSERT INTO material_skus (
+        id, master_material_document_id, ref_id, qr_data, 
+        sku_cost_override, color, size
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    RETURNING *
+"""
+
+def _create_sku_params(sku_id, request_data: dict):
+    return (
+        sku_id,
+        request_data.get('document_id'), # This is the master ID (MAT-001)
+        request_data.get('ref_id'),
+        request_data.get('qr_data'),
+        request_data.get('sku_cost_override', 0.0),
+        request_data.get('color'),
+        request_data.get('size')
+    )
 
 class SkuDataAccess(BaseRepository):
     def __init__(self):
         super().__init__('material_skus')
     
+    @replica_read
     def get_skus_by_master_id(self, document_id):
-        # NOTE: Using 'master_material_document_id' as FK
-        query = "SELECT * FROM material_skus WHERE master_material_document_id = %s"
-        conn = self.get_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, (document_id,))
-                return cur.fetchall()
-        finally:
-            conn.close()
-
-    def get_latest_sku_id(self):
-        query = "SELECT id FROM material_skus ORDER BY id DESC LIMIT 1"
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(query)
-                row = cur.fetchone()
-                return row[0] if row else None
-        finally:
-            conn.close()
+        return self.fetch_all(SKUS_BY_MASTER_QUERY, (document_id,))
 
     def create_sku(self, sku_id, request_data: dict):
-        query = """
-            INSERT INTO material_skus (
-                id, master_material_document_id, ref_id, qr_data, 
-                sku_cost_override, color, size
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """
-        params = (
-            sku_id,
-            request_data.get('document_id'), # This is the master ID (MAT-001)
-            request_data.get('ref_id'),
-            request_data.get('qr_data'),
-            request_data.get('sku_cost_override', 0.0),
-            request_data.get('color'),
-            request_data.get('size')
-        )
-        self.execute(query, params)
-        return {"id": sku_id, **request_data}
\ No newline at end of file
+        """Returns the stored row (same columns as get_skus_by_master_id)"""
+        return self.execute_returning(CREATE_SKU_QUERY, _create_sku_params(sku_id, request_data))
+
+class AsyncSkuDataAccess(AsyncBaseRepository):
+    def __init__(self):
+        super().__init__('material_skus')
+
+    @replica_read
+    async def get_skus_by_master_id(self, document_id):
+        return await self.fetch_all(SKUS_BY_MASTER_QUERY, (document_id,))
+
+    async def create_sku(self, sku_id, request_data: dict):
+        """Returns the stored row (same columns as get_skus_by_master_id)"""
+        return await self.execute_returning(CREATE_SKU_QUERY, _create_sku_params(sku_id, request_data))
@@ -0,0 +1,72 @@
+import os
+import time
+
+import psycopg2
+
+# Connections kept free for psql, migrations, replication and monitoring
+DEFAULT_RESERVED_CONNECTIONS = 10
+# A worker's asyncpg pool does not get faster past this many connections
+ASYNC_POOL_CAP = 40
+# The psycopg2 pool only serves the few sync code paths and opens lazily
+SYNC_POOL_MAX = 2
+
+BUDGET_QUERY = """
+    SELECT current_setting('max_connections')::int AS max_connections,
+           current_setting('superuser_reserved_connections')::int AS superuser_reserved
+"""
+
+
+def wait_for_database(dsn, timeout=60.0, interval=1.0) -> dict:
+    """
+    Startup readiness: retries until Postgres accepts connections, then returns
+    its connection limits. Raises the last error after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = psycopg2.connect(dsn, connect_timeout=max(1, int(interval)))
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(BUDGET_QUERY)
+                    max_connections, superuser_reserved = cur.fetchone()
+                return {"max_connections": max_connections, "superuser_reserved": superuser_reserved}
+            finally:
+                conn.close()
+        except psycopg2.OperationalError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(interval)
+
+
+def plan_pool_sizes(max_connections, superuser_reserved, workers,
+                    reserved=DEFAULT_RESERVED_CONNECTIONS, notify_listener=False) -> dict:
+    """
+    Splits what Postgres allows between `workers` processes. Each worker holds
+    its asyncpg pool, its (lazy) psycopg2 pool and, with MATERIAL_CACHE_NOTIFY,
+    one LISTEN connection. Returns the env settings every worker reads.
+    """
+    budget = max_connections - superuser_reserved - reserved
+    per_worker = budget // workers
+    fixed = SYNC_POOL_MAX + (1 if notify_listener else 0)
+    async_max = min(per_worker - fixed, ASYNC_POOL_CAP)
+    if async_max < 2:
+        raise ValueError(
+            f"max_connections={max_connections} leaves {per_worker} connections per worker "
+            f"for {workers} workers: lower WEB_CONCURRENCY or raise max_connections"
+        )
+    return {
+        "ASYNC_DB_POOL_MAX_SIZE": async_max,
+        "ASYNC_DB_POOL_MIN_SIZE": min(int(os.environ.get("ASYNC_DB_POOL_MIN_SIZE", 2)), async_max),
+        "DB_POOL_MAX_SIZE": SYNC_POOL_MAX,
+        "DB_POOL_MIN_SIZE": 0,
+        "per_worker": per_worker,
+        "total": workers * (async_max + fixed),
+        "budget": budget,
+    }
+
+
+def configured_total(workers, notify_listener=False) -> int:
+    """Connections the pool env vars already set would open with `workers` workers"""
+    async_max = int(os.environ.get("ASYNC_DB_POOL_MAX_SIZE", 20))
+    sync_max = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+    return workers * (async_max + sync_max + (1 if notify_listener else 0))
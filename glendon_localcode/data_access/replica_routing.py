@@ -0,0 +1,119 @@
+import functools
+import inspect
+import os
+import time
+from contextvars import ContextVar
+
+# -----------------------------------------------------------------------------
+# Read-replica routing for the repositories.
+# DATABASE_URL stays the primary (every write, every transaction). Methods
+# decorated with @replica_read read from DATABASE_REPLICA_URLS (round-robin)
+# unless the current session wrote recently: then they stay on the primary
+# so the caller reads its own writes (see controller/read_your_writes.py).
+# -----------------------------------------------------------------------------
+
+# Comma-separated replica DSNs; empty = everything goes to DATABASE_URL
+REPLICA_URLS = [dsn.strip() for dsn in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if dsn.strip()]
+# How far a replica may lag: a session that wrote reads from the primary for this
+# long, and replica reads are not cached this soon after an invalidation
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 5))
+# A replica that could not be reached is skipped for this long
+REPLICA_RETRY_SECONDS = float(os.environ.get("REPLICA_RETRY_SECONDS", 30))
+
+
+class RoutingState:
+    """
+    Routing state of one request. Set by the middleware and shared by reference,
+    so a write made in a threadpool (sync repositories) is seen by the request.
+    """
+
+    __slots__ = ("primary_until", "wrote")
+
+    def __init__(self, primary_until=0.0):
+        self.primary_until = primary_until  # Epoch seconds, from the session cookie
+        self.wrote = False
+
+    def use_primary(self) -> bool:
+        return self.wrote or self.primary_until > time.time()
+
+
+_state = ContextVar("db_routing_state", default=None)
+# True while a @replica_read method runs
+_replica_allowed = ContextVar("db_replica_allowed", default=False)
+
+
+def begin_request(primary_until=0.0):
+    """Returns (state, token); pass the token to end_request()"""
+    state = RoutingState(primary_until)
+    return state, _state.set(state)
+
+
+def end_request(token):
+    _state.reset(token)
+
+
+def mark_write():
+    """Called by the repositories after every write: pins the session to the primary"""
+    state = _state.get()
+    if state is not None:
+        state.wrote = True
+
+
+def routes_to_replica(requested=False) -> bool:
+    """
+    Whether a read made right now may go to a replica: inside a @replica_read
+    method, or `requested` by the caller (lazy generators such as fetch_chunks,
+    which run after the method that created them has returned).
+    """
+    if not REPLICA_URLS or not (requested or _replica_allowed.get()):
+        return False
+    state = _state.get()
+    return state is None or not state.use_primary()
+
+
+def replica_read(method):
+    """
+    Marks a read-only repository method (sync or async) whose queries may be
+    served by a replica. Inside a transaction the unit of work's (primary)
+    connection is used regardless.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            token = _replica_allowed.set(True)
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                _replica_allowed.reset(token)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _replica_allowed.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _replica_allowed.reset(token)
+    return wrapper
+
+
+class ReplicaSelector:
+    """Round-robin over REPLICA_URLS, skipping replicas that recently failed"""
+
+    def __init__(self, dsns):
+        self.dsns = list(dsns)
+        self._next = 0
+        self._down_until = {}
+
+    def candidates(self):
+        """Replica DSNs to try, in order (empty when all are marked down)"""
+        now = time.monotonic()
+        start = self._next
+        self._next = (self._next + 1) % max(len(self.dsns), 1)
+        ordered = self.dsns[start:] + self.dsns[:start]
+        return [dsn for dsn in ordered if self._down_until.get(dsn, 0) <= now]
+
+    def mark_down(self, dsn, error):
+        if self._down_until.get(dsn, 0) <= time.monotonic():
+            print(f"⚠️ Replica unavailable, reading from the primary for {REPLICA_RETRY_SECONDS:.0f}s: {error}")
+        self._down_until[dsn] = time.monotonic() + REPLICA_RETRY_SECONDS
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+# -----------------------------------------------------------------------------
+# Data layer between the Streamlit views and the API.
+# Streamlit reruns app.py on every click; reads below are served from
+# st.cache_data until their TTL runs out (or a write clears them), so plain
+# navigation does not call the API. Calls that do go out reuse pooled
+# keep-alive connections and revalidate with If-None-Match (304 = no body).
+# -----------------------------------------------------------------------------
+API_URL = os.environ.get("API_URL", "http://api:8000")
+TIMEOUT = 5
+
+# Seconds a read stays cached, per group of endpoints
+CARDS_TTL = int(os.environ.get("FRONTEND_CARDS_TTL", 60))
+DETAILS_TTL = int(os.environ.get("FRONTEND_DETAILS_TTL", 120))
+SKUS_TTL = int(os.environ.get("FRONTEND_SKUS_TTL", 120))
+
+CACHE_GROUPS = {
+    "cards": ("/material_cards/list", "/material_cards/page", "/materials/search"),
+    "details": (
+        "/material_details/dashboard", "/material_details/technical", "/material_details/cost",
+        "/material_details/history", "/material_details/bundle",
+    ),
+    "skus": ("/material_sku/get",),
+}
+
+
+class ApiError(Exception):
+    """Non-200 answer or connection failure (never cached)"""
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One pooled Session per Streamlit server process, shared by every user session"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.environ.get("FRONTEND_POOL_SIZE", 20)))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# (endpoint, payload) -> (ETag, body) of the last 200, replayed on 304 Not Modified.
+# Bounded: detail pages add one entry per material viewed.
+ETAG_STORE_SIZE = 256
+_etags = OrderedDict()
+_etags_lock = threading.Lock()
+
+
+def _fetch(endpoint, payload_json):
+    key = (endpoint, payload_json)
+    with _etags_lock:
+        cached = _etags.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+
+    url = f"{API_URL}{endpoint}"
+    try:
+        if payload_json is not None:
+            res = get_session().post(url, data=payload_json, headers={**headers, "Content-Type": "application/json"}, timeout=TIMEOUT)
+        else:
+            res = get_session().get(url, headers=headers, timeout=TIMEOUT)
+    except requests.RequestException as e:
+        raise ApiError(str(e)) from e
+
+    if res.status_code == 304 and cached:
+        return cached[1]
+    if res.status_code != 200:
+        raise ApiError(f"{endpoint}: HTTP {res.status_code}")
+
+    data = res.json()
+    etag = res.headers.get("ETag")
+    if etag:
+        with _etags_lock:
+            _etags[key] = (etag, data)
+            _etags.move_to_end(key)
+            while len(_etags) > ETAG_STORE_SIZE:
+                _etags.popitem(last=False)
+    return data
+
+
+# One cached function per TTL. Exceptions are not cached, so a failed call is retried next rerun.
+@st.cache_data(ttl=CARDS_TTL, show_spinner=False)
+def _cached_cards(endpoint, payload_json):
+    return _fetch(endpoint, payload_json)
+
+@st.cache_data(ttl=DETAILS_TTL, show_spinner=False)
+def _cached_details(endpoint, payload_json):
+    return _fetch(endpoint, payload_json)
+
+@st.cache_data(ttl=SKUS_TTL, show_spinner=False)
+def _cached_skus(endpoint, payload_json):
+    return _fetch(endpoint, payload_json)
+
+_CACHED = {"cards": _cached_cards, "details": _cached_details, "skus": _cached_skus}
+_GROUP_OF = {endpoint: group for group, endpoints in CACHE_GROUPS.items() for endpoint in endpoints}
+
+
+def get_api(endpoint, payload=None):
+    """
+    Calls the API and returns the JSON body, or None on any failure.
+    Reads in CACHE_GROUPS come from the cache; everything else (writes) always goes out.
+    """
+    payload_json = json.dumps(payload, sort_keys=True) if payload is not None else None
+    group = _GROUP_OF.get(endpoint)
+    try:
+        if group:
+            return _CACHED[group](endpoint, payload_json)
+        return _fetch(endpoint, payload_json)
+    except ApiError:
+        return None
+
+
+def invalidate(*groups):
+    """
+    Drops cached reads after a write so this session sees it on the next rerun
+    (other sessions pick it up when their TTL runs out). No groups = everything.
+    """
+    for group in groups or tuple(_CACHED):
+        _CACHED[group].clear()
@@ -1,46 +1,50 @@
 import streamlit as st
-import requests
 import pandas as pd
 import time
 import re
 import uuid # For generating UIDs if needed on frontend
 
+from api_client import get_api, invalidate
+
 # -----------------------------------------------------------------------------
 # 1. CONFIGURATION
 # -----------------------------------------------------------------------------
-API_URL = "http://api:8000"
-
 st.set_page_config(page_title="Master Material", layout="wide", page_icon="🧶")
 
 if 'view' not in st.session_state: st.session_state.view = 'list'
 if 'selected_id' not in st.session_state: st.session_state.selected_id = None
+# Keyset paging: cursors[i] opens page i (None = first page); reset when the query changes
+if 'grid_query' not in st.session_state: st.session_state.grid_query = None
+if 'grid_cursors' not in st.session_state: st.session_state.grid_cursors = [None]
+if 'grid_page' not in st.session_state: st.session_state.grid_page = 0
+# Bumped on navigation so the grid's row selection doesn't survive the way back
+if 'grid_key' not in st.session_state: st.session_state.grid_key = 0
 if 'chat_history' not in st.session_state: 
     st.session_state.chat_history = [{"role": "assistant", "content": "Hello! I can help you find materials. Try typing 'Find MAT-001' or 'Show me the cost of Silk'."}]
 
 # -----------------------------------------------------------------------------
 # 2. API HELPERS
 # -----------------------------------------------------------------------------
-def get_api(endpoint, payload=None):
-    try:
-        url = f"{API_URL}{endpoint}"
-        if payload is not None:
-            res = requests.post(url, json=payload, timeout=5)
-        else:
-            res = requests.get(url, timeout=5)
-        
-        if res.status_code == 200:
-            return res.json()
-        return None
-    except Exception:
-        return None
+# get_api / invalidate live in api_client.py: pooled connections, cached reads
+# (st.cache_data, TTL per endpoint group), ETag revalidation.
 
 # -----------------------------------------------------------------------------
 # 3. LLM CHATBOX
 # -----------------------------------------------------------------------------
+# Words that steer the answer rather than describe the material
+CHAT_FILLER_WORDS = {
+    "find", "show", "me", "search", "for", "the", "of", "a", "an", "is", "what", "who",
+    "cost", "price", "supplier", "supplies", "please", "get", "list", "any", "material", "materials",
+}
+
+def search_materials(text, page_size=5):
+    return get_api("/materials/search", {"query": text, "page_size": page_size})
+
 def process_chat_query(query):
-    query_upper = query.upper()
-    match = re.search(r'([A-Z]+[_\-][A-Z0-9_\-]+)', query_upper)
-    
+    query_upper = query.upper()  # Only for the COST / SUPPLIER keywords
+    # IDs keep the case they were typed in (generated IDs are lowercase: vin_doc_0001)
+    match = re.search(r'([A-Z]+[_\-][A-Z0-9_\-]+)', query, re.IGNORECASE)
+
     if match:
         doc_id = match.group(1)
         data = get_api("/material_details/dashboard", {"document_id": doc_id})
@@ -53,10 +57,34 @@ def process_chat_query(query):
             else:
                 st.session_state.selected_id = doc_id 
                 return f"✅ **Found it!**\n\n**Name:** {data.get('name')}\n**Status:** {data.get('verification_status')}\n**Type:** {data.get('material_type')}"
-        else:
-            return f"❌ I searched for ID **{doc_id}**, but it wasn't found."
-            
-    return "I didn't recognize a Material ID. Please specify the ID (e.g. MAT-001)."
+
+    # Free text (or an ID that was not found): ranked search
+    words = [w for w in re.findall(r"[\w\-]+", query) if w.lower() not in CHAT_FILLER_WORDS]
+    if not words:
+        return "Tell me what to look for, e.g. 'heavy cotton twill ABC Textiles' or an ID like vin_doc_0001."
+
+    result = search_materials(" ".join(words))
+    if result is None:
+        return "❌ Search is not available right now."
+    items = result.get("items", [])
+    if not items:
+        return f"❌ No materials match **{' '.join(words)}**."
+
+    top = items[0]
+    if len(items) == 1 or top.get("exact_match"):
+        st.session_state.selected_id = top.get("document_id")
+        if "COST" in query_upper or "PRICE" in query_upper:
+            return f"💰 The cost for **{top.get('material_name')}** ({top.get('document_id')}) is **{top.get('cost_per_unit')}**."
+        if "SUPPLIER" in query_upper:
+            return f"🏭 **{top.get('material_name')}** is supplied by **{top.get('supplier_name')}**."
+
+    lines = [
+        f"- **{m.get('material_name')}** ({m.get('document_id')}) · {m.get('supplier_name')} · {m.get('cost_per_unit')}"
+        for m in items
+    ]
+    header = "🔎 Closest matches:" if result.get("match") == "any" else "🔎 Found:"
+    more = "\n\n_More results in the list view._" if result.get("has_more") else ""
+    return header + "\n" + "\n".join(lines) + more
 
 # -----------------------------------------------------------------------------
 # 4. COMPONENTS
@@ -68,7 +96,7 @@ def render_sidebar():
         for msg in st.session_state.chat_history:
             messages.chat_message(msg["role"]).write(msg["content"])
 
-        if prompt := st.chat_input("Find material by ID..."):
+        if prompt := st.chat_input("Search by name, supplier or ID..."):
             st.session_state.chat_history.append({"role": "user", "content": prompt})
             response = process_chat_query(prompt)
             st.session_state.chat_history.append({"role": "assistant", "content": response})
@@ -80,19 +108,80 @@ def render_sidebar():
             st.session_state.selected_id = None
             st.rerun()
 
-def render_status_badge(status):
+def status_label(status):
+    # Grid cells are plain text: colored dot instead of a badge
     status = status or "Draft"
     if "Verified" in status and "Unverified" not in status:
-        color = "green"
+        dot = "🟢"
     elif "Unverified" in status:
-        color = "blue"
+        dot = "🔵"
     else:
-        color = "orange"
-    st.markdown(f":{color}-background[{status}]")
+        dot = "🟠"
+    return f"{dot} {status}"
 
 # -----------------------------------------------------------------------------
 # 5. VIEW: DASHBOARD (List)
 # -----------------------------------------------------------------------------
+MATERIAL_TYPES = ["Main Fabric", "Secondary Fabric", "Trim", "Packaging"]
+STATUSES = ["Draft", "Submitted - Unverified", "Submitted - Verified"]
+SORT_OPTIONS = {
+    "Newest first": "newest",
+    "Cost: low to high": "reporting_cost_asc",
+    "Cost: high to low": "reporting_cost_desc",
+}
+PAGE_SIZES = [25, 50, 100]  # /materials/search allows up to 100
+
+GRID_COLUMNS = {
+    "document_id": "ID",
+    "material_name": "Name",
+    "material_type": "Type",
+    "supplier_name": "Supplier",
+    "cost_per_unit": "Cost",
+    "reporting_cost": "Reporting Cost",
+    "verification_status": "Status",
+    "ver_num": "Ver",
+}
+
+def render_grid_controls():
+    """Filter / sort widgets -> the request body shared by every page of the grid"""
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 2])
+    search = c1.text_input("Search", placeholder="Name, supplier or ID", key="grid_search")
+    m_type = c2.selectbox("Type", ["All"] + MATERIAL_TYPES, key="grid_type")
+    supplier = c3.text_input("Supplier starts with", key="grid_supplier")
+    sort_label = c4.selectbox("Sort", list(SORT_OPTIONS), key="grid_sort", disabled=bool(search.strip()),
+                              help="Search results are ranked by relevance")
+    c5, c6 = st.columns([6, 2])
+    statuses = c5.multiselect("Status", STATUSES, default=STATUSES, key="grid_statuses")
+    page_size = c6.selectbox("Rows per page", PAGE_SIZES, index=1, key="grid_page_size")
+
+    query = {"statuses": statuses or STATUSES, "page_size": page_size}
+    if m_type != "All":
+        query["material_type"] = m_type
+    if supplier.strip():
+        query["supplier_name"] = supplier.strip()
+    if search.strip():
+        query["query"] = search.strip()
+    else:
+        query["sort_by"] = SORT_OPTIONS[sort_label]
+    return query
+
+def fetch_grid_page(query, page):
+    """One page from the API: (cards, has_next) or (None, False) when the call failed"""
+    if "query" in query:
+        # Ranked search pages by number
+        result = get_api("/materials/search", {**query, "page": page + 1})
+        if result is None:
+            return None, False
+        return result["items"], result["has_more"]
+
+    cursors = st.session_state.grid_cursors
+    result = get_api("/material_cards/page", {**query, "cursor": cursors[page]})
+    if result is None:
+        return None, False
+    if result.get("next_cursor") and len(cursors) == page + 1:
+        cursors.append(result["next_cursor"])
+    return result["items"], bool(result.get("next_cursor"))
+
 def view_dashboard():
     st.title("🍔 Master Material")
     
@@ -102,28 +191,45 @@ def view_dashboard():
             st.session_state.view = 'create'
             st.rerun()
 
-    materials = get_api("/material_cards/list", {"statuses": []})
-    
-    if not materials:
-        st.info("No materials found. Database is empty.")
+    query = render_grid_controls()
+    if query != st.session_state.grid_query:
+        st.session_state.grid_query = query
+        st.session_state.grid_cursors = [None]
+        st.session_state.grid_page = 0
+    page = st.session_state.grid_page
+
+    cards, has_next = fetch_grid_page(query, page)
+    if cards is None:
+        st.error("Could not load materials. Check API connection.")
+        return
+    if not cards and page == 0:
+        st.info("No materials match these filters.")
         return
 
-    st.markdown("---")
-    for mat in materials:
-        with st.container():
-            c1, c2, c3, c4, c5 = st.columns([1.5, 3, 2, 2, 1])
-            with c1: 
-                st.write(f"**{mat.get('document_id')}**")
-                st.caption(f"Ver: {mat.get('ver_num')}")
-            with c2: st.write(f"📄 {mat.get('material_name')}")
-            with c3: st.write(f"🏷️ {mat.get('material_type')}")
-            with c4: render_status_badge(mat.get('verification_status'))
-            with c5:
-                if st.button("View", key=mat['document_id']):
-                    st.session_state.selected_id = mat['document_id']
-                    st.session_state.view = 'detail'
-                    st.rerun()
-        st.divider()
+    # One widget whatever the catalogue size: only this page's rows are drawn
+    grid = pd.DataFrame(
+        [{**c, "verification_status": status_label(c.get("verification_status"))} for c in cards],
+        columns=list(GRID_COLUMNS),
+    ).rename(columns=GRID_COLUMNS)
+    event = st.dataframe(
+        grid, hide_index=True, use_container_width=True,
+        on_select="rerun", selection_mode="single-row",
+        key=f"grid_{st.session_state.grid_key}",
+    )
+    if event.selection.rows:
+        st.session_state.selected_id = cards[event.selection.rows[0]]["document_id"]
+        st.session_state.view = 'detail'
+        st.session_state.grid_key += 1
+        st.rerun()
+
+    p1, p2, p3 = st.columns([1, 4, 1])
+    if p1.button("◀ Previous", disabled=page == 0, use_container_width=True):
+        st.session_state.grid_page -= 1
+        st.rerun()
+    p2.caption(f"Page {page + 1} · select a row to open it")
+    if p3.button("Next ▶", disabled=not has_next, use_container_width=True):
+        st.session_state.grid_page += 1
+        st.rerun()
 
 # -----------------------------------------------------------------------------
 # 6. VIEW: CREATE / EDIT (PROFESSIONAL UI UX)
@@ -150,7 +256,7 @@ def view_create():
             name = st.text_input("Material Name 🔴", placeholder="e.g., Heavy Cotton Twill", key="in_name")
             supplier = st.text_input("Supplier Name 🔴", placeholder="e.g., ABC Textiles", key="in_supplier")
         with c2:
-            m_type = st.selectbox("Material Type 🔴", ["Main Fabric", "Secondary Fabric", "Trim", "Packaging"], index=0, key="in_type")
+            m_type = st.selectbox("Material Type 🔴", MATERIAL_TYPES, index=0, key="in_type")
             ref_id = st.text_input("Supplier Ref ID", placeholder="e.g., SUP-2024-001", key="in_ref")
         with c3:
             country = st.selectbox("Origin", ["Vietnam", "China", "India", "Turkey", "Other"], key="in_country")
@@ -329,6 +435,7 @@ def view_create():
         
         if res:
             st.success(f"Success! {res.get('message')}")
+            invalidate("cards")  # The new material must show up in the list
             st.session_state.fabric_stack = [] 
             time.sleep(1)
             st.session_state.view = 'list'
@@ -360,7 +467,11 @@ def view_detail():
     with c_title:
         st.title(f"🔎 Details: {doc_id}")
     
-    data = get_api("/material_details/dashboard", {"document_id": doc_id})
+    # Every tab in one call: the API reads the version row once and loads
+    # history and SKUs concurrently, so the page waits for a single request
+    with st.spinner("Loading material..."):
+        bundle = get_api("/material_details/bundle", {"document_id": doc_id})
+    data = bundle.get("dashboard") if bundle else None
     if not data:
         st.error("Could not load details.")
         return
@@ -375,16 +486,20 @@ def view_detail():
     t1, t2, t3, t4, t5 = st.tabs(["Overview", "Technical Specs", "Cost Details", "History", "SKUs"])
     with t1: st.json(data)
     with t2:
-        tech = get_api("/material_details/technical", {"document_id": doc_id})
+        tech = bundle.get("technical")
         if tech: st.table(pd.DataFrame(tech.items(), columns=["Specification", "Value"]))
+        else: st.warning("Technical specs are not available.")
     with t3:
-        cost = get_api("/material_details/cost", {"document_id": doc_id})
+        cost = bundle.get("cost")
         if cost: st.dataframe(cost, use_container_width=True)
+        else: st.warning("Cost details are not available.")
     with t4:
-        hist = get_api("/material_details/history", {"document_id": doc_id})
+        hist = bundle.get("history")
         if hist: st.dataframe(hist, use_container_width=True)
+        elif hist is None: st.warning("History is not available.")
+        else: st.info("No history yet.")
     with t5:
-        skus = get_api("/material_sku/get", {"document_id": doc_id})
+        skus = bundle.get("skus")
         if skus:
             st.dataframe(pd.DataFrame(skus), use_container_width=True)
         else:
@@ -416,6 +531,7 @@ def view_detail():
                 }
                 res = get_api("/material_sku/create", payload)
                 if res:
+                    invalidate("skus", "details")  # The bundle carries SKUs too
                     st.success("SKU Created!")
                     time.sleep(1)
                     st.rerun()
@@ -0,0 +1,115 @@
+import os
+
+# -----------------------------------------------------------------------------
+# Production profile: Gunicorn master + Uvicorn workers.
+#   gunicorn -c gunicorn.conf.py main:app
+# (docker compose -f docker-compose.yml -f docker-compose.prod.yml up)
+#
+# The plain `uvicorn main:app` single process stays the default for development.
+#
+# Signals to the master:
+#   HUP          graceful reload: re-reads this file (worker count, pool sizing),
+#                starts new workers, lets old ones finish their requests (both
+#                sets hold pools meanwhile; they only grow past
+#                ASYNC_DB_POOL_MIN_SIZE under load, the rest is what
+#                DB_RESERVED_CONNECTIONS is for).
+#                With preload_app the code itself is NOT re-imported:
+#   USR2 + QUIT  zero-downtime code upgrade (new master, then stop the old one),
+#                or simply restart the container.
+#   TTIN / TTOU  one worker more / less
+#
+# Each worker has its own asyncpg pool, metrics registry and current-version
+# cache: /metrics and /db_pool_stats describe the worker that answered.
+# -----------------------------------------------------------------------------
+
+
+def _default_workers():
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    # Requests are mostly DB-bound async I/O: one event loop per core is enough
+    return max(cpus, 1)
+
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 0)) or _default_workers()
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import main.py once in the master and fork: faster worker (re)starts and shared
+# memory for the imported modules. Safe because every connection (asyncpg pool,
+# psycopg2 pool, NOTIFY listener) is opened inside the worker, never at import.
+preload_app = True
+
+# Seconds a worker gets to finish in-flight requests (exports included) on reload/stop
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+# Worker heartbeat: a worker whose event loop is blocked this long is restarted
+timeout = int(os.environ.get("WORKER_TIMEOUT", 120))
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+# Recycle workers now and then (jitter so they don't all restart together); 0 = never
+max_requests = int(os.environ.get("MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 1000))
+
+accesslog = os.environ.get("ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def _size_pools(server):
+    """
+    Startup readiness check + per-worker pool sizing, run in the master before
+    any worker is forked (workers inherit os.environ).
+
+    Waits for Postgres (DB_WAIT_TIMEOUT seconds), then splits max_connections
+    minus DB_RESERVED_CONNECTIONS between the workers. DB_POOL_SIZING=env keeps
+    the pool sizes already in the environment and only warns if they don't fit.
+    """
+    from data_access.pool_sizing import (
+        DEFAULT_RESERVED_CONNECTIONS, wait_for_database, plan_pool_sizes, configured_total
+    )
+    from data_access.material_cache import NOTIFY_ENABLED
+    from migrations.runner import migration_status
+
+    dsn = os.environ.get("DATABASE_URL")
+    if not dsn:
+        raise ValueError("DATABASE_URL is missing")
+
+    n_workers = server.cfg.workers
+    limits = wait_for_database(dsn, timeout=float(os.environ.get("DB_WAIT_TIMEOUT", 60)))
+    print(f"✅ Database ready (max_connections={limits['max_connections']})")
+
+    pending = [f"{m['version']}_{m['name']}" for m in migration_status(dsn) if not m["applied"]]
+    if pending:
+        print(f"⚠️ Pending migrations: {', '.join(pending)} (python init_db.py)")
+
+    reserved = int(os.environ.get("DB_RESERVED_CONNECTIONS", DEFAULT_RESERVED_CONNECTIONS))
+    plan = plan_pool_sizes(
+        limits["max_connections"], limits["superuser_reserved"], n_workers,
+        reserved=reserved, notify_listener=NOTIFY_ENABLED,
+    )
+
+    if os.environ.get("DB_POOL_SIZING", "auto") == "env":
+        total = configured_total(n_workers, notify_listener=NOTIFY_ENABLED)
+        if total > plan["budget"]:
+            print(f"⚠️ {n_workers} workers may open {total} connections, "
+                  f"Postgres leaves {plan['budget']} (set DB_POOL_SIZING=auto)")
+        return
+
+    for key in ("ASYNC_DB_POOL_MAX_SIZE", "ASYNC_DB_POOL_MIN_SIZE", "DB_POOL_MAX_SIZE", "DB_POOL_MIN_SIZE"):
+        os.environ[key] = str(plan[key])
+    print(f"🔌 {n_workers} workers x {plan['ASYNC_DB_POOL_MAX_SIZE']} async connections "
+          f"(+{plan['DB_POOL_MAX_SIZE']} sync{', +1 listener' if NOTIFY_ENABLED else ''}): "
+          f"{plan['total']} of {plan['budget']} available")
+
+
+def on_starting(server):
+    _size_pools(server)
+
+
+def on_reload(server):
+    # HUP may change WEB_CONCURRENCY: re-split the connections for the new workers
+    _size_pools(server)
+
+
+def when_ready(server):
+    print(f"🚀 Gunicorn ready on {', '.join(server.cfg.bind)} with {server.cfg.workers} Uvicorn workers")
@@ -0,0 +1,144 @@
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from data_access.material_cost_data_access import AsyncMaterialCostDataAccess
+from data_access.fx_rate_data_access import AsyncFxRateDataAccess
+from logics.fx_rate_logics import reprice_new_versions
+from data_access.material_cache import current_version_cache, NOTIFY_ENABLED
+
+# Versions per UPDATE statement when recomputing stored costs
+RECOMPUTE_BATCH_SIZE = 5000
+
+# Rates are stored as percentages, as entered in the form (5 = 5%).
+#   effective_cost_per_unit = cost * (1 + supplier_selling_tolerance / 100)
+#   landed_cost_per_unit    = effective * (1 + logistics_rate / 100)
+#   logistics_fee_per_unit  = weight_per_unit * logistics_rate / 100
+# Landed cost and fee only exist once there is an effective cost; a result
+# that is not > 0 is stored as NULL (same as the form did).
+# VAT and import duty are not part of these formulas yet.
+COST_INPUT_FIELDS = [
+    "original_cost_per_unit", "supplier_selling_tolerance", "logistics_rate", "weight_per_unit"
+]
+COST_OUTPUT_FIELDS = [
+    "effective_cost_per_unit", "landed_cost_per_unit", "logistics_fee_per_unit"
+]
+
+
+def _as_float(value) -> float:
+    # Missing or unparseable inputs count as 0 rather than failing the whole version
+    try:
+        return float(value) if value is not None and value != "" else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _positive_or_none(value):
+    return value if value is not None and value > 0 else None
+
+
+def compute_costs(data: dict) -> Dict[str, float]:
+    """Calculated cost fields for one version's form data"""
+    cost = _as_float(data.get("original_cost_per_unit"))
+    tolerance = _as_float(data.get("supplier_selling_tolerance"))
+    log_rate = _as_float(data.get("logistics_rate"))
+    weight = _as_float(data.get("weight_per_unit"))
+
+    effective = cost * (1 + tolerance / 100.0) if cost > 0 else 0.0
+    landed = effective * (1 + log_rate / 100.0) if effective > 0 else 0.0
+    fee = weight * (log_rate / 100.0) if effective > 0 else 0.0
+
+    return {
+        "effective_cost_per_unit": _positive_or_none(effective),
+        "landed_cost_per_unit": _positive_or_none(landed),
+        "logistics_fee_per_unit": _positive_or_none(fee),
+    }
+
+
+def apply_costs(data: dict) -> dict:
+    """Overwrites any client-sent calculated fields with the server's numbers"""
+    data.update(compute_costs(data))
+    return data
+
+
+def _column(rows: List[dict], field: str) -> np.ndarray:
+    # NULL -> 0, same as compute_costs
+    return np.array([_as_float(row.get(field)) for row in rows], dtype=np.float64)
+
+
+def compute_costs_batch(rows: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized compute_costs over many versions at once. Returns one float64
+    array per output field, aligned with `rows`; NaN where the value is NULL.
+    """
+    cost = _column(rows, "original_cost_per_unit")
+    tolerance = _column(rows, "supplier_selling_tolerance")
+    log_rate = _column(rows, "logistics_rate")
+    weight = _column(rows, "weight_per_unit")
+
+    has_cost = cost > 0
+    effective = np.where(has_cost, cost * (1 + tolerance / 100.0), 0.0)
+    has_effective = effective > 0
+    landed = np.where(has_effective, effective * (1 + log_rate / 100.0), 0.0)
+    fee = np.where(has_effective, weight * (log_rate / 100.0), 0.0)
+
+    return {
+        "effective_cost_per_unit": np.where(effective > 0, effective, np.nan),
+        "landed_cost_per_unit": np.where(landed > 0, landed, np.nan),
+        "logistics_fee_per_unit": np.where(fee > 0, fee, np.nan),
+    }
+
+
+def to_db_values(values: np.ndarray) -> List:
+    """float64 array -> list of floats with None for NaN (NULL)"""
+    return [None if math.isnan(v) else v for v in values.tolist()]
+
+
+class _DryRun(Exception):
+    pass
+
+
+class CostRecomputeService:
+    """Brings stored calculated costs back in line with the engine, in bulk"""
+
+    def __init__(self):
+        self.data_access = AsyncMaterialCostDataAccess()
+        self.fx_data_access = AsyncFxRateDataAccess()
+
+    async def recompute(self, current_only=True, dry_run=False, batch_size=RECOMPUTE_BATCH_SIZE):
+        rows = await self.data_access.get_cost_inputs(current_only)
+        costs = compute_costs_batch(rows)
+        uids = [row["document_uid"] for row in rows]
+        columns = [to_db_values(costs[field]) for field in COST_OUTPUT_FIELDS]
+
+        changed = []
+        # One transaction: a dry run rolls everything back to report what would change
+        try:
+            async with self.data_access.transaction():
+                for start in range(0, len(uids), batch_size):
+                    end = start + batch_size
+                    batch = await self.data_access.update_costs(
+                        uids[start:end], *(column[start:end] for column in columns)
+                    )
+                    if batch and not dry_run:
+                        # reporting_landed_cost_per_unit is converted from landed_cost_per_unit.
+                        # Per batch: one ANY() over every changed version plans far worse
+                        await reprice_new_versions(self.fx_data_access, [r["document_uid"] for r in batch])
+                    changed += batch
+                if dry_run:
+                    raise _DryRun()
+                if changed and NOTIFY_ENABLED:
+                    await self.data_access.notify_all_changed()
+        except _DryRun:
+            pass
+
+        if changed and not dry_run:
+            current_version_cache.clear()
+
+        return {
+            "checked": len(rows),
+            "changed": len(changed),
+            "dry_run": dry_run,
+            "document_ids": sorted({r["document_id"] for r in changed}),
+        }
@@ -0,0 +1,25 @@
+from data_access.current_materials_data_access import AsyncCurrentMaterialsDataAccess
+from data_access.material_cache import current_version_cache, NOTIFY_ENABLED
+
+
+class CurrentMaterialsService:
+    """Health and forced rebuild of the current_materials projection"""
+
+    def __init__(self):
+        self.data_access = AsyncCurrentMaterialsDataAccess()
+
+    async def stats(self):
+        """Row counts and drift against the source join; max_lag_seconds is 0 when in step"""
+        row = await self.data_access.get_projection_stats()
+        return {**row, "in_sync": not (row["missing_rows"] or row["orphaned_rows"] or row["stale_rows"])}
+
+    async def rebuild(self):
+        async with self.data_access.transaction():
+            result = await self.data_access.rebuild()
+            if result["refreshed"] or result["removed"]:
+                if NOTIFY_ENABLED:
+                    await self.data_access.notify_all_changed()
+        # After commit: detail rows are cached from the projection
+        if result["refreshed"] or result["removed"]:
+            current_version_cache.clear()
+        return result
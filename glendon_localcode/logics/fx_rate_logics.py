@@ -0,0 +1,59 @@
+import os
+from datetime import date
+
+from data_access.fx_rate_data_access import AsyncFxRateDataAccess
+from data_access.material_cache import current_version_cache, NOTIFY_ENABLED
+
+# Every current version also carries its cost in this currency (card sort / filters)
+REPORTING_CURRENCY = os.environ.get("REPORTING_CURRENCY", "USD")
+
+
+class FxRateService:
+    def __init__(self):
+        self.data_access = AsyncFxRateDataAccess()
+
+    def _get_current_user_info(self):
+        return "admin@company.com", "System Admin"
+
+    async def list_rates(self, quote_currency=None):
+        return await self.data_access.list_rates(quote_currency or REPORTING_CURRENCY)
+
+    async def upsert_rates(self, rates: list, reprice=True):
+        """Stores rates (same day + pair overwrites), then optionally reprices in the same transaction"""
+        email, name = self._get_current_user_info()
+        async with self.data_access.transaction():
+            for r in rates:
+                await self.data_access.upsert_rate(
+                    r['base_currency'], r['quote_currency'], r['effective_date'], r['rate'], email
+                )
+            result = await self._reprice(date.today()) if reprice else None
+        self._after_reprice(result)
+        return {"saved": len(rates), "reprice": result}
+
+    async def reprice(self, as_of: date = None):
+        """The repricing job: converts every current version at the rates effective on `as_of`"""
+        async with self.data_access.transaction():
+            result = await self._reprice(as_of or date.today())
+        self._after_reprice(result)
+        return result
+
+    async def _reprice(self, as_of: date):
+        changed = await self.data_access.reprice(REPORTING_CURRENCY, as_of)
+        if changed and NOTIFY_ENABLED:
+            await self.data_access.notify_all_changed()
+        return {
+            "reporting_currency": REPORTING_CURRENCY,
+            "as_of": as_of,
+            "repriced": len(changed),
+            "missing_currencies": await self.data_access.get_missing_currencies(REPORTING_CURRENCY, as_of),
+        }
+
+    def _after_reprice(self, result):
+        # After commit: cached current-version rows carry the old converted cost
+        if result and result["repriced"]:
+            current_version_cache.clear()
+
+
+async def reprice_new_versions(data_access: AsyncFxRateDataAccess, document_uids: list):
+    """Converts freshly written current versions; call inside the write transaction"""
+    await data_access.reprice(REPORTING_CURRENCY, date.today(), document_uids)
@@ -0,0 +1,43 @@
+from typing import List
+from data_access.id_counter_data_access import IdCounterDataAccess, AsyncIdCounterDataAccess
+
+def format_id(prefix: str, number: int, width: int) -> str:
+    """ ("vin_doc_", 7, 4) -> "vin_doc_0007" """
+    return f"{prefix}{number:0{width}d}"
+
+def _format_block(prefix: str, last: int, count: int, width: int) -> List[str]:
+    first = last - count + 1
+    return [format_id(prefix, n, width) for n in range(first, last + 1)]
+
+class IdAllocator:
+    """
+    Hands out human-readable IDs from per-prefix counters (id_counters table)
+    instead of scanning the data tables for the current maximum.
+    """
+    def __init__(self):
+        self.data_access = IdCounterDataAccess()
+
+    def next_id(self, prefix: str, width: int = 4) -> str:
+        return self.reserve_block(prefix, 1, width)[0]
+
+    def reserve_block(self, prefix: str, count: int, width: int = 4) -> List[str]:
+        """Reserves `count` consecutive IDs in one round trip (for bulk imports)"""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        last = self.data_access.allocate(prefix, count)
+        return _format_block(prefix, last, count, width)
+
+class AsyncIdAllocator:
+    """asyncpg flavour of IdAllocator"""
+    def __init__(self):
+        self.data_access = AsyncIdCounterDataAccess()
+
+    async def next_id(self, prefix: str, width: int = 4) -> str:
+        return (await self.reserve_block(prefix, 1, width))[0]
+
+    async def reserve_block(self, prefix: str, count: int, width: int = 4) -> List[str]:
+        """Reserves `count` consecutive IDs in one round trip (for bulk imports)"""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        last = await self.data_access.allocate(prefix, count)
+        return _format_block(prefix, last, count, width)
@@ -1,5 +1,14 @@
+import base64
+import json
+from datetime import datetime
 from schemas.material_card_schemas import MaterialCard
 
+DEFAULT_STATUSES = ["Draft", "Submitted - Unverified", "Submitted - Verified"]
+FILTER_FIELDS = [
+    "material_type", "supplier_name", "country_of_origin", "min_cost", "max_cost",
+    "min_reporting_cost", "max_reporting_cost", "fibers"
+]
+
 def _format_composition_for_card(comp_data):
     """
     Converts JSONB composition data into a short string for the card.
@@ -35,6 +44,11 @@ def _format_single_card(row):
     nccy = row.get('native_cost_currency')
     cost = f"{ocpu} {nccy}" if (ocpu and nccy) else ""
 
+    # Logic: Format Cost in the reporting currency (same for every card)
+    rcpu = row.get('reporting_cost_per_unit')
+    rccy = row.get('reporting_currency')
+    reporting_cost = f"{rcpu:.2f} {rccy}" if (rcpu is not None and rccy) else ""
+
     return {
         "document_id": row.get('document_id') or " ", 
         "master_material_id": row.get('master_material_id') or " ", # Use the human readable ID
@@ -48,6 +62,7 @@ def _format_single_card(row):
         "weight": weight,
         "supplier_name": row.get('supplier_name') or " ",
         "cost_per_unit": cost,
+        "reporting_cost": reporting_cost,
         "verification_status": row.get('status') or "Draft",
         "ver_num": row.get('ver_num'),
         "picture_id": row.get('picture_id') # <--- NEW
@@ -64,4 +79,38 @@ def process_material_cards(sql_rows, allowed_statuses):
         formatted_card = _format_single_card(row)
         cards.append(formatted_card)
         
-    return cards
\ No newline at end of file
+    return cards
+
+# ------------------------------------------------------------------
+# Keyset pagination cursor: opaque token for (sort key, document_id)
+# newest -> created_at, reporting_cost_* -> reporting_cost_per_unit
+# ------------------------------------------------------------------
+def encode_cursor(row, sort_by="newest") -> str:
+    if sort_by == "newest":
+        created_at = row.get('created_at')
+        key = created_at.isoformat() if created_at else None
+    else:
+        key = row.get('reporting_cost_per_unit')
+    payload = [key, row.get('document_id')]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str, sort_by="newest"):
+    try:
+        key, document_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_by == "newest":
+            return datetime.fromisoformat(key), document_id
+        if not isinstance(key, (int, float)):
+            raise ValueError
+        return float(key), document_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def build_card_page(sql_rows, allowed_statuses, page_size, sort_by="newest"):
+    """sql_rows holds up to page_size + 1 rows; the extra one only signals a next page"""
+    has_more = len(sql_rows) > page_size
+    page_rows = sql_rows[:page_size]
+    next_cursor = encode_cursor(page_rows[-1], sort_by) if (has_more and page_rows) else None
+    return {
+        "items": process_material_cards(page_rows, allowed_statuses),
+        "next_cursor": next_cursor
+    }
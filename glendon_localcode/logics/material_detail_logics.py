@@ -1,4 +1,8 @@
 from schemas.material_detail_schemas import MaterialDetailResponse
+from logics.material_sku_input_logics import map_sku_row
+
+BUNDLE_SECTIONS = ["dashboard", "technical", "cost", "history", "skus"]
+ROW_SECTIONS = {"dashboard", "technical", "cost"} # built from the current version row
 
 class MaterialDetailLogics:
     
@@ -95,4 +99,19 @@ class MaterialDetailLogics:
                 "change_description": r.get('change_description', '')
             }
             for r in rows
-        ]
\ No newline at end of file
+        ]
+
+    def build_bundle(self, document_id, sections, version_row=None, history_rows=None, sku_rows=None) -> dict:
+        """Assembles the requested detail sections from rows that were fetched once"""
+        bundle = {"document_id": document_id}
+        if "dashboard" in sections:
+            bundle["dashboard"] = self.build_material_detail(version_row)
+        if "technical" in sections:
+            bundle["technical"] = self.build_technical_detail(version_row)
+        if "cost" in sections:
+            bundle["cost"] = self.build_cost_detail(version_row)
+        if "history" in sections:
+            bundle["history"] = self.build_version_history(history_rows or [])
+        if "skus" in sections:
+            bundle["skus"] = [map_sku_row(sku) for sku in (sku_rows or [])]
+        return bundle
@@ -0,0 +1,128 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+from data_access.material_export_data_access import EXPORT_COLUMNS
+
+# Optional: only needed for format=parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+COLUMN_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value, kind):
+    if value is None:
+        return ""
+    if kind == "json":
+        return json.dumps(value)
+    if kind == "timestamp":
+        return value.isoformat()
+    return value
+
+
+async def csv_stream(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMN_NAMES)
+    async for rows in chunks:
+        for row in rows:
+            writer.writerow([_csv_value(row[name], kind) for name, kind in EXPORT_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def jsonl_stream(chunks):
+    async for rows in chunks:
+        yield "".join(json.dumps(row, default=_json_default) + "\n" for row in rows).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file for ParquetWriter that hands back whatever was written
+    since the last drain(). tell() keeps counting from the start of the file,
+    which the writer needs for the footer offsets.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema():
+    types = {
+        "text": pa.string(), "json": pa.string(), "int": pa.int64(),
+        "float": pa.float64(), "bool": pa.bool_(), "timestamp": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+async def parquet_stream(chunks):
+    """One row group per chunk, sent as soon as it is encoded"""
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        async for rows in chunks:
+            columns = {
+                name: [json.dumps(row[name]) if kind == "json" and row[name] is not None else row[name] for row in rows]
+                for name, kind in EXPORT_COLUMNS
+            }
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()  # Footer
+
+
+EXPORT_WRITERS = {"csv": csv_stream, "jsonl": jsonl_stream, "parquet": parquet_stream}
+
+
+def export_stream(chunks, fmt: str):
+    """Encodes an async iterator of row chunks as `fmt`, yielding bytes as it goes"""
+    if fmt == "parquet" and pa is None:
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+    return EXPORT_WRITERS[fmt](chunks)
+
+
+def export_filename(fmt: str) -> str:
+    return f"material_catalogue_{datetime.now():%Y%m%d_%H%M%S}.{fmt}"
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+from pydantic import ValidationError
+
+from data_access.material_input_data_access import _version_insert_params, _bulk_master_params
+from logics.material_input_logics import MaterialService, DOC_PREFIX, MMAT_PREFIX, ID_WIDTH, REQUIRED_FIELDS
+from schemas.material_input_schemas import CreateMaterialRequest
+
+IMPORT_FORMATS = ("csv", "jsonl")
+# Valid rows are COPY'd this many at a time (all inside one transaction)
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", 1000))
+MAX_IMPORT_ROWS = int(os.environ.get("MAX_IMPORT_ROWS", 50000))
+
+# CSV cells that hold JSON (e.g. [[60, "Cotton"], [40, "Polyester"]])
+JSON_COLUMNS = ("fabric_composition",)
+
+
+def _parse_csv(text: str) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        # Line number of the row in the file (header is line 1)
+        line = reader.line_num
+        data = {k.strip(): v for k, v in row.items() if k}
+        for column in JSON_COLUMNS:
+            value = (data.get(column) or "").strip()
+            if value.startswith("["):
+                try:
+                    data[column] = json.loads(value)
+                except json.JSONDecodeError:
+                    pass  # Left as text: validation reports it
+        yield line, data
+
+
+def _parse_jsonl(text: str) -> Iterator[Tuple[int, dict]]:
+    for line, raw in enumerate(text.splitlines(), start=1):
+        if not raw.strip():
+            continue
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            yield line, ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        yield line, data if isinstance(data, dict) else ValueError("Each line must be a JSON object")
+
+
+def parse_import_rows(body: bytes, fmt: str) -> List[Tuple[int, object]]:
+    """Splits an upload into (line number, dict or ValueError) pairs"""
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}', expected one of: {', '.join(IMPORT_FORMATS)}")
+    text = body.decode("utf-8-sig")  # Excel CSV exports start with a BOM
+    rows = list(_parse_csv(text) if fmt == "csv" else _parse_jsonl(text))
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ValueError(f"Too many rows ({len(rows)}), the limit is {MAX_IMPORT_ROWS}")
+    return rows
+
+
+def _format_errors(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+
+def validate_import_row(data, is_submit: bool):
+    """Returns (clean dict, []) or (None, [error messages])"""
+    if isinstance(data, Exception):
+        return None, [str(data)]
+    try:
+        clean = CreateMaterialRequest.model_validate(data).model_dump(exclude_none=True)
+    except ValidationError as e:
+        return None, _format_errors(e)
+    if is_submit:
+        missing = [f for f in REQUIRED_FIELDS if not clean.get(f)]
+        if missing:
+            return None, [f"Missing required fields: {', '.join(missing)}"]
+    return clean, []
+
+
+class MaterialImportService(MaterialService):
+    """
+    Bulk counterpart of MaterialService.create_material: every valid row
+    becomes a new document at v1. Rows are written with COPY, all in one
+    transaction.
+
+    IDs are reserved up front, in a short transaction of their own: the
+    id_counters row locks are released before the (long) write starts, so
+    single-material creates don't wait for the import. The price is gaps:
+    if the import fails or is rolled back, its reserved IDs are never used.
+    """
+
+    async def import_materials(self, rows, is_submit: bool, all_or_nothing: bool = False):
+        email, name = self._get_current_user_info()
+        now = datetime.now()
+        status = "Submitted - Unverified" if is_submit else "Draft"
+
+        results = []
+        valid = []  # (result dict, clean data)
+        for line, data in rows:
+            clean, errors = validate_import_row(data, is_submit)
+            result = {"line": line, "status": "invalid" if errors else "created", "errors": errors}
+            results.append(result)
+            if not errors:
+                valid.append((result, self._prepare_version_data(clean)))
+
+        invalid_count = len(results) - len(valid)
+        if invalid_count and all_or_nothing:
+            for result, _ in valid:
+                result["status"] = "skipped"
+            valid = []
+
+        if valid:
+            doc_ids, mmat_ids = await self._reserve_ids(valid)
+            async with self.data_access.transaction():
+                for start in range(0, len(valid), IMPORT_BATCH_SIZE):
+                    end = start + IMPORT_BATCH_SIZE
+                    await self._write_batch(valid[start:end], doc_ids[start:end], mmat_ids, status, email, now)
+
+        return {
+            "total": len(results),
+            "created": len(valid),
+            "invalid": invalid_count,
+            "status": status,
+            "results": results,
+        }
+
+    async def _reserve_ids(self, valid):
+        """One document ID per row, one mmat ID per row without a master_material_id (iterator)"""
+        missing_mmat = sum(1 for _, data in valid if not data.get('master_material_id'))
+        async with self.id_allocator.data_access.transaction():
+            doc_ids = await self.id_allocator.reserve_block(DOC_PREFIX, len(valid), ID_WIDTH)
+            mmat_ids = await self.id_allocator.reserve_block(MMAT_PREFIX, missing_mmat, ID_WIDTH) if missing_mmat else []
+        return doc_ids, iter(mmat_ids)
+
+    async def _write_batch(self, batch, doc_ids, mmat_ids, status, email, now):
+        masters, versions = [], []
+        for (result, data), doc_id in zip(batch, doc_ids):
+            if not data.get('master_material_id'):
+                data['master_material_id'] = next(mmat_ids)
+            doc_uid = str(uuid.uuid4())
+            masters.append(_bulk_master_params(doc_uid, doc_id, status, email, now, data))
+            versions.append(_version_insert_params(doc_uid, doc_id, 1, status, email, now, data))
+            result["document_id"] = doc_id
+            result["master_material_id"] = data['master_material_id']
+
+        await self.data_access.bulk_create_materials(masters, versions)
+        await self._reprice([version[0] for version in versions])
@@ -1,39 +1,39 @@
-import time
 import uuid # <--- NEW
 from datetime import datetime
-from data_access.material_input_data_access import MaterialInputDataAccess
+from data_access.material_input_data_access import AsyncMaterialInputDataAccess
+from logics.id_allocator_logics import AsyncIdAllocator
+from logics.cost_engine_logics import apply_costs
+from logics.fx_rate_logics import reprice_new_versions
+from data_access.fx_rate_data_access import AsyncFxRateDataAccess
+from data_access.material_cache import current_version_cache, NOTIFY_ENABLED
 
 # Constants
 DOC_PREFIX = "vin_doc_"
 MMAT_PREFIX = "vin_mmat_"
+ID_WIDTH = 4
 REQUIRED_FIELDS = ["material_name", "material_type"]
 
 class MaterialService:
     def __init__(self):
-        self.data_access = MaterialInputDataAccess()
-
-    def _generate_incremental_id(self, prefix, last_id_fetcher):
-        """
-        Generic generator: 
-        1. Calls the fetcher (function) to get the last ID from DB.
-        2. Increments the number part.
-        """
-        last_id = last_id_fetcher(prefix)
-        
-        if not last_id:
-            return f"{prefix}0001"
-        
-        try:
-            # Remove prefix "vin_doc_" -> "0005"
-            number_part = last_id.replace(prefix, "")
-            next_num = int(number_part) + 1
-            return f"{prefix}{next_num:04d}"
-        except ValueError:
-            # Fallback if ID was malformed
-            return f"{prefix}{int(time.time())}"
+        self.data_access = AsyncMaterialInputDataAccess()
+        self.id_allocator = AsyncIdAllocator()
+        self.fx_data_access = AsyncFxRateDataAccess()
 
     def _get_current_user_info(self):
         return "admin@company.com", "System Admin"
+
+    async def _notify_change(self, doc_id):
+        # Call inside the write transaction: other workers hear about it on commit
+        if NOTIFY_ENABLED:
+            await self.data_access.notify_changed(doc_id)
+
+    async def _reprice(self, doc_uids):
+        # Call inside the write transaction, after the master row points at the new version
+        await reprice_new_versions(self.fx_data_access, doc_uids)
+
+    def _invalidate_cache(self, doc_id):
+        # Call after the transaction: this worker drops its cached current version
+        current_version_cache.invalidate(doc_id)
     # ------------------------------------------------------------------
     # Helper: Prepare Data for DB
     # ------------------------------------------------------------------
@@ -53,13 +53,14 @@ class MaterialService:
                  pass 
              except:
                  pass
-        
-        return data
+
+        # Calculated costs always come from the server-side engine
+        return apply_costs(data)
 
  # ------------------------------------------------------------------
     # 1. CREATE
     # ------------------------------------------------------------------
-    def create_material(self, request_data: dict, is_submit: bool):
+    async def create_material(self, request_data: dict, is_submit: bool):
         email, name = self._get_current_user_info()
         now = datetime.now()
         
@@ -68,40 +69,44 @@ class MaterialService:
             missing = [f for f in REQUIRED_FIELDS if not request_data.get(f)]
             if missing: raise ValueError(f"Missing required fields: {', '.join(missing)}")
 
-        # 2. ID Generation
-        # A) Document ID (PK) -> vin_doc_0001
-        doc_id = request_data.get('document_id')
-        if not doc_id:
-            doc_id = self._generate_incremental_id(DOC_PREFIX, self.data_access.get_last_doc_id)
-        
-        # B) Master Material ID (Human Readable) -> vin_mmat_0001
-        mmat_id = request_data.get('master_material_id')
-        if not mmat_id:
-            mmat_id = self._generate_incremental_id(MMAT_PREFIX, self.data_access.get_last_mmat_id)
-
-        # 3. Version UUID
+        # 2. Version UUID
         doc_uid = str(uuid.uuid4())
 
         status = "Submitted - Unverified" if is_submit else "Draft"
         
-        # 4. Prepare Data
+        # 3. Prepare Data
         clean_data = self._prepare_version_data(request_data)
-        
-        # INJECT the generated Human ID into the data payload so it saves to material_versions
-        clean_data['master_material_id'] = mmat_id 
 
-        # 5. DB Calls
-        self.data_access.create_master_record(doc_id, email, now)
-        
-        self.data_access.create_version_record(
-            doc_uid=doc_uid,
-            doc_id=doc_id,
-            ver_num=1,
-            status=status,
-            user=email,
-            now=now,
-            data=clean_data
-        )
+        # 4. DB Calls (one transaction: IDs, master + version commit together or not at all)
+        async with self.data_access.transaction():
+            # ID Generation from the per-prefix counters
+            # A) Document ID (PK) -> vin_doc_0001
+            doc_id = request_data.get('document_id')
+            if not doc_id:
+                doc_id = await self.id_allocator.next_id(DOC_PREFIX, ID_WIDTH)
+            
+            # B) Master Material ID (Human Readable) -> vin_mmat_0001
+            mmat_id = request_data.get('master_material_id')
+            if not mmat_id:
+                mmat_id = await self.id_allocator.next_id(MMAT_PREFIX, ID_WIDTH)
+
+            # INJECT the generated Human ID into the data payload so it saves to material_versions
+            clean_data['master_material_id'] = mmat_id 
+
+            await self.data_access.create_master_record(doc_id, email, now)
+            
+            await self.data_access.create_version_record(
+                doc_uid=doc_uid,
+                doc_id=doc_id,
+                ver_num=1,
+                status=status,
+                user=email,
+                now=now,
+                data=clean_data
+            )
+            await self._reprice([doc_uid])
+            await self._notify_change(doc_id)
+        self._invalidate_cache(doc_id)
 
         return {
             "document_id": doc_id,
@@ -114,32 +119,37 @@ class MaterialService:
     # ------------------------------------------------------------------
     # 2. UPDATE DRAFT
     # ------------------------------------------------------------------
-    def update_draft(self, document_id: str, updates: dict):
-        latest = self.data_access.get_latest_version(document_id)
-        if not latest: raise ValueError(f"Document {document_id} not found")
-        if "Submitted" in latest['status']: raise ValueError(f"Cannot edit submitted status.")
-
-        new_ver = latest['ver_num'] + 1
-        doc_uid = str(uuid.uuid4())
-        email, name = self._get_current_user_info()
-        now = datetime.now()
-        
-        clean_data = self._prepare_version_data(updates)
-        
-        # PRESERVE the existing master_material_id from previous version
-        # (We don't generate a new one for updates, we keep the old one)
-        if 'master_material_id' not in clean_data or not clean_data['master_material_id']:
-             clean_data['master_material_id'] = latest.get('master_material_id')
-
-        self.data_access.create_version_record(
-            doc_uid=doc_uid,
-            doc_id=document_id,
-            ver_num=new_ver,
-            status="Draft",
-            user=email,
-            now=now,
-            data=clean_data
-        )
+    async def update_draft(self, document_id: str, updates: dict):
+        async with self.data_access.transaction():
+            await self.data_access.lock_master_record(document_id)
+            latest = await self.data_access.get_latest_version(document_id)
+            if not latest: raise ValueError(f"Document {document_id} not found")
+            if "Submitted" in latest['status']: raise ValueError(f"Cannot edit submitted status.")
+
+            new_ver = latest['ver_num'] + 1
+            doc_uid = str(uuid.uuid4())
+            email, name = self._get_current_user_info()
+            now = datetime.now()
+            
+            clean_data = self._prepare_version_data(updates)
+            
+            # PRESERVE the existing master_material_id from previous version
+            # (We don't generate a new one for updates, we keep the old one)
+            if 'master_material_id' not in clean_data or not clean_data['master_material_id']:
+                 clean_data['master_material_id'] = latest.get('master_material_id')
+
+            await self.data_access.create_version_record(
+                doc_uid=doc_uid,
+                doc_id=document_id,
+                ver_num=new_ver,
+                status="Draft",
+                user=email,
+                now=now,
+                data=clean_data
+            )
+            await self._reprice([doc_uid])
+            await self._notify_change(document_id)
+        self._invalidate_cache(document_id)
 
         return {
             "document_id": document_id,
@@ -151,34 +161,39 @@ class MaterialService:
     # ------------------------------------------------------------------
     # 3. SUBMIT / 4. REVISE
     # ------------------------------------------------------------------
-    def submit_version(self, document_id: str, final_updates: dict):
-        return self._create_new_version(document_id, final_updates, "Submitted - Unverified")
+    async def submit_version(self, document_id: str, final_updates: dict):
+        return await self._create_new_version(document_id, final_updates, "Submitted - Unverified")
 
-    def create_revision_from_verified(self, document_id: str, updates: dict):
-        return self._create_new_version(document_id, updates, "Submitted - Unverified")
+    async def create_revision_from_verified(self, document_id: str, updates: dict):
+        return await self._create_new_version(document_id, updates, "Submitted - Unverified")
 
-    def _create_new_version(self, doc_id, data, status):
+    async def _create_new_version(self, doc_id, data, status):
         email, name = self._get_current_user_info()
         now = datetime.now()
-        latest = self.data_access.get_latest_version(doc_id)
-        if not latest: raise ValueError("Document not found")
-
-        new_ver = latest['ver_num'] + 1
-        doc_uid = str(uuid.uuid4())
-
-        clean_data = self._prepare_version_data(data)
-        
-        # PRESERVE ID
-        if 'master_material_id' not in clean_data or not clean_data['master_material_id']:
-             clean_data['master_material_id'] = latest.get('master_material_id')
-
-        self.data_access.create_version_record(
-            doc_uid=doc_uid,
-            doc_id=doc_id,
-            ver_num=new_ver,
-            status=status,
-            user=email,
-            now=now,
-            data=clean_data
-        )
+        async with self.data_access.transaction():
+            await self.data_access.lock_master_record(doc_id)
+            latest = await self.data_access.get_latest_version(doc_id)
+            if not latest: raise ValueError("Document not found")
+
+            new_ver = latest['ver_num'] + 1
+            doc_uid = str(uuid.uuid4())
+
+            clean_data = self._prepare_version_data(data)
+            
+            # PRESERVE ID
+            if 'master_material_id' not in clean_data or not clean_data['master_material_id']:
+                 clean_data['master_material_id'] = latest.get('master_material_id')
+
+            await self.data_access.create_version_record(
+                doc_uid=doc_uid,
+                doc_id=doc_id,
+                ver_num=new_ver,
+                status=status,
+                user=email,
+                now=now,
+                data=clean_data
+            )
+            await self._reprice([doc_uid])
+            await self._notify_change(doc_id)
+        self._invalidate_cache(doc_id)
         return {"document_id": doc_id, "version_num": new_ver, "status": status, "message": "Success"}
\ No newline at end of file
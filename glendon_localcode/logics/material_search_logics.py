@@ -0,0 +1,62 @@
+import re
+
+from data_access.material_search_data_access import AsyncMaterialSearchDataAccess
+from logics.material_card_logics import _format_single_card, DEFAULT_STATUSES
+
+# Longer queries are cut: every term is one more index probe
+MAX_SEARCH_TERMS = 10
+
+# Letters / digits only, so nothing reaches to_tsquery as operator syntax.
+# "SUP-13280" -> sup, 13280 (same split as material_search_vector)
+_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+
+def search_terms(text: str) -> list:
+    return _TERM_PATTERN.findall(text.lower())[:MAX_SEARCH_TERMS]
+
+
+def build_tsquery(terms: list, match_all=True) -> str:
+    """
+    to_tsquery() input: every term as a prefix (type-ahead: "twi" finds twill),
+    AND-ed when match_all, otherwise OR-ed
+    """
+    joiner = " & " if match_all else " | "
+    return joiner.join(f"{term}:*" for term in terms)
+
+
+class MaterialSearchService:
+    def __init__(self):
+        self.data_access = AsyncMaterialSearchDataAccess()
+
+    async def _search(self, text, terms, match, statuses, filters, page, page_size):
+        # One extra row tells whether there is a next page
+        return await self.data_access.search(
+            text, build_tsquery(terms, match_all=(match == "all")), statuses, filters,
+            limit=page_size + 1, offset=(page - 1) * page_size, capped=(match == "any")
+        )
+
+    async def search(self, query: str, statuses=None, filters=None, page=1, page_size=20, match=None):
+        """
+        Ranked search over current materials.
+        match=None: every word must match ("heavy cotton twill ABC Textiles"
+        across name + supplier); when that finds nothing, any word may match.
+        The response says which one was used, pass it back for the next pages.
+        """
+        text = query.strip()
+        terms = search_terms(text)
+        result = {"query": text, "items": [], "page": page, "has_more": False, "match": match or "all"}
+        if not terms:
+            return result
+
+        statuses = statuses or DEFAULT_STATUSES
+        rows = await self._search(text, terms, result["match"], statuses, filters, page, page_size)
+        if not rows and match is None and len(terms) > 1:
+            result["match"] = "any"
+            rows = await self._search(text, terms, "any", statuses, filters, page, page_size)
+
+        result["has_more"] = len(rows) > page_size
+        result["items"] = [
+            {**_format_single_card(row), "score": round(row["score"], 4), "exact_match": row["exact_match"]}
+            for row in rows[:page_size]
+        ]
+        return result
@@ -1,35 +1,42 @@
 from typing import List
-from data_access.material_sku_input_data_access import SkuDataAccess
+from data_access.material_sku_input_data_access import AsyncSkuDataAccess
+from logics.id_allocator_logics import AsyncIdAllocator
+
+SKU_PREFIX = "SKU"
+SKU_ID_WIDTH = 3
+
+def map_sku_row(sku) -> dict:
+    """Map DB column 'master_material_document_id' to Schema field 'master_material_id'"""
+    # Create a copy to avoid mutating the original if cached
+    sku_dict = dict(sku)
+    if 'master_material_document_id' in sku_dict:
+        sku_dict['master_material_id'] = sku_dict.pop('master_material_document_id')
+    return sku_dict
 
 class SkuLogics: 
     def __init__(self):
         # 1. Instantiate Data Access
-        self.data_access = SkuDataAccess()
+        self.data_access = AsyncSkuDataAccess()
+        self.id_allocator = AsyncIdAllocator()
 
-    def get_skus_for_material(self, document_id: str) -> List[dict]:
+    async def get_skus_for_material(self, document_id: str) -> List[dict]:
         # 2. Call instance method (self.data_access)
-        skus = self.data_access.get_skus_by_master_id(document_id)
+        skus = await self.data_access.get_skus_by_master_id(document_id)
         return skus
 
-    def create_new_sku(self, request) -> dict:
-        # 1. Generate ID
-        new_sku_id = self._generate_next_sku_id()
+    async def create_new_sku(self, request) -> dict:
+        async with self.data_access.transaction():
+            # 1. Generate ID
+            new_sku_id = await self._generate_next_sku_id()
 
-        # 2. Convert Request to Dict
-        # (request is a Pydantic model)
-        data_dict = request.model_dump()
+            # 2. Convert Request to Dict
+            # (request is a Pydantic model)
+            data_dict = request.model_dump()
 
-        # 3. Save
-        new_row = self.data_access.create_sku(new_sku_id, data_dict)
+            # 3. Save
+            new_row = await self.data_access.create_sku(new_sku_id, data_dict)
         return new_row
 
-    def _generate_next_sku_id(self) -> str:
-        last_id = self.data_access.get_latest_sku_id()
-        
-        if last_id and last_id.startswith("SKU"):
-            try:
-                last_num = int(last_id[3:])
-                return f"SKU{last_num + 1:03d}"
-            except ValueError:
-                return "SKU001"
-        return "SKU001"
\ No newline at end of file
+    async def _generate_next_sku_id(self) -> str:
+        # SKU001, SKU002, ... from the 'SKU' counter
+        return await self.id_allocator.next_id(SKU_PREFIX, SKU_ID_WIDTH)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import all your new controllers
@@ -6,7 +7,21 @@ from controller import (
     material_card_controller, 
     material_detail_controller, 
     material_input_controller,
-    material_sku_input_controller 
+    material_sku_input_controller,
+    fx_rate_controller,
+    material_search_controller
+)
+from data_access.connection_pool import get_pool_stats, get_replica_pool_stats, close_pool
+from data_access.async_connection_pool import (
+    get_async_pool, get_async_pool_stats, get_async_replica_pool_stats, close_async_pool
+)
+from logics.current_materials_logics import CurrentMaterialsService
+from monitoring.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE
+from monitoring.middleware import MetricsMiddleware
+from controller.compression import CompressionMiddleware
+from controller.read_your_writes import ReadYourWritesMiddleware
+from data_access.material_cache import (
+    get_cache_stats, start_invalidation_listener, stop_invalidation_listener
 )
 
 # 1. Initialize the App
@@ -24,15 +39,77 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Replica routing: a session that just wrote keeps reading from the primary
+# (no-op unless DATABASE_REPLICA_URLS is set)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# gzip (or brotli if installed) for responses over COMPRESSION_MINIMUM_SIZE bytes
+app.add_middleware(CompressionMiddleware)
+
+# Request latency per route (exposed on /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # 3. Include Routers
 app.include_router(material_card_controller.router)
 app.include_router(material_detail_controller.router)
 app.include_router(material_input_controller.router)
 app.include_router(material_sku_input_controller.router)
+app.include_router(fx_rate_controller.router)
+app.include_router(material_search_controller.router)
 
 # 4. Root endpoint (Health check)
 @app.get("/")
 def root():
-    return {"status": "System is running", "docs_url": "/docs"}
\ No newline at end of file
+    return {"status": "System is running", "docs_url": "/docs"}
+
+# 5. Connection pool stats (in use, waiting, wait time), replicas included
+@app.get("/db_pool_stats")
+def db_pool_stats():
+    return {
+        "async": get_async_pool_stats(), "sync": get_pool_stats(),
+        "async_replicas": get_async_replica_pool_stats(), "sync_replicas": get_replica_pool_stats(),
+    }
+
+# 6. Current-version cache stats (hits, misses, evictions)
+@app.get("/cache_stats")
+def cache_stats():
+    return get_cache_stats()
+
+# 7. current_materials projection: row counts, drift and lag vs the source tables
+@app.get("/projection_stats")
+async def projection_stats():
+    return await CurrentMaterialsService().stats()
+
+# 8. Prometheus scrape endpoint: request latency, serialization time, query timings,
+# rows returned, connections opened. SLOW_QUERY_LOG_MS=<ms> also prints slow queries.
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+# 9. Readiness (load balancer / compose healthcheck): 503 until this worker's
+# asyncpg pool can reach the database. "/" above only says the process is up.
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    try:
+        pool = await get_async_pool()
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+    except Exception as e:
+        return JSONResponse({"status": "unavailable", "detail": str(e)}, status_code=503)
+    return {"status": "ready"}
+
+@app.on_event("startup")
+async def startup():
+    # Open the asyncpg pool up front so the first requests don't pay for it
+    await get_async_pool()
+    # No-op unless MATERIAL_CACHE_NOTIFY=1
+    await start_invalidation_listener()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_invalidation_listener()
+    await close_async_pool()
+    close_pool()
\ No newline at end of file
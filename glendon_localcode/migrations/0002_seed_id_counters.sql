@@ -0,0 +1,12 @@
+-- 0002: Start each ID counter after the highest ID already stored (safe to re-run).
+INSERT INTO id_counters (prefix, last_value)
+SELECT 'vin_doc_', COALESCE(MAX(SUBSTRING(document_id FROM 9)::BIGINT), 0)
+FROM master_materials WHERE document_id ~ '^vin_doc_[0-9]+$'
+UNION ALL
+SELECT 'vin_mmat_', COALESCE(MAX(SUBSTRING(master_material_id FROM 10)::BIGINT), 0)
+FROM material_versions WHERE master_material_id ~ '^vin_mmat_[0-9]+$'
+UNION ALL
+SELECT 'SKU', COALESCE(MAX(SUBSTRING(id FROM 4)::BIGINT), 0)
+FROM material_skus WHERE id ~ '^SKU[0-9]+$'
+ON CONFLICT (prefix) DO UPDATE
+SET last_value = GREATEST(id_counters.last_value, EXCLUDED.last_value);
@@ -0,0 +1,27 @@
+-- migrate:no-transaction
+-- 0003: Indexes for the hot read paths, built online so writes are not blocked.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction, hence the marker above.
+
+-- Card list: keyset pagination on (created_at, document_id) + filters
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_master_materials_created_at_document_id
+    ON master_materials (created_at, document_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_status
+    ON material_versions (status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_material_type
+    ON material_versions (material_type);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_supplier_name
+    ON material_versions (supplier_name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_supplier_name_lower
+    ON material_versions (lower(supplier_name) text_pattern_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_country_of_origin
+    ON material_versions (country_of_origin);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_original_cost
+    ON material_versions (original_cost_per_unit);
+
+-- Human-readable ID lookups (vin_mmat_...)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_master_material_id
+    ON material_versions (master_material_id);
+
+-- SKU tab: SKUs of one material (FK columns are not indexed automatically)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_skus_master_document_id
+    ON material_skus (master_material_document_id);
@@ -0,0 +1,8 @@
+-- 0004: One-off trim of the denormalized history arrays on master_materials.
+-- History is served from material_versions (see VERSION_HISTORY_MODE), so the
+-- arrays only cost TOAST rewrites on every version write. Autovacuum reclaims the space.
+UPDATE master_materials
+SET version_history = '[]'::jsonb,
+    version_history_uid = '[]'::jsonb
+WHERE version_history IS DISTINCT FROM '[]'::jsonb
+   OR version_history_uid IS DISTINCT FROM '[]'::jsonb;
@@ -0,0 +1,19 @@
+-- 0005: Exchange rates with effective dates, and the current version's cost
+-- converted to the reporting currency (filled by the repricing job / on write).
+
+CREATE TABLE IF NOT EXISTS fx_rates (
+    base_currency TEXT NOT NULL,       -- e.g. 'VND'
+    quote_currency TEXT NOT NULL,      -- e.g. 'USD' (1 base = rate quote)
+    effective_date DATE NOT NULL,      -- valid from this day until the next entry
+    rate NUMERIC(20, 10) NOT NULL CHECK (rate > 0),
+    created_at TIMESTAMP DEFAULT now(),
+    created_by TEXT,
+    PRIMARY KEY (base_currency, quote_currency, effective_date)
+);
+
+-- Adding nullable columns without a default is a catalog-only change
+ALTER TABLE material_versions ADD COLUMN IF NOT EXISTS reporting_currency TEXT;
+ALTER TABLE material_versions ADD COLUMN IF NOT EXISTS reporting_cost_per_unit REAL;
+ALTER TABLE material_versions ADD COLUMN IF NOT EXISTS reporting_landed_cost_per_unit REAL;
+ALTER TABLE material_versions ADD COLUMN IF NOT EXISTS fx_rate NUMERIC(20, 10);
+ALTER TABLE material_versions ADD COLUMN IF NOT EXISTS fx_rate_date DATE;
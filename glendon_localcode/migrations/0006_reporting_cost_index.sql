@@ -0,0 +1,5 @@
+-- migrate:no-transaction
+-- 0006: Card list sorting / filtering on the reporting-currency cost (keyset on cost, document_id)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_material_versions_reporting_cost
+    ON material_versions (reporting_cost_per_unit, document_id);
@@ -0,0 +1,308 @@
+-- 0007: current_materials, a trigger-maintained projection of each document's
+-- current version with only the columns the card list, detail and export read.
+-- Listing becomes a single-table index scan instead of the master/version join.
+--
+-- Triggers are statement-level with transition tables, so a bulk COPY or a
+-- repricing UPDATE refreshes all its documents in one set-based upsert, inside
+-- the writing transaction (readers never see the projection behind the source).
+--
+-- Adding a column here: extend the view, the table and the upsert below.
+
+-- --- 1. Source: what the projection must equal ---
+CREATE OR REPLACE VIEW current_materials_source AS
+SELECT
+    m.document_id,
+    v.document_uid,
+    v.ver_num,
+    v.status,
+
+    -- Header
+    v.master_material_id,
+    v.ref_id,
+    v.material_name,
+    v.material_type,
+    v.supplier_name,
+    v.country_of_origin,
+    v.estimated_logistics_lead_time,
+
+    -- Media
+    v.qr_id,
+    v.hanger_pdf_id,
+    v.picture_id,
+
+    -- Version audit
+    v.created_at,
+    v.created_by,
+    v.submitted_at,
+
+    -- Technical
+    v.unit_of_measurement,
+    v.fabric_composition,
+    v.generic_material_composition,
+    v.fabric_roll_width,
+    v.fabric_cut_width,
+    v.fabric_cut_width_no_shrinkage,
+    v.weight_per_unit,
+    v.weight_uom,
+    v.generic_material_size,
+    v.weft_shrinkage,
+    v.werp_shrinkage,
+
+    -- Cost
+    v.original_cost_per_unit,
+    v.native_cost_currency,
+    v.supplier_selling_tolerance,
+    v.refundable_tolerance,
+    v.effective_cost_per_unit,
+    v.vietnam_vat_rate,
+    v.refundable_vat,
+    v.import_duty,
+    v.refundable_import_duty,
+    v.shipping_term,
+    v.logistics_rate,
+    v.logistics_fee_per_unit,
+    v.landed_cost_per_unit,
+    v.reporting_currency,
+    v.reporting_cost_per_unit,
+    v.reporting_landed_cost_per_unit,
+
+    -- Folder audit
+    m.created_at AS master_created_at,
+    m.created_by AS master_created_by,
+    m.submitted_at AS master_submitted_at,
+    m.last_verified_date,
+    m.last_verified_by
+FROM master_materials m
+JOIN material_versions v
+  ON m.document_id = v.document_id
+  AND m.current_version = v.ver_num;
+
+-- --- 2. The projection (same columns + when the row was last written) ---
+CREATE TABLE IF NOT EXISTS current_materials (
+    document_id TEXT PRIMARY KEY,
+    document_uid TEXT,
+    ver_num INT,
+    status TEXT,
+
+    master_material_id TEXT,
+    ref_id TEXT,
+    material_name TEXT,
+    material_type TEXT,
+    supplier_name TEXT,
+    country_of_origin TEXT,
+    estimated_logistics_lead_time INT,
+
+    qr_id TEXT,
+    hanger_pdf_id TEXT,
+    picture_id TEXT,
+
+    created_at TIMESTAMP,
+    created_by TEXT,
+    submitted_at TIMESTAMP,
+
+    unit_of_measurement TEXT,
+    fabric_composition JSONB,
+    generic_material_composition TEXT,
+    fabric_roll_width REAL,
+    fabric_cut_width REAL,
+    fabric_cut_width_no_shrinkage REAL,
+    weight_per_unit REAL,
+    weight_uom TEXT,
+    generic_material_size TEXT,
+    weft_shrinkage REAL,
+    werp_shrinkage REAL,
+
+    original_cost_per_unit REAL,
+    native_cost_currency TEXT,
+    supplier_selling_tolerance REAL,
+    refundable_tolerance BOOLEAN,
+    effective_cost_per_unit REAL,
+    vietnam_vat_rate TEXT,
+    refundable_vat BOOLEAN,
+    import_duty REAL,
+    refundable_import_duty BOOLEAN,
+    shipping_term TEXT,
+    logistics_rate REAL,
+    logistics_fee_per_unit REAL,
+    landed_cost_per_unit REAL,
+    reporting_currency TEXT,
+    reporting_cost_per_unit REAL,
+    reporting_landed_cost_per_unit REAL,
+
+    master_created_at TIMESTAMP,
+    master_created_by TEXT,
+    master_submitted_at TIMESTAMP,
+    last_verified_date TIMESTAMP,
+    last_verified_by TEXT,
+
+    projected_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+-- Card list: keyset on (master_created_at, document_id) / reporting cost, + filters
+CREATE INDEX IF NOT EXISTS idx_current_materials_created_at_document_id
+    ON current_materials (master_created_at, document_id);
+CREATE INDEX IF NOT EXISTS idx_current_materials_reporting_cost
+    ON current_materials (reporting_cost_per_unit, document_id);
+CREATE INDEX IF NOT EXISTS idx_current_materials_status
+    ON current_materials (status);
+CREATE INDEX IF NOT EXISTS idx_current_materials_material_type
+    ON current_materials (material_type);
+CREATE INDEX IF NOT EXISTS idx_current_materials_supplier_name_lower
+    ON current_materials (lower(supplier_name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_current_materials_country_of_origin
+    ON current_materials (country_of_origin);
+CREATE INDEX IF NOT EXISTS idx_current_materials_original_cost
+    ON current_materials (original_cost_per_unit);
+
+-- --- 3. Refresh: re-project the given documents, returns rows written ---
+CREATE OR REPLACE FUNCTION refresh_current_materials(ids TEXT[]) RETURNS INT AS $$
+DECLARE
+    written INT;
+BEGIN
+    -- Documents without a current version any more
+    DELETE FROM current_materials c
+    WHERE c.document_id = ANY(ids)
+      AND NOT EXISTS (SELECT 1 FROM current_materials_source s WHERE s.document_id = c.document_id);
+
+    -- Upsert, not delete + insert: two writers refreshing one document must not collide
+    INSERT INTO current_materials (
+        document_id, document_uid, ver_num, status,
+        master_material_id, ref_id, material_name, material_type, supplier_name,
+        country_of_origin, estimated_logistics_lead_time,
+        qr_id, hanger_pdf_id, picture_id,
+        created_at, created_by, submitted_at,
+        unit_of_measurement, fabric_composition, generic_material_composition,
+        fabric_roll_width, fabric_cut_width, fabric_cut_width_no_shrinkage,
+        weight_per_unit, weight_uom, generic_material_size, weft_shrinkage, werp_shrinkage,
+        original_cost_per_unit, native_cost_currency, supplier_selling_tolerance,
+        refundable_tolerance, effective_cost_per_unit, vietnam_vat_rate, refundable_vat,
+        import_duty, refundable_import_duty, shipping_term, logistics_rate,
+        logistics_fee_per_unit, landed_cost_per_unit,
+        reporting_currency, reporting_cost_per_unit, reporting_landed_cost_per_unit,
+        master_created_at, master_created_by, master_submitted_at,
+        last_verified_date, last_verified_by
+    )
+    SELECT s.* FROM current_materials_source s
+    WHERE s.document_id = ANY(ids)
+    ON CONFLICT (document_id) DO UPDATE SET
+        document_uid = EXCLUDED.document_uid,
+        ver_num = EXCLUDED.ver_num,
+        status = EXCLUDED.status,
+        master_material_id = EXCLUDED.master_material_id,
+        ref_id = EXCLUDED.ref_id,
+        material_name = EXCLUDED.material_name,
+        material_type = EXCLUDED.material_type,
+        supplier_name = EXCLUDED.supplier_name,
+        country_of_origin = EXCLUDED.country_of_origin,
+        estimated_logistics_lead_time = EXCLUDED.estimated_logistics_lead_time,
+        qr_id = EXCLUDED.qr_id,
+        hanger_pdf_id = EXCLUDED.hanger_pdf_id,
+        picture_id = EXCLUDED.picture_id,
+        created_at = EXCLUDED.created_at,
+        created_by = EXCLUDED.created_by,
+        submitted_at = EXCLUDED.submitted_at,
+        unit_of_measurement = EXCLUDED.unit_of_measurement,
+        fabric_composition = EXCLUDED.fabric_composition,
+        generic_material_composition = EXCLUDED.generic_material_composition,
+        fabric_roll_width = EXCLUDED.fabric_roll_width,
+        fabric_cut_width = EXCLUDED.fabric_cut_width,
+        fabric_cut_width_no_shrinkage = EXCLUDED.fabric_cut_width_no_shrinkage,
+        weight_per_unit = EXCLUDED.weight_per_unit,
+        weight_uom = EXCLUDED.weight_uom,
+        generic_material_size = EXCLUDED.generic_material_size,
+        weft_shrinkage = EXCLUDED.weft_shrinkage,
+        werp_shrinkage = EXCLUDED.werp_shrinkage,
+        original_cost_per_unit = EXCLUDED.original_cost_per_unit,
+        native_cost_currency = EXCLUDED.native_cost_currency,
+        supplier_selling_tolerance = EXCLUDED.supplier_selling_tolerance,
+        refundable_tolerance = EXCLUDED.refundable_tolerance,
+        effective_cost_per_unit = EXCLUDED.effective_cost_per_unit,
+        vietnam_vat_rate = EXCLUDED.vietnam_vat_rate,
+        refundable_vat = EXCLUDED.refundable_vat,
+        import_duty = EXCLUDED.import_duty,
+        refundable_import_duty = EXCLUDED.refundable_import_duty,
+        shipping_term = EXCLUDED.shipping_term,
+        logistics_rate = EXCLUDED.logistics_rate,
+        logistics_fee_per_unit = EXCLUDED.logistics_fee_per_unit,
+        landed_cost_per_unit = EXCLUDED.landed_cost_per_unit,
+        reporting_currency = EXCLUDED.reporting_currency,
+        reporting_cost_per_unit = EXCLUDED.reporting_cost_per_unit,
+        reporting_landed_cost_per_unit = EXCLUDED.reporting_landed_cost_per_unit,
+        master_created_at = EXCLUDED.master_created_at,
+        master_created_by = EXCLUDED.master_created_by,
+        master_submitted_at = EXCLUDED.master_submitted_at,
+        last_verified_date = EXCLUDED.last_verified_date,
+        last_verified_by = EXCLUDED.last_verified_by,
+        projected_at = clock_timestamp()
+    -- Skip documents whose projected columns did not change (e.g. a non-current version was updated)
+    WHERE (to_jsonb(current_materials) - 'projected_at') IS DISTINCT FROM to_jsonb(EXCLUDED) - 'projected_at';
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- --- 4. Triggers (one per event: transition tables allow a single event each) ---
+CREATE OR REPLACE FUNCTION current_materials_refresh_new() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_current_materials(ARRAY(SELECT DISTINCT document_id FROM new_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION current_materials_refresh_old() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_current_materials(ARRAY(SELECT DISTINCT document_id FROM old_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION current_materials_truncate() RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE current_materials;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS current_materials_master_insert ON master_materials;
+CREATE TRIGGER current_materials_master_insert
+    AFTER INSERT ON master_materials REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_refresh_new();
+
+DROP TRIGGER IF EXISTS current_materials_master_update ON master_materials;
+CREATE TRIGGER current_materials_master_update
+    AFTER UPDATE ON master_materials REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_refresh_new();
+
+DROP TRIGGER IF EXISTS current_materials_master_delete ON master_materials;
+CREATE TRIGGER current_materials_master_delete
+    AFTER DELETE ON master_materials REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_refresh_old();
+
+DROP TRIGGER IF EXISTS current_materials_master_truncate ON master_materials;
+CREATE TRIGGER current_materials_master_truncate
+    AFTER TRUNCATE ON master_materials
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_truncate();
+
+DROP TRIGGER IF EXISTS current_materials_version_insert ON material_versions;
+CREATE TRIGGER current_materials_version_insert
+    AFTER INSERT ON material_versions REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_refresh_new();
+
+DROP TRIGGER IF EXISTS current_materials_version_update ON material_versions;
+CREATE TRIGGER current_materials_version_update
+    AFTER UPDATE ON material_versions REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_refresh_new();
+
+DROP TRIGGER IF EXISTS current_materials_version_delete ON material_versions;
+CREATE TRIGGER current_materials_version_delete
+    AFTER DELETE ON material_versions REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_refresh_old();
+
+DROP TRIGGER IF EXISTS current_materials_version_truncate ON material_versions;
+CREATE TRIGGER current_materials_version_truncate
+    AFTER TRUNCATE ON material_versions
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_truncate();
+
+-- --- 5. Initial fill (triggers already hold their table locks, so no write slips in between) ---
+SELECT refresh_current_materials(ARRAY(SELECT document_id FROM master_materials));
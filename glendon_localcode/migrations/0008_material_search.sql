@@ -0,0 +1,34 @@
+-- 0008: Search document for /materials/search, and pg_trgm for fuzzy matching.
+-- pg_trgm ships with the standard Postgres images (contrib); where it is not
+-- available the search runs full-text only and 0010 waits until it is.
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    ELSE
+        RAISE WARNING 'pg_trgm is not available: material search will not be fuzzy';
+    END IF;
+END
+$$;
+
+-- Weighted search vector over the current_materials columns people type:
+-- names and IDs rank above supplier, supplier above type. IDs are split on
+-- punctuation ("SUP-13280" -> sup, 13280) and use the 'simple' config so codes
+-- are not stemmed.
+CREATE OR REPLACE FUNCTION material_search_vector(
+    name TEXT, supplier TEXT, ref TEXT, mmat TEXT, mtype TEXT
+) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', regexp_replace(coalesce(ref, '') || ' ' || coalesce(mmat, ''), '[^[:alnum:]]+', ' ', 'g')), 'A')
+        || setweight(to_tsvector('english', coalesce(supplier, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(mtype, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Stored, not an expression index: ranking reads the vector of every match,
+-- and recomputing to_tsvector per row is what makes broad queries slow.
+-- Adding it rewrites current_materials once (reads wait for a few seconds).
+ALTER TABLE current_materials ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        material_search_vector(material_name, supplier_name, ref_id, master_material_id, material_type)
+    ) STORED;
@@ -0,0 +1,5 @@
+-- migrate:no-transaction
+-- 0009: Full-text index for /materials/search
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_current_materials_search
+    ON current_materials USING gin (search_vector);
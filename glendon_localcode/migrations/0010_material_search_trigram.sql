@@ -0,0 +1,13 @@
+-- migrate:no-transaction
+-- migrate:requires-extension pg_trgm
+-- 0010: Trigram indexes for fuzzy search (typos, partial codes).
+-- Skipped by the runner until pg_trgm is installed (see 0008).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_current_materials_name_trgm
+    ON current_materials USING gin (material_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_current_materials_supplier_trgm
+    ON current_materials USING gin (supplier_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_current_materials_ref_id_trgm
+    ON current_materials USING gin (ref_id gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_current_materials_master_material_id_trgm
+    ON current_materials USING gin (master_material_id gin_trgm_ops);
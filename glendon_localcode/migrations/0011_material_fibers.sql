@@ -0,0 +1,104 @@
+-- 0011: Fiber composition of current materials as rows, for percentage-range filters
+-- ("≥ 60% cotton and ≤ 5% elastane") answered from a btree on (fiber, percentage).
+-- fabric_composition keeps whatever shape was written; this table is derived from
+-- it by trigger on every current_materials write.
+
+-- Both stored shapes -> (fiber, percentage) rows:
+--   [[50, "Cotton"], ...]  and  [{"name": "Cotton", "percentage": 50}, ...] ("pct" also accepted)
+-- Fiber names are lower-cased and trimmed; a fiber listed twice is summed.
+-- Entries without a name or a numeric percentage are ignored.
+CREATE OR REPLACE FUNCTION composition_fibers(comp JSONB)
+RETURNS TABLE (fiber TEXT, percentage REAL) AS $$
+    SELECT lower(btrim(x.name)), sum(x.pct::real)
+    FROM (
+        SELECT
+            CASE jsonb_typeof(e) WHEN 'array' THEN e->>1 WHEN 'object' THEN e->>'name' END AS name,
+            CASE jsonb_typeof(e)
+                WHEN 'array' THEN e->>0
+                WHEN 'object' THEN coalesce(e->>'percentage', e->>'pct')
+            END AS pct
+        FROM jsonb_array_elements(CASE WHEN jsonb_typeof(comp) = 'array' THEN comp ELSE '[]'::jsonb END) e
+    ) x
+    WHERE btrim(coalesce(x.name, '')) <> ''
+      AND x.pct ~ '^\s*[0-9]+(\.[0-9]+)?\s*$'
+    GROUP BY 1
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE TABLE IF NOT EXISTS current_material_fibers (
+    document_id TEXT NOT NULL,   -- current_materials.document_id
+    fiber TEXT NOT NULL,         -- e.g. 'cotton'
+    percentage REAL NOT NULL,
+    PRIMARY KEY (document_id, fiber)
+);
+
+-- Range filters: fiber = ? AND percentage BETWEEN ? AND ? (index-only for the document_ids)
+CREATE INDEX IF NOT EXISTS idx_current_material_fibers_fiber_percentage
+    ON current_material_fibers (fiber, percentage, document_id);
+
+CREATE OR REPLACE FUNCTION refresh_material_fibers(ids TEXT[]) RETURNS VOID AS $$
+BEGIN
+    DELETE FROM current_material_fibers WHERE document_id = ANY(ids);
+    INSERT INTO current_material_fibers (document_id, fiber, percentage)
+    SELECT c.document_id, f.fiber, f.percentage
+    FROM current_materials c
+    CROSS JOIN LATERAL composition_fibers(c.fabric_composition) f
+    WHERE c.document_id = ANY(ids);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION material_fibers_on_insert() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_material_fibers(ARRAY(SELECT document_id FROM new_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only documents whose composition actually changed (reprices, status changes... skip)
+CREATE OR REPLACE FUNCTION material_fibers_on_update() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_material_fibers(ARRAY(
+        SELECT n.document_id
+        FROM new_rows n
+        JOIN old_rows o ON o.document_id = n.document_id
+        WHERE n.fabric_composition IS DISTINCT FROM o.fabric_composition
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION material_fibers_on_delete() RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM current_material_fibers WHERE document_id = ANY(ARRAY(SELECT document_id FROM old_rows));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION material_fibers_on_truncate() RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE current_material_fibers;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS material_fibers_insert ON current_materials;
+CREATE TRIGGER material_fibers_insert
+    AFTER INSERT ON current_materials REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION material_fibers_on_insert();
+
+DROP TRIGGER IF EXISTS material_fibers_update ON current_materials;
+CREATE TRIGGER material_fibers_update
+    AFTER UPDATE ON current_materials REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION material_fibers_on_update();
+
+DROP TRIGGER IF EXISTS material_fibers_delete ON current_materials;
+CREATE TRIGGER material_fibers_delete
+    AFTER DELETE ON current_materials REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION material_fibers_on_delete();
+
+DROP TRIGGER IF EXISTS material_fibers_truncate ON current_materials;
+CREATE TRIGGER material_fibers_truncate
+    AFTER TRUNCATE ON current_materials
+    FOR EACH STATEMENT EXECUTE FUNCTION material_fibers_on_truncate();
+
+-- Initial fill
+SELECT refresh_material_fibers(ARRAY(SELECT document_id FROM current_materials));
@@ -0,0 +1,40 @@
+-- 0012: List-level version stamp for conditional GETs (ETag / If-None-Match on the card list).
+-- current_materials_version_seq moves once per transaction that wrote to current_materials.
+-- Sequences are not transactional, so the bump happens at COMMIT (deferred constraint
+-- trigger): readers never see the new stamp while the data behind it is still invisible.
+-- Reading it is a single-row lookup: SELECT last_value FROM current_materials_version_seq.
+
+CREATE SEQUENCE IF NOT EXISTS current_materials_version_seq;
+
+-- One row per writing transaction until it commits (keyed by xid: no contention between writers)
+CREATE TABLE IF NOT EXISTS current_materials_pending_bump (
+    xid BIGINT PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION current_materials_mark_changed() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO current_materials_pending_bump (xid) VALUES (txid_current()) ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION current_materials_bump_version() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM nextval('current_materials_version_seq');
+    DELETE FROM current_materials_pending_bump WHERE xid = NEW.xid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS current_materials_mark_changed ON current_materials;
+CREATE TRIGGER current_materials_mark_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON current_materials
+    FOR EACH STATEMENT EXECUTE FUNCTION current_materials_mark_changed();
+
+DROP TRIGGER IF EXISTS current_materials_bump_version ON current_materials_pending_bump;
+CREATE CONSTRAINT TRIGGER current_materials_bump_version
+    AFTER INSERT ON current_materials_pending_bump
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION current_materials_bump_version();
+
+SELECT nextval('current_materials_version_seq');
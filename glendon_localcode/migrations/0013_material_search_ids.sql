@@ -0,0 +1,36 @@
+-- 0013: Exact ID lookups and document_id in the search vector for /materials/search.
+-- Exact document_id / master_material_id / ref_id hits are fetched by equality
+-- (case-insensitive), apart from the ranked candidates, so they are never cut
+-- by SEARCH_RANK_LIMIT.
+
+CREATE INDEX IF NOT EXISTS idx_current_materials_document_id_lower
+    ON current_materials (lower(document_id));
+CREATE INDEX IF NOT EXISTS idx_current_materials_master_material_id_lower
+    ON current_materials (lower(master_material_id));
+CREATE INDEX IF NOT EXISTS idx_current_materials_ref_id_lower
+    ON current_materials (lower(ref_id));
+
+-- Same vector as 0008 plus the document ID ("vin_doc_0001" -> vin, doc, 0001),
+-- so partial IDs ("doc 0001") match too.
+CREATE OR REPLACE FUNCTION material_search_vector(
+    name TEXT, supplier TEXT, ref TEXT, mmat TEXT, mtype TEXT, doc TEXT
+) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', regexp_replace(
+               coalesce(ref, '') || ' ' || coalesce(mmat, '') || ' ' || coalesce(doc, ''),
+               '[^[:alnum:]]+', ' ', 'g')), 'A')
+        || setweight(to_tsvector('english', coalesce(supplier, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(mtype, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- A generated column's expression cannot be altered: drop it (and its 0009
+-- GIN index) and add it back. Rewrites current_materials once.
+ALTER TABLE current_materials DROP COLUMN IF EXISTS search_vector;
+ALTER TABLE current_materials ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        material_search_vector(material_name, supplier_name, ref_id, master_material_id, material_type, document_id)
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_current_materials_search
+    ON current_materials USING gin (search_vector);
+
+DROP FUNCTION IF EXISTS material_search_vector(TEXT, TEXT, TEXT, TEXT, TEXT);
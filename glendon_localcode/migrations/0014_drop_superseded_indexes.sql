@@ -0,0 +1,20 @@
+-- migrate:no-transaction
+-- 0014: Drop the 0003 / 0006 read-path indexes that current_materials (0007) replaced.
+-- Every card list, filter, sort, search and export query now reads the
+-- projection, which has its own copies of these indexes. On the source tables
+-- they only cost writes: each version insert and each reprice UPDATE
+-- (reporting_cost_per_unit) maintained them.
+-- Kept: idx_material_skus_master_document_id (SKUS_BY_MASTER_QUERY) and the
+-- UNIQUE (document_id, ver_num) constraint index (history, latest version).
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_master_materials_created_at_document_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_material_type;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_supplier_name;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_supplier_name_lower;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_country_of_origin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_original_cost;
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_reporting_cost;
+-- No query looks versions up by master_material_id any more (search uses
+-- idx_current_materials_master_material_id_lower, 0013)
+DROP INDEX CONCURRENTLY IF EXISTS idx_material_versions_master_material_id;
@@ -0,0 +1,29 @@
+-- 0015: Transactional list version stamp (replaces the 0012 sequence).
+-- 0012 bumped a sequence at COMMIT, but sequences are not transactional: the
+-- new value was visible to other sessions before the writing transaction
+-- finished committing, so a reader could store the old list under the new ETag.
+-- The stamp is now a row updated by the writing transaction itself, visible
+-- exactly when its data is. The card list reads it and the rows in one snapshot.
+
+CREATE TABLE IF NOT EXISTS current_materials_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),  -- Single row
+    version BIGINT NOT NULL
+);
+
+-- Continue from the sequence so no stamp handed out before is reused
+INSERT INTO current_materials_version (id, version)
+SELECT TRUE, last_value + 1 FROM current_materials_version_seq
+ON CONFLICT (id) DO NOTHING;
+
+-- Still run once per writing transaction, just before it commits (deferred
+-- constraint trigger from 0012): the row lock is held only for the commit itself,
+-- so writers don't queue behind each other's whole transactions.
+CREATE OR REPLACE FUNCTION current_materials_bump_version() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE current_materials_version SET version = version + 1;
+    DELETE FROM current_materials_pending_bump WHERE xid = NEW.xid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP SEQUENCE IF EXISTS current_materials_version_seq;
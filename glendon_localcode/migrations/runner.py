@@ -0,0 +1,195 @@
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+import psycopg2
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+FILE_PATTERN = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+# First line of a migration that must run outside a transaction
+# (e.g. CREATE INDEX CONCURRENTLY). Its statements run one by one in autocommit.
+NO_TRANSACTION_MARKER = "-- migrate:no-transaction"
+
+# Header line naming an extension the migration needs, e.g. "-- migrate:requires-extension pg_trgm".
+# Until it is installed the migration is skipped (and retried on the next run),
+# so only use it for optional, self-contained work such as extra indexes.
+REQUIRES_EXTENSION_PATTERN = re.compile(r"^--\s*migrate:requires-extension\s+(\w+)\s*$", re.MULTILINE)
+
+# Arbitrary constant: only one migration runner at a time across all workers
+ADVISORY_LOCK_ID = 72_410_001
+
+CREATE_SCHEMA_MIGRATIONS = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT,
+    checksum TEXT,
+    applied_at TIMESTAMP DEFAULT now()
+);
+"""
+
+CONCURRENT_INDEX_PATTERN = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+@dataclass
+class Migration:
+    version: str
+    name: str
+    sql: str
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+    @property
+    def required_extensions(self) -> List[str]:
+        return REQUIRES_EXTENSION_PATTERN.findall(self.sql)
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    def statements(self) -> List[str]:
+        """Splits a no-transaction migration into single statements (plain ';' separated SQL)"""
+        stmts = []
+        for chunk in self.sql.split(";"):
+            code = "\n".join(
+                line for line in chunk.splitlines() if not line.strip().startswith("--")
+            ).strip()
+            if code:
+                stmts.append(code)
+        return stmts
+
+def discover_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            migrations.append(Migration(version=match.group(1), name=match.group(2), sql=f.read()))
+    return migrations
+
+def _applied_versions(cur) -> dict:
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cur.fetchall())
+
+def _installed_extensions(cur) -> set:
+    cur.execute("SELECT extname FROM pg_extension")
+    return {row[0] for row in cur.fetchall()}
+
+def _drop_invalid_index(cur, statement: str):
+    """
+    A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind, which
+    IF NOT EXISTS would then silently keep. Drop it so the build is retried.
+    """
+    match = CONCURRENT_INDEX_PATTERN.search(statement)
+    if not match:
+        return
+    index_name = match.group(1)
+    cur.execute(
+        """
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s AND NOT i.indisvalid
+        """,
+        (index_name,),
+    )
+    if cur.fetchone():
+        print(f"   ⚠️ Dropping invalid index {index_name} left by an earlier failed build")
+        cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+def _apply(conn, migration: Migration):
+    if migration.transactional:
+        conn.autocommit = False
+        try:
+            with conn.cursor() as cur:
+                cur.execute(migration.sql)
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+    else:
+        # Each statement must be idempotent (IF NOT EXISTS): a crash half-way
+        # means the whole file is re-run next time
+        with conn.cursor() as cur:
+            for statement in migration.statements():
+                _drop_invalid_index(cur, statement)
+                cur.execute(statement)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (migration.version, migration.name, migration.checksum),
+            )
+
+def run_migrations(dsn: Optional[str] = None, target: Optional[str] = None) -> List[str]:
+    """
+    Applies every pending migration (up to `target` if given) in version order.
+    Returns the versions applied by this call.
+    """
+    dsn = dsn or os.environ.get("DATABASE_URL")
+    if not dsn:
+        raise ValueError("DATABASE_URL is missing")
+
+    applied_now = []
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+            cur.execute(CREATE_SCHEMA_MIGRATIONS)
+            applied = _applied_versions(cur)
+
+        for migration in discover_migrations():
+            if target and migration.version > target:
+                break
+            if migration.version in applied:
+                if applied[migration.version] != migration.checksum:
+                    print(f"⚠️ Migration {migration.version}_{migration.name} changed after it was applied")
+                continue
+
+            # Looked up per migration: an earlier one in this run may have installed it
+            with conn.cursor() as cur:
+                extensions = _installed_extensions(cur)
+            missing = [e for e in migration.required_extensions if e not in extensions]
+            if missing:
+                print(f"⏭️ Skipping {migration.version}_{migration.name}: needs extension {', '.join(missing)}")
+                continue
+
+            print(f"🔨 Applying {migration.version}_{migration.name}...")
+            _apply(conn, migration)
+            applied_now.append(migration.version)
+
+        return applied_now
+    finally:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+        finally:
+            conn.close()
+
+def migration_status(dsn: Optional[str] = None) -> List[dict]:
+    dsn = dsn or os.environ.get("DATABASE_URL")
+    if not dsn:
+        raise ValueError("DATABASE_URL is missing")
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('schema_migrations')")
+            applied = _applied_versions(cur) if cur.fetchone()[0] else {}
+    finally:
+        conn.close()
+
+    return [
+        {"version": m.version, "name": m.name, "applied": m.version in applied}
+        for m in discover_migrations()
+    ]
@@ -0,0 +1,230 @@
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Queries slower than this are printed as slow-query events (0 = off)
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_LOG_MS", 0))
+
+# Seconds; Prometheus' default latency buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+ROW_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}  # label values tuple -> value
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def collect(self):
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # per-bucket counts (last = +Inf), sum
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def collect(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = self.header()
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# --- HTTP (monitoring/middleware.py) ---
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Request latency until the last body byte is sent",
+    ("method", "route", "status"),
+))
+HTTP_IN_PROGRESS = REGISTRY.register(Gauge(
+    "http_requests_in_progress", "Requests being handled", ("method",),
+))
+HTTP_SERIALIZATION_SECONDS = REGISTRY.register(Histogram(
+    "http_serialization_seconds",
+    "Time spent around the endpoint function: request parsing, response validation and encoding",
+    ("route",),
+))
+
+# --- Database (data_access/base.py, async_base.py and the pools) ---
+DB_QUERY_SECONDS = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Query latency by normalized SQL", ("driver", "query"),
+))
+DB_QUERY_ROWS = REGISTRY.register(Histogram(
+    "db_query_rows", "Rows returned per query", ("driver", "query"), buckets=ROW_BUCKETS,
+))
+DB_QUERY_ERRORS = REGISTRY.register(Counter(
+    "db_query_errors", "Queries that raised", ("driver", "query"),
+))
+DB_CONNECTIONS_OPENED = REGISTRY.register(Counter(
+    "db_connections_opened", "New database connections", ("driver",),
+))
+DB_POOL_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "db_pool_wait_seconds", "Time waiting for a pooled connection", ("driver",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+))
+
+
+_WHITESPACE = re.compile(r"\s+")
+_COMMENT = re.compile(r"--[^\n]*")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """One label per statement shape: comments dropped, literals -> ?, whitespace collapsed"""
+    sql = _COMMENT.sub(" ", query)
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryTimer:
+    """Handed out by track_query(); set .rows once the result is known"""
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = None
+
+
+def observe_query(driver: str, sql: str, seconds: float, rows=None):
+    """Records one query already normalized with normalize_sql()"""
+    DB_QUERY_SECONDS.observe(seconds, driver=driver, query=sql)
+    if rows is not None:
+        DB_QUERY_ROWS.observe(rows, driver=driver, query=sql)
+    if SLOW_QUERY_MS and seconds * 1000 >= SLOW_QUERY_MS:
+        shown = "?" if rows is None else rows
+        print(f"🐢 Slow query ({driver}) {seconds * 1000:.1f} ms, {shown} rows: {sql}")
+
+
+@contextmanager
+def track_query(driver: str, query: str):
+    """
+    Times the block as one execution of `query`:
+        with track_query("psycopg2", query) as timer:
+            cur.execute(query, params)
+            timer.rows = cur.rowcount
+    """
+    timer = QueryTimer()
+    sql = normalize_sql(query)
+    start = time.perf_counter()
+    try:
+        yield timer
+    except BaseException:
+        DB_QUERY_ERRORS.inc(driver=driver, query=sql)
+        raise
+    finally:
+        observe_query(driver, sql, time.perf_counter() - start, timer.rows)
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from fastapi.routing import APIRoute
+
+from monitoring.metrics import HTTP_REQUEST_SECONDS, HTTP_IN_PROGRESS, HTTP_SERIALIZATION_SECONDS
+
+# Seconds spent inside the endpoint function of the current request,
+# filled by InstrumentedRoute so the rest can be reported as serialization
+_endpoint_timing = ContextVar("endpoint_timing", default=None)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streamed exports are not
+    buffered): request latency per method / route template / status, timed
+    until the last body chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        start = time.perf_counter()
+        done = False
+
+        def observe():
+            nonlocal done
+            if done:
+                return
+            done = True
+            # Route template ("/material_details/get"), never the raw path: bounded label set
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=method,
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        HTTP_IN_PROGRESS.inc(method=method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            observe()
+            HTTP_IN_PROGRESS.dec(method=method)
+
+
+def _timed_endpoint(endpoint):
+    """Wraps an endpoint (async or sync) to add its run time to _endpoint_timing"""
+    def record(start):
+        timing = _endpoint_timing.get()
+        if timing is not None:
+            timing["endpoint"] += time.perf_counter() - start
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                record(start)
+    else:
+        # Runs in the threadpool with a copy of the context: the dict is shared
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                record(start)
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    Route class for the controllers' APIRouters: times the whole FastAPI
+    handler and the endpoint function separately; the difference (body
+    parsing, validation, response model validation and JSON encoding) is
+    reported as http_serialization_seconds.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def timed_handler(request):
+            timing = {"endpoint": 0.0}
+            token = _endpoint_timing.set(timing)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                _endpoint_timing.reset(token)
+                HTTP_SERIALIZATION_SECONDS.observe(
+                    max(time.perf_counter() - start - timing["endpoint"], 0.0), route=route_path
+                )
+
+        return timed_handler
@@ -0,0 +1,5 @@
+#!/bin/bash
+# Runs once when the primary's data directory is created (docker-entrypoint-initdb.d):
+# lets the standby in docker-compose.replica.yml stream WAL from it.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,57 @@
+import re
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+from datetime import date, datetime
+
+_CURRENCY_CODE = re.compile(r"[A-Z]{3}")
+
+def _normalize_currency(v):
+    # Repricing matches codes exactly against native_cost_currency / REPORTING_CURRENCY (USD, VND, ...)
+    if v is None:
+        return v
+    code = v.strip().upper()
+    if not _CURRENCY_CODE.fullmatch(code):
+        raise ValueError(f"'{v}' is not a three-letter currency code")
+    return code
+
+class FxRate(BaseModel):
+    """1 base_currency = rate quote_currency, from effective_date on"""
+    base_currency: str = Field(..., description="Currency being converted, e.g. VND")
+    quote_currency: str = Field(..., description="Target currency, e.g. USD")
+    effective_date: date
+    rate: float = Field(..., gt=0)
+
+    @field_validator('base_currency', 'quote_currency')
+    @classmethod
+    def normalize_codes(cls, v):
+        return _normalize_currency(v)
+
+class FxRateResponse(FxRate):
+    created_at: Optional[datetime] = None
+    created_by: Optional[str] = None
+
+class UpsertFxRatesRequest(BaseModel):
+    """Saves rates; a rate for an existing pair and date replaces it"""
+    rates: List[FxRate] = Field(..., min_length=1)
+    reprice: bool = Field(True, description="Reprice current versions in the same transaction")
+
+class ListFxRatesRequest(BaseModel):
+    quote_currency: Optional[str] = Field(None, description="Defaults to the reporting currency")
+
+    @field_validator('quote_currency')
+    @classmethod
+    def normalize_code(cls, v):
+        return _normalize_currency(v)
+
+class RepriceRequest(BaseModel):
+    as_of: Optional[date] = Field(None, description="Use the rates effective on this date (default: today)")
+
+class RepriceResponse(BaseModel):
+    reporting_currency: str
+    as_of: date
+    repriced: int = Field(..., description="Current versions whose converted cost changed")
+    missing_currencies: List[str] = Field(..., description="Currencies in use with no rate yet (converted cost left empty)")
+
+class UpsertFxRatesResponse(BaseModel):
+    saved: int
+    reprice: Optional[RepriceResponse] = None
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, List, Any
-from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Literal
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 class MaterialCard(BaseModel):
   document_id: str
@@ -14,14 +14,64 @@ class MaterialCard(BaseModel):
   weight: Optional[str] # Combined value + UOM
   supplier_name: Optional[str]
   cost_per_unit: Optional[str] # Formatted currency string
+  reporting_cost: Optional[str] = None # Same cost in the reporting currency, e.g. "1.23 USD"
   
   verification_status: Optional[str]
   ver_num: int
   picture_id: Optional[str]
 
+class FiberFilter(BaseModel):
+  """Percentage range for one fiber of fabric_composition; a missing fiber counts as 0%"""
+  fiber: str = Field(..., min_length=1, example="Cotton")
+  min_pct: Optional[float] = Field(None, ge=0, le=100, example=60)
+  max_pct: Optional[float] = Field(None, ge=0, le=100)
+
+  @field_validator('fiber')
+  @classmethod
+  def normalize_fiber(cls, v):
+    # Stored fiber names are lower-cased and trimmed (migration 0011)
+    return v.strip().lower()
+
+  @model_validator(mode='after')
+  def check_range(self):
+    if self.min_pct is None and self.max_pct is None:
+      raise ValueError("Give min_pct and/or max_pct")
+    if self.min_pct is not None and self.max_pct is not None and self.min_pct > self.max_pct:
+      raise ValueError("min_pct is greater than max_pct")
+    return self
+
 class ListMaterialCardsRequest(BaseModel):
   statuses: Optional[List[str]] = Field(
     None, 
     description="List of statuses to include. Defaults to active statuses if empty.",
     example=["Draft", "Submitted - Verified"]
-  )
\ No newline at end of file
+  )
+  # --- Optional filters (applied in SQL) ---
+  material_type: Optional[str] = Field(None, description="Exact material type, e.g. 'Main Fabric'")
+  supplier_name: Optional[str] = Field(None, description="Case-insensitive supplier name prefix")
+  country_of_origin: Optional[str] = None
+  min_cost: Optional[float] = Field(None, ge=0, description="Minimum original_cost_per_unit")
+  max_cost: Optional[float] = Field(None, ge=0, description="Maximum original_cost_per_unit")
+  min_reporting_cost: Optional[float] = Field(None, ge=0, description="Minimum cost in the reporting currency")
+  max_reporting_cost: Optional[float] = Field(None, ge=0, description="Maximum cost in the reporting currency")
+  fibers: Optional[List[FiberFilter]] = Field(
+    None, max_length=5, description="All must hold, e.g. >= 60% cotton and <= 5% elastane"
+  )
+
+class MaterialCardPageRequest(ListMaterialCardsRequest):
+  page_size: int = Field(50, ge=1, le=500)
+  cursor: Optional[str] = Field(None, description="next_cursor from the previous page; omit for the first page")
+  sort_by: Literal["newest", "reporting_cost_asc", "reporting_cost_desc"] = Field(
+    "newest", description="Cost sorts only include materials with a converted cost"
+  )
+
+class MaterialCardPage(BaseModel):
+  items: List[MaterialCard]
+  next_cursor: Optional[str] = None # None when this is the last page
+
+class MaterialExportRequest(ListMaterialCardsRequest):
+  format: Literal["csv", "jsonl", "parquet"] = "csv"
+
+class ProjectionRebuildResponse(BaseModel):
+  refreshed: int = Field(..., description="Projection rows written (unchanged rows are skipped)")
+  removed: int = Field(..., description="Rows of documents that no longer exist")
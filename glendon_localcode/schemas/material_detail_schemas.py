@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Literal
 from pydantic import BaseModel, Field
+from schemas.material_sku_input_schemas import SkuResponse
 
 # --- Shared Request Model ---
 class MaterialIDRequest(BaseModel):
@@ -80,4 +81,24 @@ class VersionHistoryItem(BaseModel):
     ver_num: int
     submitted_by: Optional[str] = ""
     submitted_at: Optional[Any] = None
-    change_description: Optional[str] = ""
\ No newline at end of file
+    change_description: Optional[str] = ""
+
+# --- Aggregated Detail (one call for the whole detail page) ---
+BundleSection = Literal["dashboard", "technical", "cost", "history", "skus"]
+
+class MaterialBundleRequest(BaseModel):
+    document_id: str = Field(..., description="The unique document ID")
+    sections: Optional[List[BundleSection]] = Field(
+        None,
+        description="Sections to include. Defaults to all of them.",
+        example=["dashboard", "cost"]
+    )
+
+class MaterialBundleResponse(BaseModel):
+    document_id: str
+    # Only the requested sections are filled in
+    dashboard: Optional[MaterialDetailResponse] = None
+    technical: Optional[TechnicalDetailResponse] = None
+    cost: Optional[CostDetailResponse] = None
+    history: Optional[List[VersionHistoryItem]] = None
+    skus: Optional[List[SkuResponse]] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List, Any, Dict, Literal
+from typing import Optional, List, Any, Literal
 from pydantic import BaseModel, Field, field_validator
 
 class MaterialBase(BaseModel):
@@ -79,12 +79,12 @@ class UpdateDraftRequest(MaterialBase):
 class SubmitVersionRequest(BaseModel):
   """Request to submit a version"""
   document_id: str = Field(..., description="The ID of the document to submit")
-  form_data: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Final updates before submit")
+  form_data: MaterialBase = Field(default_factory=MaterialBase, description="Final updates before submit")
 
 class EditVerifiedRequest(BaseModel):
   """Request to edit a verified document (creates v+1)"""
   document_id: str = Field(..., description="The Verified Document ID")
-  form_data: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Changes for the new version")
+  form_data: MaterialBase = Field(default_factory=MaterialBase, description="Changes for the new version")
   notes: Optional[str] = Field(None, description="Notes for this revision")
 
 class MaterialResponse(BaseModel):
@@ -92,4 +92,31 @@ class MaterialResponse(BaseModel):
   document_id: str
   version_num: int
   status: str
-  message: str
\ No newline at end of file
+  message: str
+
+class BulkImportRowResult(BaseModel):
+  """Outcome of one row of a bulk import"""
+  line: int # Line in the uploaded file
+  status: Literal["created", "invalid", "skipped"] # skipped = valid, but all_or_nothing rejected the file
+  document_id: Optional[str] = None
+  master_material_id: Optional[str] = None
+  errors: List[str] = Field(default_factory=list)
+
+class BulkImportResponse(BaseModel):
+  """Per-row report of a bulk import"""
+  total: int
+  created: int
+  invalid: int
+  status: str # Status given to every created version
+  results: List[BulkImportRowResult]
+
+class RecomputeCostsRequest(BaseModel):
+  """Recalculate stored effective / landed cost and logistics fee"""
+  current_only: bool = Field(True, description="Only current versions (history keeps its numbers)")
+  dry_run: bool = Field(False, description="Report what would change without writing")
+
+class RecomputeCostsResponse(BaseModel):
+  checked: int
+  changed: int
+  dry_run: bool
+  document_ids: List[str]
@@ -0,0 +1,24 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from schemas.material_card_schemas import MaterialCard, ListMaterialCardsRequest
+
+class MaterialSearchRequest(ListMaterialCardsRequest):
+    """Free-text search; the card filters still apply"""
+    query: str = Field(..., min_length=1, max_length=200, example="heavy cotton twill ABC Textiles")
+    page: int = Field(1, ge=1, le=50)
+    page_size: int = Field(20, ge=1, le=100)
+    match: Optional[Literal["all", "any"]] = Field(
+        None, description="Omit on the first page; then send back the 'match' of the response"
+    )
+
+class MaterialSearchResult(MaterialCard):
+    score: float
+    exact_match: bool = False # The query is this material's document / master / supplier ID
+
+class MaterialSearchResponse(BaseModel):
+    query: str
+    items: List[MaterialSearchResult]
+    page: int
+    has_more: bool
+    match: Literal["all", "any"] # "any" when no material matched every word
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app imports its packages from glendon_localcode/ (no __init__.py files)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
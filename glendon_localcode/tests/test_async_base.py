@@ -0,0 +1,19 @@
+from data_access.async_base import to_asyncpg_sql
+
+
+def test_placeholders_are_numbered_in_order():
+    assert to_asyncpg_sql("SELECT * FROM t WHERE a = %s AND b = %s") == "SELECT * FROM t WHERE a = $1 AND b = $2"
+
+
+def test_escaped_percent_becomes_literal():
+    assert to_asyncpg_sql("WHERE name ILIKE %s || '%%'") == "WHERE name ILIKE $1 || '%'"
+
+
+def test_escaped_percent_before_s_is_not_a_placeholder():
+    # '%%s' is a literal '%s' in psycopg2, not a parameter
+    assert to_asyncpg_sql("SELECT '%%s', %s") == "SELECT '%s', $1"
+
+
+def test_query_without_placeholders_is_unchanged():
+    sql = "SELECT version FROM current_materials_version"
+    assert to_asyncpg_sql(sql) == sql
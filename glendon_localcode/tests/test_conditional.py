@@ -0,0 +1,38 @@
+import pytest
+from starlette.requests import Request
+
+from controller.conditional import make_etag, etag_matches
+
+ETAG = make_etag("/material_card/list", {"page": 1}, 42)
+
+
+def request_with(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_strong_and_stable():
+    assert ETAG.startswith('"') and ETAG.endswith('"')
+    assert ETAG == make_etag("/material_card/list", {"page": 1}, 42)
+    assert ETAG != make_etag("/material_card/list", {"page": 1}, 43)
+
+
+@pytest.mark.parametrize("header", [
+    ETAG,
+    f"W/{ETAG}",  # Added by a compressing proxy
+    f'"other", {ETAG}',
+    f" {ETAG} ",
+    "*",
+])
+def test_matches(header):
+    assert etag_matches(request_with(header), ETAG)
+
+
+@pytest.mark.parametrize("header", [None, "", '"other"', ETAG.strip('"')])
+def test_does_not_match(header):
+    assert not etag_matches(request_with(header), ETAG)
+
+
+def test_no_etag_never_matches():
+    # Responses without a projection stamp are never served as 304
+    assert not etag_matches(request_with("*"), None)
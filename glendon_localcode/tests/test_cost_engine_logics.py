@@ -0,0 +1,114 @@
+import math
+import random
+
+import pytest
+
+from logics.cost_engine_logics import (
+    _as_float, compute_costs, compute_costs_batch, to_db_values, apply_costs,
+    COST_INPUT_FIELDS, COST_OUTPUT_FIELDS,
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (5, 5.0),
+    (2.5, 2.5),
+    ("5", 5.0),
+    (" 7.25 ", 7.25),
+    (None, 0.0),
+    ("", 0.0),
+    ("abc", 0.0),
+    ([1], 0.0),
+])
+def test_as_float(value, expected):
+    assert _as_float(value) == expected
+
+
+def costs(cost=None, tolerance=None, rate=None, weight=None):
+    return compute_costs({
+        "original_cost_per_unit": cost, "supplier_selling_tolerance": tolerance,
+        "logistics_rate": rate, "weight_per_unit": weight,
+    })
+
+
+# Same numbers the Streamlit form shows (frontend/app.py cost section)
+def test_form_formulas():
+    result = costs(cost=100, tolerance=5, rate=10, weight=200)
+    assert result["effective_cost_per_unit"] == pytest.approx(105.0)  # cost + cost * tol%
+    assert result["landed_cost_per_unit"] == pytest.approx(115.5)     # effective + effective * rate%
+    assert result["logistics_fee_per_unit"] == pytest.approx(20.0)    # weight * rate%
+
+
+def test_no_tolerance_and_no_logistics():
+    result = costs(cost=12.5, weight=200)
+    assert result["effective_cost_per_unit"] == pytest.approx(12.5)
+    assert result["landed_cost_per_unit"] == pytest.approx(12.5)
+    assert result["logistics_fee_per_unit"] is None  # 0 is stored as NULL
+
+
+@pytest.mark.parametrize("cost", [None, "", 0, -3, "abc"])
+def test_landed_cost_and_fee_need_an_effective_cost(cost):
+    assert costs(cost=cost, tolerance=5, rate=10, weight=200) == {
+        "effective_cost_per_unit": None, "landed_cost_per_unit": None, "logistics_fee_per_unit": None,
+    }
+
+
+def test_results_not_above_zero_are_null():
+    # A -100% tolerance wipes the effective cost, and everything after it
+    assert costs(cost=50, tolerance=-100, rate=10, weight=200)["landed_cost_per_unit"] is None
+    # A -100% logistics rate leaves an effective cost but no landed cost or fee
+    result = costs(cost=50, rate=-100, weight=200)
+    assert result["effective_cost_per_unit"] == pytest.approx(50.0)
+    assert result["landed_cost_per_unit"] is None
+    assert result["logistics_fee_per_unit"] is None
+
+
+def test_string_inputs_are_read_as_numbers():
+    assert costs(cost="100", tolerance="5", rate="10", weight="200") == costs(cost=100, tolerance=5, rate=10, weight=200)
+
+
+def test_apply_costs_overwrites_client_values():
+    data = apply_costs({"original_cost_per_unit": 10, "effective_cost_per_unit": 999, "landed_cost_per_unit": 999})
+    assert data["effective_cost_per_unit"] == pytest.approx(10.0)
+    assert data["landed_cost_per_unit"] == pytest.approx(10.0)
+    assert data["logistics_fee_per_unit"] is None
+
+
+def assert_batch_matches_scalar(rows):
+    batch = compute_costs_batch(rows)
+    db_values = {field: to_db_values(batch[field]) for field in COST_OUTPUT_FIELDS}
+    for i, row in enumerate(rows):
+        expected = compute_costs(row)
+        for field in COST_OUTPUT_FIELDS:
+            if expected[field] is None:
+                assert math.isnan(batch[field][i]), (row, field)
+                assert db_values[field][i] is None
+            else:
+                assert batch[field][i] == pytest.approx(expected[field], rel=1e-12), (row, field)
+                assert db_values[field][i] == pytest.approx(expected[field], rel=1e-12)
+
+
+INPUT_VALUES = [None, "", "abc", -10, 0, 0.0, 5, "5", 12.5, 100]
+
+
+@pytest.mark.parametrize("field", COST_INPUT_FIELDS)
+@pytest.mark.parametrize("value", INPUT_VALUES)
+def test_batch_matches_scalar_per_field(field, value):
+    base = {"original_cost_per_unit": 100, "supplier_selling_tolerance": 5,
+            "logistics_rate": 10, "weight_per_unit": 200}
+    assert_batch_matches_scalar([base, dict(base, **{field: value})])
+
+
+def test_batch_matches_scalar_on_random_rows():
+    rng = random.Random(20240517)
+    pool = INPUT_VALUES + [-100, 1e-9]
+    rows = [
+        {field: rng.choice(pool) if rng.random() < 0.3 else round(rng.uniform(-20, 500), 4)
+         for field in COST_INPUT_FIELDS}
+        for _ in range(20000)
+    ]
+    assert_batch_matches_scalar(rows)
+
+
+def test_batch_of_nothing():
+    batch = compute_costs_batch([])
+    assert all(len(batch[field]) == 0 for field in COST_OUTPUT_FIELDS)
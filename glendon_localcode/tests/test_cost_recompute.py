@@ -0,0 +1,62 @@
+import asyncio
+import os
+
+import pytest
+
+from data_access.async_connection_pool import close_async_pool
+from logics.cost_engine_logics import CostRecomputeService
+from logics.fx_rate_logics import REPORTING_CURRENCY
+from logics.material_input_logics import MaterialService
+
+pytestmark = pytest.mark.skipif(not os.environ.get("DATABASE_URL"), reason="needs a migrated database (DATABASE_URL)")
+
+COSTS_QUERY = """
+    SELECT landed_cost_per_unit, reporting_landed_cost_per_unit
+    FROM material_versions WHERE document_id = %s AND ver_num = 1
+"""
+
+
+class _Rollback(Exception):
+    pass
+
+
+async def _recompute_after_rate_change():
+    service = MaterialService()
+    repo = service.data_access
+    seen = {}
+    try:
+        # One outer unit of work: the create, the recompute and the checks all join it
+        async with repo.transaction():
+            created = await service.create_material({
+                "material_name": "recompute reprice test",
+                "material_type": "Fabric",
+                "original_cost_per_unit": 10,
+                "supplier_selling_tolerance": 0,
+                "logistics_rate": 10,
+                "native_cost_currency": REPORTING_CURRENCY,  # Rate 1: converted == landed
+            }, is_submit=False)
+            doc_id = created["document_id"]
+            seen["before"] = await repo.fetch_one(COSTS_QUERY, (doc_id,))
+
+            # An input changed behind the engine's back; only a recompute fixes the costs
+            await repo.execute(
+                "UPDATE material_versions SET logistics_rate = 20 WHERE document_id = %s", (doc_id,)
+            )
+            result = await CostRecomputeService().recompute(current_only=True)
+            seen["doc_id"], seen["result"] = doc_id, result
+            seen["after"] = await repo.fetch_one(COSTS_QUERY, (doc_id,))
+            raise _Rollback()
+    except _Rollback:
+        pass
+    finally:
+        await close_async_pool()
+    return seen
+
+
+def test_recompute_moves_the_reporting_landed_cost():
+    seen = asyncio.run(_recompute_after_rate_change())
+    assert seen["before"]["landed_cost_per_unit"] == pytest.approx(11.0)
+    assert seen["before"]["reporting_landed_cost_per_unit"] == pytest.approx(11.0)
+    assert seen["doc_id"] in seen["result"]["document_ids"]
+    assert seen["after"]["landed_cost_per_unit"] == pytest.approx(12.0)
+    assert seen["after"]["reporting_landed_cost_per_unit"] == pytest.approx(12.0)
@@ -0,0 +1,31 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from schemas.fx_rate_schemas import FxRate, ListFxRatesRequest
+
+
+def rate(base, quote="USD"):
+    return FxRate(base_currency=base, quote_currency=quote, effective_date=date(2024, 5, 1), rate=0.000039)
+
+
+@pytest.mark.parametrize("code", ["VND", "vnd", " Vnd ", "vnd\n"])
+def test_codes_are_trimmed_and_upper_cased(code):
+    assert rate(code).base_currency == "VND"
+    assert rate("VND", quote=code).quote_currency == "VND"
+
+
+@pytest.mark.parametrize("code", ["", "  ", "US", "USDT", "US1", "U$D", "đồng"])
+def test_other_codes_are_rejected(code):
+    with pytest.raises(ValidationError, match="three-letter currency code"):
+        rate(code)
+    with pytest.raises(ValidationError, match="three-letter currency code"):
+        rate("VND", quote=code)
+
+
+def test_list_quote_currency():
+    assert ListFxRatesRequest(quote_currency=" usd").quote_currency == "USD"
+    assert ListFxRatesRequest().quote_currency is None
+    with pytest.raises(ValidationError):
+        ListFxRatesRequest(quote_currency="dollars")
@@ -0,0 +1,90 @@
+import threading
+
+from data_access.material_cache import TTLCache
+
+
+def test_put_then_get_returns_a_copy():
+    cache = TTLCache()
+    cache.put("vin_doc_0001", {"ver_num": 1})
+    row = cache.get("vin_doc_0001")
+    row["ver_num"] = 99
+    assert cache.get("vin_doc_0001") == {"ver_num": 1}
+
+
+def test_load_without_invalidation_is_stored():
+    cache = TTLCache()
+    token = cache.load_token()
+    cache.put("vin_doc_0001", {"ver_num": 1}, token)
+    assert cache.get("vin_doc_0001") == {"ver_num": 1}
+
+
+def test_load_racing_an_invalidation_is_dropped():
+    cache = TTLCache()
+    token = cache.load_token()
+    # A writer commits and invalidates while the reader is still in the DB
+    cache.invalidate("vin_doc_0001")
+    cache.put("vin_doc_0001", {"ver_num": 1}, token)
+    assert cache.get("vin_doc_0001") is None
+
+
+def test_invalidation_of_another_key_also_drops_the_load():
+    # The token is global: cheaper than per-key tracking, at worst one extra miss
+    cache = TTLCache()
+    token = cache.load_token()
+    cache.invalidate("vin_doc_0002")
+    cache.put("vin_doc_0001", {"ver_num": 1}, token)
+    assert cache.get("vin_doc_0001") is None
+
+
+def test_load_racing_a_clear_is_dropped():
+    cache = TTLCache()
+    token = cache.load_token()
+    cache.clear()
+    cache.put("vin_doc_0001", {"ver_num": 1}, token)
+    assert cache.get("vin_doc_0001") is None
+
+
+def test_racing_loads_never_store_a_stale_row():
+    cache = TTLCache()
+    loaded = threading.Event()
+    invalidated = threading.Event()
+
+    def reader():
+        token = cache.load_token()
+        loaded.set()
+        invalidated.wait()
+        cache.put("vin_doc_0001", {"ver_num": 1}, token)  # Read before the write
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    loaded.wait()
+    cache.invalidate("vin_doc_0001")
+    invalidated.set()
+    thread.join()
+    assert cache.get("vin_doc_0001") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_expired_entries_are_misses():
+    cache = TTLCache(ttl=0)
+    cache.put("vin_doc_0001", {"ver_num": 1})
+    assert cache.get("vin_doc_0001") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(max_size=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidated_within():
+    cache = TTLCache()
+    assert not cache.invalidated_within(5)
+    cache.invalidate("vin_doc_0001")
+    assert cache.invalidated_within(5)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+
+from logics.material_card_logics import encode_cursor, decode_cursor
+
+
+def test_newest_cursor_round_trip():
+    created_at = datetime(2024, 5, 17, 9, 30, 12, 123456)
+    cursor = encode_cursor({"created_at": created_at, "document_id": "vin_doc_0042"}, "newest")
+    assert decode_cursor(cursor, "newest") == (created_at, "vin_doc_0042")
+
+
+def test_cost_cursor_round_trip():
+    row = {"reporting_cost_per_unit": 12.5, "document_id": "vin_doc_0007"}
+    cursor = encode_cursor(row, "reporting_cost_asc")
+    assert decode_cursor(cursor, "reporting_cost_asc") == (12.5, "vin_doc_0007")
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor({"reporting_cost_per_unit": 1e9, "document_id": "vin_doc_?/+"}, "reporting_cost_desc")
+    assert not set(cursor) & set("+/")
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24=", ""])
+def test_garbage_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+def test_cursor_of_another_sort_is_rejected():
+    cursor = encode_cursor({"created_at": datetime(2024, 1, 1), "document_id": "vin_doc_0001"}, "newest")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "reporting_cost_asc")
@@ -0,0 +1,66 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from controller.material_input_controller import router, get_service
+
+
+class FakeMaterialService:
+    """Records what the controller hands to the service"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def submit_version(self, document_id, final_updates):
+        self.calls.append((document_id, final_updates))
+        return {"document_id": document_id, "version_num": 2, "status": "Submitted - Unverified", "message": "Success"}
+
+    async def create_revision_from_verified(self, document_id, updates):
+        self.calls.append((document_id, updates))
+        return {"document_id": document_id, "version_num": 3, "status": "Submitted - Unverified", "message": "Success"}
+
+
+def make_client():
+    service = FakeMaterialService()
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_service] = lambda: service
+    return TestClient(app), service
+
+
+def test_submit_version_coerces_string_numbers():
+    client, service = make_client()
+    response = client.post("/material_input/submit_version", json={
+        "document_id": "vin_doc_0001",
+        "form_data": {"original_cost_per_unit": "5", "estimated_logistics_lead_time": "14",
+                      "refundable_vat": "true", "import_duty": ""},
+    })
+    assert response.status_code == 200
+    assert service.calls == [("vin_doc_0001", {
+        "original_cost_per_unit": 5.0, "estimated_logistics_lead_time": 14,
+        "refundable_vat": True, "import_duty": None,
+    })]
+    assert isinstance(service.calls[0][1]["original_cost_per_unit"], float)
+
+
+def test_edit_verified_coerces_string_numbers():
+    client, service = make_client()
+    response = client.post("/material_input/edit_verified", json={
+        "document_id": "vin_doc_0001", "form_data": {"weight_per_unit": "120.5"},
+    })
+    assert response.status_code == 200
+    assert service.calls == [("vin_doc_0001", {"weight_per_unit": 120.5})]
+
+
+def test_form_data_only_passes_the_fields_sent():
+    client, service = make_client()
+    client.post("/material_input/submit_version", json={"document_id": "vin_doc_0001"})
+    assert service.calls == [("vin_doc_0001", {})]
+
+
+def test_form_data_rejects_non_numeric_costs():
+    client, service = make_client()
+    response = client.post("/material_input/submit_version", json={
+        "document_id": "vin_doc_0001", "form_data": {"original_cost_per_unit": "five"},
+    })
+    assert response.status_code == 422
+    assert service.calls == []
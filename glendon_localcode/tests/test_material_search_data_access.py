@@ -0,0 +1,57 @@
+import re
+
+import pytest
+
+from data_access.material_search_data_access import _build_search_query, SEARCH_RANK_LIMIT, TRIGRAM_COLUMNS
+
+STATUSES = ["Draft", "Submitted - Verified"]
+FILTERS = {"material_type": "Trim", "min_cost": 1.5}
+
+
+def bind(query, params):
+    """Inlines params in placeholder order ('%%' stays a literal '%'), so each value can be found by its clause"""
+    values = iter(params)
+    bound = re.sub(r"%%|%s", lambda m: "%" if m.group() == "%%" else repr(next(values)), query)
+    assert next(values, None) is None, "more params than placeholders"
+    return " ".join(bound.split())
+
+
+def candidates_cte(sql):
+    return sql[sql.index("candidates AS ("):sql.index(") SELECT")].strip()
+
+
+@pytest.mark.parametrize("fuzzy", [False, True])
+@pytest.mark.parametrize("capped", [False, True])
+def test_every_placeholder_has_its_param(fuzzy, capped):
+    query, params = _build_search_query("ABC-1", "abc:* & 1:*", STATUSES, FILTERS, fuzzy, 21, 40, capped)
+    sql = bind(query, params)  # Fails on a count mismatch
+
+    exact = sql[sql.index("WITH exact AS ("):sql.index("candidates AS (")]
+    assert "c.status = ANY(['Draft', 'Submitted - Verified'])" in exact
+    assert "c.material_type = 'Trim' AND c.original_cost_per_unit >= 1.5" in exact
+    assert ("lower(c.document_id) = 'abc-1' OR lower(c.master_material_id) = 'abc-1' "
+            "OR lower(c.ref_id) = 'abc-1'") in exact
+
+    candidates = candidates_cte(sql)
+    assert "c.status = ANY(['Draft', 'Submitted - Verified'])" in candidates
+    assert "c.material_type = 'Trim' AND c.original_cost_per_unit >= 1.5" in candidates
+    assert "c.search_vector @@ to_tsquery('english', 'abc:* & 1:*')" in candidates
+
+    score = sql[sql.index("ts_rank_cd"):sql.index("AS score")]
+    assert "to_tsquery('english', 'abc:* & 1:*')" in score
+    assert sql.endswith("LIMIT 21 OFFSET 40")
+
+    for col in TRIGRAM_COLUMNS:
+        assert (f"c.{col} %> 'ABC-1'" in candidates) == fuzzy
+        assert (f"word_similarity('ABC-1', c.{col})" in score) == fuzzy
+
+
+def test_all_word_search_ranks_every_candidate():
+    query, params = _build_search_query("cotton", "cotton:*", STATUSES)
+    assert "LIMIT" not in candidates_cte(bind(query, params))
+    assert SEARCH_RANK_LIMIT not in params
+
+
+def test_capped_search_ranks_a_stable_subset():
+    query, params = _build_search_query("cotton twill", "cotton:* | twill:*", STATUSES, capped=True)
+    assert candidates_cte(bind(query, params)).endswith(f"ORDER BY c.document_id LIMIT {SEARCH_RANK_LIMIT}")
@@ -0,0 +1,43 @@
+import pytest
+
+from data_access.pool_sizing import plan_pool_sizes, ASYNC_POOL_CAP, SYNC_POOL_MAX
+
+
+@pytest.fixture(autouse=True)
+def default_min_size(monkeypatch):
+    monkeypatch.delenv("ASYNC_DB_POOL_MIN_SIZE", raising=False)
+
+
+def test_budget_is_split_between_workers():
+    # 100 - 3 superuser - 10 reserved = 87 -> 21 per worker, 2 of them for psycopg2
+    plan = plan_pool_sizes(100, 3, 4, reserved=10)
+    assert plan["budget"] == 87
+    assert plan["per_worker"] == 21
+    assert plan["ASYNC_DB_POOL_MAX_SIZE"] == 21 - SYNC_POOL_MAX
+    assert plan["DB_POOL_MAX_SIZE"] == SYNC_POOL_MAX
+    assert plan["DB_POOL_MIN_SIZE"] == 0
+    assert plan["total"] == 84
+    assert plan["total"] <= plan["budget"]
+
+
+def test_notify_listener_takes_one_connection_per_worker():
+    plan = plan_pool_sizes(100, 3, 4, reserved=10, notify_listener=True)
+    assert plan["ASYNC_DB_POOL_MAX_SIZE"] == 21 - SYNC_POOL_MAX - 1
+    assert plan["total"] == 84
+
+
+def test_async_pool_is_capped():
+    plan = plan_pool_sizes(500, 3, 1, reserved=10)
+    assert plan["ASYNC_DB_POOL_MAX_SIZE"] == ASYNC_POOL_CAP
+    assert plan["total"] == ASYNC_POOL_CAP + SYNC_POOL_MAX
+
+
+def test_min_size_never_exceeds_max(monkeypatch):
+    monkeypatch.setenv("ASYNC_DB_POOL_MIN_SIZE", "50")
+    plan = plan_pool_sizes(100, 3, 4, reserved=10)
+    assert plan["ASYNC_DB_POOL_MIN_SIZE"] == plan["ASYNC_DB_POOL_MAX_SIZE"]
+
+
+def test_too_many_workers_is_an_error():
+    with pytest.raises(ValueError, match="lower WEB_CONCURRENCY"):
+        plan_pool_sizes(100, 3, 40, reserved=10)